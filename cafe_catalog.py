@@ -0,0 +1,108 @@
+import argparse
+import json
+import os
+
+MENU_FILE = "cafe_menu.json"
+
+# Used when no catalog file is present
+DEFAULT_MENU = {
+    "Pizza": {"price": 90, "image": "pizza.png", "category": "Mains", "code": "101"},
+    "Pasta": {"price": 60, "image": "pasta.png", "category": "Mains", "code": "102"},
+    "Burger": {"price": 50, "image": "burger.png", "category": "Mains", "code": "103"},
+    "Salad": {"price": 70, "image": "salad.png", "category": "Salads", "code": "201"},
+    "Coffee": {"price": 80, "image": "coffee.png", "category": "Beverages", "code": "301"}
+}
+
+
+def load_menu(path=MENU_FILE):
+    """Load the catalog as {item: {"price", "image", "category", "code"}} in file order.
+
+    Items without a SKU code are numbered on from the highest numeric code in
+    the file, in file order, so they never take a code given explicitly.
+    """
+    if not os.path.exists(path):
+        return dict(DEFAULT_MENU)
+
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    menu = {}
+    for category in data["categories"]:
+        for entry in category["items"]:
+            name = entry["name"]
+            if name in menu:
+                raise ValueError(f"Duplicate menu item '{name}' in {path}")
+            menu[name] = {
+                "price": entry["price"],
+                "image": entry.get("image", ""),
+                "category": category["name"],
+                "code": str(entry["code"]) if "code" in entry else None
+            }
+
+    codes = [details["code"] for details in menu.values() if details["code"] is not None]
+    next_code = max((int(code) for code in codes if code.isdigit()), default=0) + 1
+    for details in menu.values():
+        if details["code"] is None:
+            details["code"] = str(next_code)
+            next_code += 1
+
+    codes = [details["code"] for details in menu.values()]
+    if len(set(codes)) != len(codes):
+        raise ValueError(f"Duplicate SKU codes in {path}")
+    return menu
+
+
+def categories(menu):
+    """Category names in the order they first appear"""
+    return list(dict.fromkeys(details["category"] for details in menu.values()))
+
+
+def save_menu(menu, path=MENU_FILE):
+    """Write a menu dict back out in the grouped catalog format"""
+    grouped = {}
+    for name, details in menu.items():
+        entry = {"name": name, "price": details["price"]}
+        if details.get("code"):
+            entry["code"] = details["code"]
+        if details.get("image"):
+            entry["image"] = details["image"]
+        grouped.setdefault(details.get("category", "Other"), []).append(entry)
+
+    data = {"categories": [{"name": name, "items": items} for name, items in grouped.items()]}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def generate_menu(item_count):
+    """Synthetic catalog for load testing, reusing the bundled images"""
+    base = list(DEFAULT_MENU.items())
+    menu = {}
+    for i in range(item_count):
+        name, details = base[i % len(base)]
+        menu[f"{name} #{i + 1}"] = {
+            "price": details["price"] + (i % 20) * 5,
+            "image": details["image"],
+            "category": details["category"],
+            "code": str(1000 + i)
+        }
+    return menu
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cafe menu catalog tools")
+    parser.add_argument("--generate", type=int, metavar="N", help="write a synthetic catalog with N items")
+    parser.add_argument("--output", default=MENU_FILE)
+    args = parser.parse_args()
+
+    if args.generate:
+        save_menu(generate_menu(args.generate), args.output)
+        print(f"Wrote {args.generate} items to {args.output}")
+    else:
+        menu = load_menu(args.output)
+        for category in categories(menu):
+            count = sum(1 for details in menu.values() if details["category"] == category)
+            print(f"{category}: {count} items")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -2,6 +2,299 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from PIL import Image, ImageTk
 import os
+import queue
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from cafe_catalog import load_menu, categories
+from cafe_order_book import OrderBook, format_paise
+from cafe_order_journal import OrderJournal
+from cafe_order_server import OrderLink
+from cafe_receipts import render_receipt, receipt_path
+from cafe_thumbnail_cache import ThumbnailCache
+
+
+class CartView:
+    """Long-lived cart window whose rows are patched in place as the order changes"""
+
+    def __init__(self, app):
+        self.app = app
+        self.rows = {}  # item -> (row frame, quantity label)
+
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Your Cart")
+        self.window.geometry("400x400")
+        self.window.resizable(False, False)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        # Main frame
+        cart_frame = ttk.Frame(self.window, padding=10)
+        cart_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Title
+        ttk.Label(cart_frame, text="Your Cart Items", font=('Helvetica', 14, 'bold')).pack(pady=5)
+
+        # Items frame with scrollbar
+        items_frame = ttk.Frame(cart_frame)
+        items_frame.pack(fill=tk.BOTH, expand=True)
+
+        canvas = tk.Canvas(items_frame)
+        scrollbar = ttk.Scrollbar(items_frame, orient="vertical", command=canvas.yview)
+        self.scrollable_frame = ttk.Frame(canvas)
+
+        self.scrollable_frame.bind(
+            "<Configure>",
+            lambda e: canvas.configure(
+                scrollregion=canvas.bbox("all")
+            )
+        )
+
+        canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+
+        # Add items with quantity controls
+        for item, quantity in app.order.items():
+            self.add_row(item, quantity)
+
+        # Total label
+        self.total_label = ttk.Label(cart_frame, font=('Helvetica', 12, 'bold'))
+        self.total_label.pack(pady=5)
+        self.update_total()
+
+        # Done button
+        tk.Button(cart_frame, text="Done", command=self.close,bg='#4CAF50', fg='white', padx=20, pady=5).pack(pady=10)
+
+    def add_row(self, item, quantity):
+        item_frame = ttk.Frame(self.scrollable_frame, padding=5)
+        item_frame.pack(fill=tk.X, pady=2)
+
+        # Item name and price
+        ttk.Label(item_frame, text=f"{item} - {format_paise(self.app.order.unit_price(item))} each",
+                  font=('Helvetica', 10)).pack(side=tk.LEFT)
+
+        # Quantity controls
+        qty_frame = ttk.Frame(item_frame)
+        qty_frame.pack(side=tk.RIGHT)
+
+        # Decrease button
+        tk.Button(qty_frame, text="-", width=2,command=lambda i=item: self.app.adjust_quantity(i, -1),bg='#f44336', fg='white',bd=0).pack(side=tk.LEFT, padx=2)
+
+        # Quantity display
+        qty_label = ttk.Label(qty_frame, text=str(quantity), width=3)
+        qty_label.pack(side=tk.LEFT)
+
+        # Increase button
+        tk.Button(qty_frame, text="+", width=2,command=lambda i=item: self.app.adjust_quantity(i, 1), bg='#4CAF50', fg='white', bd=0).pack(side=tk.LEFT, padx=2)
+
+        # Remove button
+        tk.Button(item_frame, text="Remove",command=lambda i=item: self.app.remove_item(i), bg='#ff9800', fg='white', bd=0, padx=5).pack(side=tk.RIGHT, padx=5)
+
+        self.rows[item] = (item_frame, qty_label)
+
+    def update_item(self, item):
+        """Apply one item's new quantity: relabel, add or drop a single row"""
+        quantity = self.app.order.quantity(item)
+        if not self.app.order:
+            # Nothing left to show
+            self.close()
+            return
+
+        if quantity == 0:
+            if item in self.rows:
+                item_frame, _ = self.rows.pop(item)
+                item_frame.destroy()
+        elif item in self.rows:
+            self.rows[item][1].config(text=str(quantity))
+        else:
+            self.add_row(item, quantity)
+
+        self.update_total()
+
+    def update_total(self):
+        self.total_label.config(text=f"Total: {format_paise(self.app.order.total)}")
+
+    def close(self):
+        self.window.destroy()
+        self.app.cart_view = None
+
+
+class MenuTile:
+    """One reusable menu tile; the grid rebinds it to whichever item scrolls into its slot"""
+
+    def __init__(self, app, parent):
+        self.app = app
+        self.item = None
+        self.image = None
+        self.frame = ttk.Frame(parent)
+
+        # Item image (placeholder, will be updated when images are loaded)
+        self.img_label = ttk.Label(self.frame, image=app.placeholder_image)
+        self.img_label.pack()
+
+        # Item name and price
+        self.item_label = ttk.Label(self.frame,font=('Helvetica', 10, 'bold'))
+        self.item_label.pack()
+
+        # Add to order button
+        self.add_button = tk.Button(self.frame,text="Add to Order",bg=app.button_color,fg='white',activebackground=app.button_hover,
+                    activeforeground='white',bd=0,padx=10,pady=5,command=self.on_add,font=('Helvetica', 9))
+        self.add_button.pack(pady=5)
+
+        # Add hover effect
+        self.add_button.bind("<Enter>", lambda e: self.add_button.config(bg=app.button_hover))
+        self.add_button.bind("<Leave>", lambda e: self.add_button.config(bg=app.button_color))
+
+    def show(self, item):
+        # The image may have loaded while the tile was hidden, so check it as well as the item
+        image = self.app.image_for(item)
+        if item == self.item and image is self.image:
+            return
+        self.item = item
+        self.image = image
+        code = self.app.menu[item]["code"]
+        self.item_label.config(text=f"#{code} {item} - {format_paise(self.app.order.unit_price(item))}")
+        self.img_label.config(image=image)
+
+    def on_add(self):
+        if self.item is not None:
+            self.app.add_to_order(self.item)
+
+
+class MenuGrid:
+    """Scrollable menu grid that only creates widgets for the tiles currently in view"""
+
+    tile_width = 190
+    tile_height = 235
+
+    def __init__(self, app, parent):
+        self.app = app
+        self.items = []
+        self.tiles = []  # Pool of (MenuTile, canvas window id)
+        self.columns = 1
+
+        self.canvas = tk.Canvas(parent, bg=app.bg_color, highlightthickness=0, yscrollincrement=20)
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.on_scroll)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind("<Configure>", lambda e: self.layout())
+
+        # The tiles cover the canvas, so the wheel is bound for every widget while the pointer is over the grid
+        self.canvas.bind("<Enter>", self.bind_wheel)
+        self.canvas.bind("<Leave>", self.unbind_wheel)
+
+    def set_items(self, items):
+        """Show a new list of items, e.g. after a category change"""
+        self.items = list(items)
+        self.canvas.yview_moveto(0)
+        self.layout()
+
+    def layout(self):
+        """Recompute columns and scroll region for the current width"""
+        width = max(self.canvas.winfo_width(), self.tile_width)
+        self.columns = max(1, width // self.tile_width)
+        rows = -(-len(self.items) // self.columns)  # Ceiling division
+        self.canvas.configure(scrollregion=(0, 0, width, rows * self.tile_height))
+        self.render()
+
+    def on_scroll(self, *args):
+        self.canvas.yview(*args)
+        self.render()
+
+    def bind_wheel(self, event):
+        self.canvas.bind_all("<MouseWheel>", self.on_mousewheel)
+        self.canvas.bind_all("<Button-4>", lambda e: self.scroll_units(-1))  # X11
+        self.canvas.bind_all("<Button-5>", lambda e: self.scroll_units(1))
+
+    def unbind_wheel(self, event):
+        # Moving onto a tile also leaves the canvas; only unbind once the pointer is outside the grid
+        under = self.canvas.winfo_containing(event.x_root, event.y_root)
+        if under is not None and str(under).startswith(str(self.canvas)):
+            return
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.unbind_all(sequence)
+
+    def on_mousewheel(self, event):
+        self.scroll_units(int(-event.delta / 120) or (-1 if event.delta > 0 else 1))
+
+    def scroll_units(self, units):
+        self.canvas.yview_scroll(units, "units")
+        self.render()
+
+    def render(self):
+        """Bind pooled tiles to the items in view and hide the rest"""
+        top = int(self.canvas.canvasy(0))
+        height = self.canvas.winfo_height()
+        first_row = top // self.tile_height
+        last_row = (top + height) // self.tile_height
+        start = first_row * self.columns
+        end = min(len(self.items), (last_row + 1) * self.columns)
+
+        # Grow the pool only when more tiles are visible than ever before
+        while len(self.tiles) < end - start:
+            tile = MenuTile(self.app, self.canvas)
+            window_id = self.canvas.create_window(0, 0, window=tile.frame, anchor="nw")
+            self.tiles.append((tile, window_id))
+
+        self.app.image_labels = {}
+        for slot, (tile, window_id) in enumerate(self.tiles):
+            index = start + slot
+            if index >= end:
+                self.canvas.itemconfigure(window_id, state="hidden")
+                continue
+
+            row, col = divmod(index, self.columns)
+            self.canvas.coords(window_id, col * self.tile_width + 10, row * self.tile_height + 10)
+            self.canvas.itemconfigure(window_id, state="normal")
+            tile.show(self.items[index])
+            self.app.image_labels[tile.item] = tile.img_label
+
+
+class Toast:
+    """Non-modal notification in the corner of the main window that fades out on a timer"""
+
+    def __init__(self, root, duration=1200, fade_steps=8):
+        self.root = root
+        self.duration = duration
+        self.fade_steps = fade_steps
+        self.after_id = None
+
+        # One borderless window, reused for every message
+        self.window = tk.Toplevel(root)
+        self.window.overrideredirect(True)
+        self.window.withdraw()
+        self.label = tk.Label(self.window,bg='#333',fg='white',font=('Helvetica', 10),padx=12,pady=6)
+        self.label.pack()
+
+    def show(self, message):
+        self.label.config(text=message)
+        self.window.update_idletasks()
+
+        # Bottom-right corner of the main window
+        x = self.root.winfo_rootx() + self.root.winfo_width() - self.window.winfo_reqwidth() - 20
+        y = self.root.winfo_rooty() + self.root.winfo_height() - self.window.winfo_reqheight() - 20
+        self.window.geometry(f"+{x}+{y}")
+        self.window.attributes('-alpha', 0.9)
+        self.window.deiconify()
+        self.window.lift()
+
+        # A newer message restarts the timer instead of queueing
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+        self.after_id = self.root.after(self.duration, self.fade, self.fade_steps)
+
+    def fade(self, steps_left):
+        if steps_left <= 0:
+            self.window.withdraw()
+            self.after_id = None
+            return
+        self.window.attributes('-alpha', 0.9 * steps_left / self.fade_steps)
+        self.after_id = self.root.after(40, self.fade, steps_left - 1)
 
 
 class CafeManagementSystem:
@@ -10,19 +303,19 @@ class CafeManagementSystem:
         self.root.title("Cafe Management System")
         self.root.geometry("900x700")
         self.root.resizable(True, True)
+        self.setup_order_state()
 
-        # Menu items with prices and images
-        self.menu = {
-            "Pizza": {"price": 90, "image": "pizza.png"},
-            "Pasta": {"price": 60, "image": "pasta.png"},
-            "Burger": {"price": 50, "image": "burger.png"},
-            "Salad": {"price": 70, "image": "salad.png"},
-            "Coffee": {"price": 80, "image": "coffee.png"}
-        }
+        # Confirmed orders are journaled to disk with batched fsyncs
+        self.journal = OrderJournal()
 
-        # Current order with quantities
-        self.order_items = {}  # Now using dictionary to store items and quantities
-        self.order_total = 0
+        # Optionally forward orders to the shared kitchen server, e.g. CAFE_ORDER_SERVER=127.0.0.1:8765
+        self.terminal_name = os.environ.get("CAFE_TERMINAL", "counter")
+        server_address = os.environ.get("CAFE_ORDER_SERVER")
+        self.order_link = OrderLink(server_address, self.terminal_name) if server_address else None
+        self.receipt_dir = "receipts"
+        self.receipt_executor = ThreadPoolExecutor(max_workers=1)
+        self.receipt_results = queue.Queue()  # (record, exception or None) from finished renders
+        self.pending_receipts = 0
 
         # Configure styles
         self.style = ttk.Style()
@@ -40,36 +333,102 @@ class CafeManagementSystem:
         self.cart_button_color = '#2196F3'
         self.cart_button_hover = '#0b7dda'
 
-        # Create widgets first
+        # Resized menu images survive restarts in this cache
+        self.thumbnail_size = (150, 150)
+        self.thumbnail_cache = ThumbnailCache()
+
+        # Images are decoded on worker threads and handed to Tk through a queue
+        self.menu_images = {}
+        self.requested_images = set()
+        self.image_queue = queue.Queue()
+        self.image_executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+        self.pending_images = 0
+        self.placeholder_image = ImageTk.PhotoImage(Image.new('RGB', self.thumbnail_size, color='#e0e0e0'))
+
+        # Images for visible tiles are requested by the menu grid as it renders
         self.create_widgets()
+        self.toast = Toast(self.root)
 
-        # Then load images (with error handling)
-        self.load_images()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
-    def load_images(self):
-        self.menu_images = {}
-        for item in self.menu:
+    def setup_order_state(self):
+        """Menu and order state, which needs no window (the rapid-entry benchmark uses it headless)"""
+        # Menu items with prices, images and categories
+        self.menu = load_menu()
+
+        # Current order with quantities
+        self.order = OrderBook(self.menu)  # Quantities and running total in paise
+        self.order_rows = []  # Items in listbox row order
+        self.cart_view = None  # Open CartView, if any
+
+        # Rapid entry: numeric SKU codes typed into a single entry field
+        self.sku_codes = {details["code"]: item for item, details in self.menu.items()}
+        self.last_added = None
+
+    def image_for(self, item):
+        """Return the item's image, or the placeholder while it loads in the background"""
+        if item in self.menu_images:
+            return self.menu_images[item]
+        if item not in self.requested_images:
+            self.request_image(item)
+        return self.placeholder_image
+
+    def request_image(self, item):
+        """Queue a background decode for one menu item"""
+        self.requested_images.add(item)
+        self.pending_images += 1
+        self.image_executor.submit(self.decode_image, item, self.menu[item]["image"])
+        if self.pending_images == 1:
+            self.root.after(20, self.poll_images)
+
+    def decode_image(self, item, img_path):
+        """Runs on a worker thread, so it must not touch any Tk objects"""
+        try:
+            if os.path.exists(img_path):
+                img = self.thumbnail_cache.load(img_path, self.thumbnail_size)
+            else:
+                # Create a blank image if file doesn't exist
+                img = Image.new('RGB', self.thumbnail_size, color='#f5f5f5')
+        except Exception as e:
+            print(f"Error loading image for {item}: {e}")
+            img = Image.new('RGB', self.thumbnail_size, color='#f5f5f5')
+        self.image_queue.put((item, img))
+
+    def poll_images(self):
+        """Move finished images into their labels without stalling the event loop"""
+        deadline = time.perf_counter() + 0.01  # Spend at most ~10 ms per tick
+        while time.perf_counter() < deadline:
             try:
-                # Try to load the specified image
-                img_path = self.menu[item]["image"]
-                if os.path.exists(img_path):
-                    img = Image.open(img_path)
-                else:
-                    # Create a blank image if file doesn't exist
-                    img = Image.new('RGB', (150, 150), color='#f5f5f5')
-
-                img = img.resize((150, 150), Image.LANCZOS)
-                self.menu_images[item] = ImageTk.PhotoImage(img)
-
-                # Update the image label if it exists
-                if hasattr(self, 'image_labels') and item in self.image_labels:
-                    self.image_labels[item].config(image=self.menu_images[item])
-            except Exception as e:
-                print(f"Error loading image for {item}: {e}")
-                # Create a blank image as fallback
-                img = Image.new('RGB', (150, 150), color='#f5f5f5')
-                img = img.resize((150, 150), Image.LANCZOS)
-                self.menu_images[item] = ImageTk.PhotoImage(img)
+                item, img = self.image_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            self.pending_images -= 1
+            self.menu_images[item] = ImageTk.PhotoImage(img)
+
+            # Update the image label if it exists
+            if item in self.image_labels:
+                self.image_labels[item].config(image=self.menu_images[item])
+
+        if self.pending_images > 0:
+            self.root.after(20, self.poll_images)
+
+    def filter_menu(self):
+        """Show only the selected category in the menu grid"""
+        category = self.category_var.get()
+        if category == "All":
+            self.menu_grid.set_items(self.menu)
+        else:
+            self.menu_grid.set_items(item for item, details in self.menu.items() if details["category"] == category)
+
+    def on_close(self):
+        """Stop background work before the window goes away"""
+        self.image_executor.shutdown(wait=False, cancel_futures=True)
+        self.receipt_executor.shutdown(wait=True)  # Finish receipts already confirmed
+        self.journal.close()  # Commits anything still queued
+        if self.order_link:
+            self.order_link.close()
+        self.root.destroy()
 
     def create_widgets(self):
         # Main container
@@ -87,36 +446,36 @@ class CafeManagementSystem:
         self.menu_frame = ttk.LabelFrame(self.main_frame,text="Our Menu",padding=(15, 10))
         self.menu_frame.pack(fill=tk.BOTH, expand=True)
 
-        # Create menu items with images
-        self.image_labels = {}  # To store image labels for updating later
-        row = 0
-        col = 0
-        for item, details in self.menu.items():
-            item_frame = ttk.Frame(self.menu_frame)
-            item_frame.grid(row=row, column=col, padx=10, pady=10, sticky="nsew")
-
-            # Item image (placeholder, will be updated when images are loaded)
-            img_label = ttk.Label(item_frame)
-            img_label.pack()
-            self.image_labels[item] = img_label  # Store reference to update later
-
-            # Item name and price
-            item_label = ttk.Label(item_frame,text=f"{item} - ₹{details['price']}",font=('Helvetica', 10, 'bold'))
-            item_label.pack()
-
-            # Add to order button
-            add_button = tk.Button(item_frame,text="Add to Order",bg=self.button_color,fg='white',activebackground=self.button_hover,
-                        activeforeground='white',bd=0,padx=10,pady=5,command=lambda i=item: self.add_to_order(i),font=('Helvetica', 9))
-            add_button.pack(pady=5)
-
-            # Add hover effect
-            add_button.bind("<Enter>", lambda e, b=add_button: b.config(bg=self.button_hover))
-            add_button.bind("<Leave>", lambda e, b=add_button: b.config(bg=self.button_color))
-
-            col += 1
-            if col > 2:  # 3 items per row
-                col = 0
-                row += 1
+        # Category filter
+        self.category_var = tk.StringVar(value="All")
+        category_box = ttk.Combobox(self.menu_frame,textvariable=self.category_var,state="readonly",
+                                    values=["All"] + categories(self.menu))
+        category_box.pack(anchor=tk.W, pady=(0, 10))
+        category_box.bind("<<ComboboxSelected>>", lambda e: self.filter_menu())
+
+        # Menu tiles are created on demand as they scroll into view
+        self.image_labels = {}  # Labels of visible tiles, for updating when images load
+        grid_frame = ttk.Frame(self.menu_frame)
+        grid_frame.pack(fill=tk.BOTH, expand=True)
+        self.menu_grid = MenuGrid(self, grid_frame)
+        self.menu_grid.set_items(self.menu)
+
+        # Rapid entry bar, shown with F2 or the checkbox
+        self.rapid_frame = ttk.Frame(self.main_frame)
+        self.rapid_frame.pack(fill=tk.X, pady=(10, 0))
+
+        self.rapid_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(self.rapid_frame,text="Rapid entry (F2)",variable=self.rapid_var,
+                        command=self.toggle_rapid_entry).pack(side=tk.LEFT)
+
+        self.sku_label = ttk.Label(self.rapid_frame,text="SKU code [*qty], + repeats last:")
+        self.sku_entry = ttk.Entry(self.rapid_frame,width=15,font=('Helvetica', 12))
+        self.sku_entry.bind("<Return>", self.on_sku_entered)
+        self.sku_entry.bind("<KP_Enter>", self.on_sku_entered)
+        self.sku_entry.bind("<plus>", self.on_repeat_last)
+        self.sku_entry.bind("<KP_Add>", self.on_repeat_last)
+        self.sku_entry.bind("<Escape>", lambda e: self.sku_entry.delete(0, tk.END))
+        self.root.bind("<F2>", lambda e: self.toggle_rapid_entry(not self.rapid_var.get()))
 
         # Order summary frame
         self.order_frame = ttk.LabelFrame(self.main_frame,text="Your Order",padding=(15, 10))
@@ -159,177 +518,187 @@ class CafeManagementSystem:
         self.clear_btn.bind("<Enter>", lambda e: self.clear_btn.config(bg='#d32f2f'))
         self.clear_btn.bind("<Leave>", lambda e: self.clear_btn.config(bg='#f44336'))
 
-    def add_to_order(self, item):
-        price = self.menu[item]["price"]
-
+    def add_to_order(self, item, quantity=1):
         # Update quantity if item already exists, else add new item
-        if item in self.order_items:
-            self.order_items[item] += 1
-        else:
-            self.order_items[item] = 1
+        self.order.add(item, quantity)
+        self.last_added = item
 
-        self.order_total += price
-
-        # Update order listbox
-        self.update_order_display()
+        # Update order listbox and the cart window if it is open
+        self.refresh_order_item(item)
 
         # Enable checkout button if items in order
-        if self.order_items:
+        if self.order:
             self.checkout_btn.config(state=tk.NORMAL)
 
-        # Show confirmation
-        messagebox.showinfo("Added to Order", f"{item} has been added to your order!")
+        # Show confirmation without blocking the event loop
+        if quantity == 1:
+            self.toast.show(f"{item} has been added to your order!")
+        else:
+            self.toast.show(f"{item} x{quantity} has been added to your order!")
+
+    def toggle_rapid_entry(self, enabled=None):
+        """Show or hide the SKU entry field"""
+        if enabled is not None:
+            self.rapid_var.set(enabled)
 
-    def update_order_display(self):
-        """Update the order listbox with current items and quantities"""
-        self.order_listbox.delete(0, tk.END)
-        for item, quantity in self.order_items.items():
-            price = self.menu[item]["price"]
-            self.order_listbox.insert(tk.END, f"{item} x{quantity} - ₹{price * quantity}")
+        if self.rapid_var.get():
+            self.sku_label.pack(side=tk.LEFT, padx=(20, 5))
+            self.sku_entry.pack(side=tk.LEFT)
+            self.sku_entry.focus_set()
+        else:
+            self.sku_label.pack_forget()
+            self.sku_entry.pack_forget()
+
+    def on_sku_entered(self, event=None):
+        """Add the item for a typed code such as '101' or '101*3'"""
+        text = self.sku_entry.get().strip()
+        self.sku_entry.delete(0, tk.END)
+        if not text:
+            return "break"
+
+        code, _, quantity = text.partition("*")
+        code = code.strip()
+        quantity = quantity.strip()
+        item = self.sku_codes.get(code)
+        if item is None:
+            self.toast.show(f"Unknown SKU code '{code}'")
+        elif quantity and (not quantity.isdigit() or int(quantity) == 0):
+            self.toast.show("Quantity must be a positive number")
+        else:
+            self.add_to_order(item, int(quantity) if quantity else 1)
+        return "break"
+
+    def on_repeat_last(self, event=None):
+        """'+' submits a typed code, or adds one more of the last item when the field is empty"""
+        if self.sku_entry.get().strip():
+            return self.on_sku_entered()
+        if self.last_added:
+            self.add_to_order(self.last_added)
+        return "break"
+
+    def order_line_text(self, item):
+        return f"{item} x{self.order.quantity(item)} - {format_paise(self.order.line_total(item))}"
+
+    def refresh_order_item(self, item):
+        """Patch the displays for one changed item instead of rebuilding them"""
+        quantity = self.order.quantity(item)
+        if item in self.order_rows:
+            index = self.order_rows.index(item)
+            self.order_listbox.delete(index)
+            if quantity:
+                self.order_listbox.insert(index, self.order_line_text(item))
+            else:
+                self.order_rows.pop(index)
+        elif quantity:
+            self.order_listbox.insert(tk.END, self.order_line_text(item))
+            self.order_rows.append(item)
 
         # Update total
-        self.total_label.config(text=f"Total: ₹{self.order_total}")
+        self.total_label.config(text=f"Total: {format_paise(self.order.total)}")
+
+        if self.cart_view:
+            self.cart_view.update_item(item)
 
     def view_cart(self):
         """Show a popup window with cart details and quantity adjustment"""
-        if not self.order_items:
+        if not self.order:
             messagebox.showinfo("Your Cart", "Your cart is empty!")
             return
 
-        cart_window = tk.Toplevel(self.root)
-        cart_window.title("Your Cart")
-        cart_window.geometry("400x400")
-        cart_window.resizable(False, False)
-
-        # Main frame
-        cart_frame = ttk.Frame(cart_window, padding=10)
-        cart_frame.pack(fill=tk.BOTH, expand=True)
-
-        # Title
-        ttk.Label(cart_frame, text="Your Cart Items", font=('Helvetica', 14, 'bold')).pack(pady=5)
-
-        # Items frame with scrollbar
-        items_frame = ttk.Frame(cart_frame)
-        items_frame.pack(fill=tk.BOTH, expand=True)
-
-        canvas = tk.Canvas(items_frame)
-        scrollbar = ttk.Scrollbar(items_frame, orient="vertical", command=canvas.yview)
-        scrollable_frame = ttk.Frame(canvas)
-
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
-
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
-
-        canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-
-        # Add items with quantity controls
-        for item, quantity in self.order_items.items():
-            item_frame = ttk.Frame(scrollable_frame, padding=5)
-            item_frame.pack(fill=tk.X, pady=2)
-
-            # Item name and price
-            ttk.Label(item_frame, text=f"{item} - ₹{self.menu[item]['price']} each",
-                      font=('Helvetica', 10)).pack(side=tk.LEFT)
-
-            # Quantity controls
-            qty_frame = ttk.Frame(item_frame)
-            qty_frame.pack(side=tk.RIGHT)
-
-            # Decrease button
-            tk.Button(qty_frame, text="-", width=2,command=lambda i=item: self.adjust_quantity(i, -1, cart_window),bg='#f44336', fg='white',bd=0).pack(side=tk.LEFT, padx=2)
-
-            # Quantity display
-            ttk.Label(qty_frame, text=str(quantity), width=3).pack(side=tk.LEFT)
-
-            # Increase button
-            tk.Button(qty_frame, text="+", width=2,command=lambda i=item: self.adjust_quantity(i, 1, cart_window), bg='#4CAF50', fg='white', bd=0).pack(side=tk.LEFT, padx=2)
-
-            # Remove button
-            tk.Button(item_frame, text="Remove",command=lambda i=item: self.remove_item(i, cart_window), bg='#ff9800', fg='white', bd=0, padx=5).pack(side=tk.RIGHT, padx=5)
-
-        # Total label
-        ttk.Label(cart_frame, text=f"Total: ₹{self.order_total}",font=('Helvetica', 12, 'bold')).pack(pady=5)
+        # Reuse the open cart window rather than building a second one
+        if self.cart_view:
+            self.cart_view.window.lift()
+            return
 
-        # Done button
-        tk.Button(cart_frame, text="Done", command=cart_window.destroy,bg='#4CAF50', fg='white', padx=20, pady=5).pack(pady=10)
+        self.cart_view = CartView(self)
 
-    def adjust_quantity(self, item, change, cart_window):
+    def adjust_quantity(self, item, change):
         """Adjust quantity of an item in the cart"""
-        current_qty = self.order_items[item]
-        new_qty = current_qty + change
-
-        if new_qty <= 0:
-            # Remove item if quantity reaches 0
-            del self.order_items[item]
-        else:
-            self.order_items[item] = new_qty
-
-        # Recalculate total
-        self.order_total = sum(self.menu[item]["price"] * qty
-                               for item, qty in self.order_items.items())
+        # Removes the item if quantity reaches 0; the total is updated incrementally
+        self.order.adjust(item, change)
 
         # Update displays
-        self.update_order_display()
-
-        # Refresh cart window
-        cart_window.destroy()
-        self.view_cart()
+        self.refresh_order_item(item)
 
         # Disable checkout if cart is empty
-        if not self.order_items:
+        if not self.order:
             self.checkout_btn.config(state=tk.DISABLED)
 
-    def remove_item(self, item, cart_window):
+    def remove_item(self, item):
         """Completely remove an item from the cart"""
-        if item in self.order_items:
+        if item in self.order:
             # Subtract item's total from order total
-            self.order_total -= self.menu[item]["price"] * self.order_items[item]
-            del self.order_items[item]
+            self.order.remove(item)
 
             # Update displays
-            self.update_order_display()
-
-            # Refresh cart window
-            cart_window.destroy()
-            self.view_cart()
+            self.refresh_order_item(item)
 
             # Disable checkout if cart is empty
-            if not self.order_items:
+            if not self.order:
                 self.checkout_btn.config(state=tk.DISABLED)
 
     def clear_order(self):
-        self.order_items = {}
-        self.order_total = 0
+        self.order.clear()
         self.order_listbox.delete(0, tk.END)
+        self.order_rows = []
         self.total_label.config(text="Total: ₹0")
         self.checkout_btn.config(state=tk.DISABLED)
+        if self.cart_view:
+            self.cart_view.close()
+
+    def poll_receipts(self):
+        """Report receipts that failed to render; the done callbacks run on the worker thread"""
+        while True:
+            try:
+                record, error = self.receipt_results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending_receipts -= 1
+            if error is not None:
+                messagebox.showerror("Receipt Error", f"Could not create the receipt for order {record['order_id'][:8].upper()}: {error}")
+
+        if self.pending_receipts > 0:
+            self.root.after(100, self.poll_receipts)
 
     def checkout(self):
-        if not self.order_items:
+        if not self.order:
             messagebox.showwarning("Empty Order", "Your order is empty!")
             return
 
         order_summary = "\n".join(
-            [f"• {item} x{quantity} - ₹{self.menu[item]['price'] * quantity}"
-             for item, quantity in self.order_items.items()]
+            [f"• {item} x{quantity} - {format_paise(self.order.line_total(item))}"
+             for item, quantity in self.order.items()]
         )
 
         response = messagebox.askyesno(
             "Confirm Order",
-            f"Your Order:\n{order_summary}\n\nTotal: ₹{self.order_total}\n\nConfirm checkout?"
+            f"Your Order:\n{order_summary}\n\nTotal: {format_paise(self.order.total)}\n\nConfirm checkout?"
         )
 
         if response:
+            record = self.order.to_record(uuid.uuid4().hex, time.time())
+            record["terminal"] = self.terminal_name
+            try:
+                self.journal.append(record)
+            except Exception as e:
+                messagebox.showerror("Error", f"Failed to record order: {str(e)}")
+                return
+
+            # Sent in the background; the journal is the local record if the server is down
+            if self.order_link:
+                self.order_link.submit(record)
+
+            # Printable receipt, rendered off the Tk thread
+            os.makedirs(self.receipt_dir, exist_ok=True)
+            future = self.receipt_executor.submit(render_receipt, record, receipt_path(self.receipt_dir, record, "png"))
+            future.add_done_callback(lambda f, record=record: self.receipt_results.put((record, None if f.cancelled() else f.exception())))
+            self.pending_receipts += 1
+            if self.pending_receipts == 1:
+                self.root.after(100, self.poll_receipts)
+
             messagebox.showinfo(
                 "Order Placed",
-                f"Thank you for your order!\n\nYour total is ₹{self.order_total}\n\nPlease proceed to payment."
+                f"Thank you for your order!\n\nYour total is {format_paise(self.order.total)}\n\nPlease proceed to payment."
             )
             self.clear_order()
 
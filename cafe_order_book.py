@@ -0,0 +1,90 @@
+def to_paise(rupees):
+    """Convert a rupee price from the menu into integer paise"""
+    return int(round(rupees * 100))
+
+
+def format_paise(amount):
+    """Format a paise amount for display, e.g. 9000 -> '₹90', 9050 -> '₹90.50'"""
+    rupees, paise = divmod(amount, 100)
+    if paise:
+        return f"₹{rupees}.{paise:02d}"
+    return f"₹{rupees}"
+
+
+class OrderBook:
+    """Quantities and running totals for one order, independent of any UI"""
+
+    def __init__(self, menu):
+        # Prices are converted once so every update is plain integer arithmetic
+        self.prices = {item: to_paise(details["price"]) for item, details in menu.items()}
+        self.quantities = {}
+        self.total = 0  # In paise
+        self.unit_count = 0
+
+    def __len__(self):
+        return len(self.quantities)
+
+    def __bool__(self):
+        return bool(self.quantities)
+
+    def __contains__(self, item):
+        return item in self.quantities
+
+    def items(self):
+        """Iterate over (item, quantity) pairs in the order they were added"""
+        return self.quantities.items()
+
+    def quantity(self, item):
+        return self.quantities.get(item, 0)
+
+    def unit_price(self, item):
+        return self.prices[item]
+
+    def line_total(self, item):
+        return self.prices[item] * self.quantities.get(item, 0)
+
+    def add(self, item, quantity=1):
+        """Add units of an item and return its new quantity"""
+        if quantity <= 0:
+            raise ValueError("Quantity to add must be positive")
+        return self.adjust(item, quantity)
+
+    def adjust(self, item, change):
+        """Change an item's quantity by +/- change, removing it at zero. Returns the new quantity"""
+        price = self.prices[item]  # KeyError for items not on the menu
+        current_qty = self.quantities.get(item, 0)
+        new_qty = current_qty + change
+
+        if new_qty <= 0:
+            # Remove item if quantity reaches 0
+            self.quantities.pop(item, None)
+            new_qty = 0
+        else:
+            self.quantities[item] = new_qty
+
+        # Only the changed line contributes to the running totals
+        delta = new_qty - current_qty
+        self.total += price * delta
+        self.unit_count += delta
+        return new_qty
+
+    def remove(self, item):
+        """Completely remove an item and return the quantity that was removed"""
+        quantity = self.quantities.pop(item, 0)
+        self.total -= self.prices.get(item, 0) * quantity
+        self.unit_count -= quantity
+        return quantity
+
+    def to_record(self, order_id, ts):
+        """Plain-data snapshot of the order, as written to the order journal"""
+        return {
+            "order_id": order_id,
+            "ts": ts,
+            "items": [[item, quantity, self.prices[item]] for item, quantity in self.quantities.items()],
+            "total": self.total
+        }
+
+    def clear(self):
+        self.quantities = {}
+        self.total = 0
+        self.unit_count = 0
\ No newline at end of file
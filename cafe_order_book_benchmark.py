@@ -0,0 +1,63 @@
+import argparse
+import random
+import time
+
+from cafe_order_book import OrderBook, format_paise
+
+
+def make_menu(item_count):
+    """Synthetic catalog so the benchmark does not depend on the real menu"""
+    return {f"Item {i}": {"price": 20 + (i % 50) * 5} for i in range(item_count)}
+
+
+def recompute_total(order):
+    """The old approach: sum every line on each change"""
+    return sum(order.unit_price(item) * qty for item, qty in order.items())
+
+
+def run(operations, item_count, report_every, seed, naive):
+    rng = random.Random(seed)
+    menu = make_menu(item_count)
+    names = list(menu)
+    order = OrderBook(menu)
+
+    print(f"{'ops':>8} {'lines':>6} {'units':>8} {'us/op':>8}  total")
+    batch_start = time.perf_counter()
+    for i in range(1, operations + 1):
+        roll = rng.random()
+        item = rng.choice(names)
+        if roll < 0.55:
+            order.add(item, rng.randint(1, 3))
+        elif roll < 0.90:
+            order.adjust(item, rng.choice((-1, 1)))
+        elif roll < 0.99998:
+            order.remove(item)
+        else:
+            order.clear()
+
+        if naive:
+            recompute_total(order)
+
+        if i % report_every == 0:
+            elapsed = time.perf_counter() - batch_start
+            print(f"{i:>8} {len(order):>6} {order.unit_count:>8} {elapsed / report_every * 1e6:>8.2f}  "
+                  f"{format_paise(order.total)}")
+            batch_start = time.perf_counter()
+
+    # The running total must match a full recomputation
+    assert order.total == recompute_total(order), "running total drifted"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive mixed OrderBook operations and report latency")
+    parser.add_argument("--ops", type=int, default=100_000, help="number of operations")
+    parser.add_argument("--items", type=int, default=5000, help="number of menu items")
+    parser.add_argument("--every", type=int, default=10_000, help="report interval")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--naive", action="store_true", help="also recompute the total with sum() on every op")
+    args = parser.parse_args()
+    run(args.ops, args.items, args.every, args.seed, args.naive)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
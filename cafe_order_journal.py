@@ -0,0 +1,208 @@
+import json
+import os
+import threading
+import time
+
+INDEX_FILE = "index.json"
+
+
+def journal_name(day):
+    """File name for one day's journal, e.g. orders-20261018.jsonl"""
+    return f"orders-{day.replace('-', '')}.jsonl"
+
+
+def day_of(ts):
+    return time.strftime("%Y-%m-%d", time.localtime(ts))
+
+
+class OrderJournal:
+    """Append-only JSON-lines journal of confirmed orders with group commit.
+
+    append() only queues the record. A writer thread wakes every commit_interval
+    seconds, writes everything queued since the last wake-up and fsyncs once for
+    the whole batch. Files roll over daily and index.json lists them.
+    """
+
+    def __init__(self, journal_dir="order_journal", commit_interval=0.05):
+        self.journal_dir = journal_dir
+        self.commit_interval = commit_interval
+        os.makedirs(self.journal_dir, exist_ok=True)
+
+        self.index = self.load_index()
+        self.file = None
+        self.file_day = None
+
+        self.pending = []
+        self.appended = 0  # Records handed to append()
+        self.committed = 0  # Records written and fsynced
+        self.closed = False
+        self.error = None
+        self.lock = threading.Condition()
+
+        self.writer = threading.Thread(target=self.run, name="order-journal", daemon=True)
+        self.writer.start()
+
+    def load_index(self):
+        path = os.path.join(self.journal_dir, INDEX_FILE)
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass  # Rebuilt from the journal files below
+        return {"files": {}}
+
+    def save_index(self):
+        path = os.path.join(self.journal_dir, INDEX_FILE)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def append(self, record):
+        """Queue an order record; it is durable once the next group commit finishes"""
+        with self.lock:
+            if self.closed:
+                raise RuntimeError("Order journal is closed")
+            if self.error:
+                raise self.error
+            self.pending.append(record)
+            self.appended += 1
+            return self.appended
+
+    def flush(self, timeout=None):
+        """Block until every record appended so far has been fsynced"""
+        with self.lock:
+            target = self.appended
+            self.lock.notify_all()
+            return self.lock.wait_for(lambda: self.committed >= target or self.error, timeout)
+
+    def close(self):
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.lock.notify_all()
+        self.writer.join()
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def run(self):
+        while True:
+            with self.lock:
+                if not self.pending and not self.closed:
+                    self.lock.wait(self.commit_interval)
+                batch, self.pending = self.pending, []
+                closing = self.closed
+
+            if batch:
+                try:
+                    self.commit(batch)
+                except Exception as e:
+                    print(f"Error writing order journal: {e}")
+                    with self.lock:
+                        self.error = e
+                        self.lock.notify_all()
+                    return
+
+                with self.lock:
+                    self.committed += len(batch)
+                    self.lock.notify_all()
+
+            if closing and not batch:
+                return
+
+    def commit(self, batch):
+        """Write one batch and fsync it once"""
+        for record in batch:
+            day = day_of(record["ts"])
+            if day != self.file_day:
+                self.roll_over(day)
+
+            line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+            self.file.write(line.encode("utf-8"))
+
+            entry = self.index["files"][journal_name(day)]
+            entry["records"] += 1
+            entry["first_order"] = entry["first_order"] or record["order_id"]
+            entry["last_order"] = record["order_id"]
+
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+        self.index["files"][journal_name(self.file_day)]["bytes"] = self.file.tell()
+        self.save_index()
+
+    def roll_over(self, day):
+        """Switch to the journal file for another day, creating its index entry if needed"""
+        if self.file:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.index["files"][journal_name(self.file_day)]["bytes"] = self.file.tell()
+            self.file.close()
+
+        name = journal_name(day)
+        path = os.path.join(self.journal_dir, name)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+
+        entry = self.index["files"].get(name)
+        if entry is None or entry.get("bytes") != size:
+            # New file, or the index missed the last commit before a crash
+            entry = {"day": day, "records": 0, "bytes": 0, "first_order": None, "last_order": None}
+            if size:
+                with open(path, "rb") as f:
+                    for number, line in enumerate(f, 1):
+                        if not line.endswith(b"\n"):
+                            break
+                        entry["bytes"] += len(line)  # Kept even if unreadable; only a torn tail is cut off
+                        try:
+                            order_id = json.loads(line)["order_id"]
+                        except (ValueError, KeyError, TypeError) as e:
+                            print(f"Skipping unreadable record on line {number} of {path}: {e!r}")
+                            continue
+                        entry["records"] += 1
+                        entry["first_order"] = entry["first_order"] or order_id
+                        entry["last_order"] = order_id
+
+                # Drop a torn final record so new appends start on a clean line
+                if entry["bytes"] < size:
+                    os.truncate(path, entry["bytes"])
+            self.index["files"][name] = entry
+
+        self.file = open(path, "ab")
+        self.file_day = day
+
+
+def read_journal_file(path):
+    """Yield the records of one journal file, skipping a torn final line"""
+    with open(path, "rb") as f:
+        for number, line in enumerate(f, 1):
+            if not line.endswith(b"\n"):
+                break  # Partially written record from a crash
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("not a JSON object")
+            except ValueError as e:
+                print(f"Skipping unreadable record on line {number} of {path}: {e}")
+                continue
+            yield record
+
+
+def read_orders(journal_dir="order_journal", start_day=None, end_day=None):
+    """Yield every journaled order between start_day and end_day (YYYY-MM-DD, inclusive)"""
+    index_path = os.path.join(journal_dir, INDEX_FILE)
+    if os.path.exists(index_path):
+        with open(index_path, encoding="utf-8") as f:
+            days = sorted((entry["day"], name) for name, entry in json.load(f)["files"].items())
+    else:
+        days = sorted((f"{name[7:11]}-{name[11:13]}-{name[13:15]}", name)
+                      for name in os.listdir(journal_dir) if name.startswith("orders-"))
+
+    for day, name in days:
+        if (start_day and day < start_day) or (end_day and day > end_day):
+            continue
+        path = os.path.join(journal_dir, name)
+        if os.path.exists(path):
+            yield from read_journal_file(path)
\ No newline at end of file
@@ -0,0 +1,515 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from collections import deque
+
+# Wire protocol: one JSON object per line.
+#   terminal -> server  {"type": "hello", "role": "terminal", "name": ...}
+#   terminal -> server  {"type": "order", "order": {...}}
+#   server -> terminal  {"type": "ack", "ids": [...]}          (batched)
+#   server -> terminal  {"type": "error", "order_id": ..., "error": ...}  (malformed message)
+#   kitchen  -> server  {"type": "hello", "role": "kitchen", "name": ...}
+#   server -> kitchen   {"type": "orders", "orders": [...]}    (batched)
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+STREAM_LIMIT = 1024 * 1024  # Largest accepted line
+RECENT_ORDERS = 10000  # Order ids remembered so a terminal's resend isn't queued twice
+RETRY_DELAYS = (0.5, 1, 2, 5, 10, 30)  # Seconds between OrderLink attempts before it gives up
+
+
+def parse_address(address):
+    """'host:port' or 'unix:/path/to.sock' -> (host, port) or path"""
+    if address.startswith("unix:"):
+        return address[5:]
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+async def open_connection(address):
+    target = parse_address(address)
+    if isinstance(target, str):
+        return await asyncio.open_unix_connection(target, limit=STREAM_LIMIT)
+    return await asyncio.open_connection(*target, limit=STREAM_LIMIT)
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def valid_order_id(order_id):
+    return isinstance(order_id, str) and order_id != ""
+
+
+class KitchenFeed:
+    """One connected kitchen: its bounded backlog and the batch being written to it.
+
+    A plain deque rather than an asyncio.Queue, so that adding an order and
+    noticing the kitchen has gone happen without an await in between, and
+    nothing can land in a backlog after it has been handed back.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.backlog = deque()
+        self.sending = []  # Batch taken from the backlog whose write hasn't finished
+        self.changed = asyncio.Event()  # Backlog got an order, lost one, or the kitchen left
+        self.gone = False
+
+    async def offer(self, order):
+        """Wait for room and add the order; False if the kitchen left first"""
+        while len(self.backlog) >= self.limit and not self.gone:
+            self.changed.clear()
+            await self.changed.wait()
+        if self.gone:
+            return False
+        self.backlog.append(order)
+        self.changed.set()
+        return True
+
+    async def next_batch(self, size):
+        while not self.backlog:
+            self.changed.clear()
+            await self.changed.wait()
+        self.sending = [self.backlog.popleft() for _ in range(min(size, len(self.backlog)))]
+        self.changed.set()  # Room for the dispatcher
+        return self.sending
+
+    def leave(self):
+        """Mark the kitchen gone and return the orders it never received"""
+        self.gone = True
+        self.changed.set()
+        undelivered = self.sending + list(self.backlog)
+        self.sending = []
+        self.backlog.clear()
+        return undelivered
+
+
+class OrderServer:
+    """Accepts orders from terminals and fans them out to kitchen displays.
+
+    Accepted orders sit in a bounded queue. When it is full, terminal handlers
+    stop reading their sockets, so TCP flow control pushes back on the terminals.
+    Each kitchen has its own bounded backlog and the dispatcher waits for the
+    slowest kitchen rather than dropping orders. With no kitchen connected the
+    dispatcher holds orders until one subscribes, and orders a departing
+    kitchen never received go round again unless another kitchen already
+    got them, so acknowledged orders are never thrown away.
+    """
+
+    def __init__(self, max_pending=1000, kitchen_buffer=1000, ack_interval=0.02, ack_batch=100):
+        self.max_pending = max_pending
+        self.kitchen_buffer = kitchen_buffer
+        self.ack_interval = ack_interval
+        self.ack_batch = ack_batch
+        self.orders = None
+        self.kitchens = set()
+        self.kitchen_joined = None
+        self.undelivered = {}  # order_id -> holds: the dispatcher's, plus each kitchen backlog it waits in
+        self.recent = set()
+        self.recent_order = deque()
+        self.server = None
+        self.dispatcher = None
+        self.received = 0
+        self.delivered = 0
+
+    async def start(self, address):
+        self.orders = asyncio.Queue(self.max_pending)
+        self.kitchen_joined = asyncio.Event()
+        target = parse_address(address)
+        if isinstance(target, str):
+            if os.path.exists(target):
+                os.remove(target)
+            self.server = await asyncio.start_unix_server(self.handle_client, target, limit=STREAM_LIMIT)
+        else:
+            self.server = await asyncio.start_server(self.handle_client, *target, limit=STREAM_LIMIT)
+        self.dispatcher = asyncio.create_task(self.dispatch())
+        return self.server
+
+    @property
+    def address(self):
+        """Actual listening address, useful when started on port 0"""
+        sockname = self.server.sockets[0].getsockname()
+        if isinstance(sockname, str):
+            return f"unix:{sockname}"
+        return f"{sockname[0]}:{sockname[1]}"
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.dispatcher.cancel()
+
+    async def handle_client(self, reader, writer):
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            if not isinstance(hello, dict) or hello.get("type", "hello") != "hello":
+                writer.write(encode({"type": "error", "order_id": None, "error": "Expected a hello message"}))
+                await writer.drain()
+                return
+            if hello.get("role") == "kitchen":
+                await self.serve_kitchen(reader, writer)
+            else:
+                await self.serve_terminal(reader, writer)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve_terminal(self, reader, writer):
+        unacked = []
+        acker = asyncio.create_task(self.ack_loop(writer, unacked))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                order = None
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise ValueError("message is not an object")
+                    if message.get("type") != "order":
+                        continue
+                    order = message.get("order")
+                    if not isinstance(order, dict):
+                        raise ValueError("order is not an object")
+                    order_id = order.get("order_id")
+                    if not valid_order_id(order_id):
+                        raise ValueError("order_id must be a non-empty string")
+                except ValueError as e:
+                    # Not acked, so the terminal sees the order failed instead of waiting forever
+                    order_id = order.get("order_id") if isinstance(order, dict) else None
+                    writer.write(encode({"type": "error", "order_id": order_id if valid_order_id(order_id) else None,
+                                         "error": f"Malformed message: {e}"}))
+                    await writer.drain()
+                    continue
+
+                if order_id not in self.recent:
+                    # Blocks while the queue is full, which is the back-pressure point
+                    await self.orders.put(order)
+                    self.remember(order_id)
+                    self.received += 1
+                unacked.append(order_id)
+                if len(unacked) >= self.ack_batch:
+                    await self.send_acks(writer, unacked)
+        finally:
+            acker.cancel()
+            if unacked and not writer.is_closing():
+                await self.send_acks(writer, unacked)
+
+    def remember(self, order_id):
+        self.recent.add(order_id)
+        self.recent_order.append(order_id)
+        if len(self.recent_order) > RECENT_ORDERS:
+            self.recent.discard(self.recent_order.popleft())
+
+    async def ack_loop(self, writer, unacked):
+        """Acknowledge whatever has been accepted every ack_interval seconds"""
+        while True:
+            await asyncio.sleep(self.ack_interval)
+            if unacked:
+                await self.send_acks(writer, unacked)
+
+    async def send_acks(self, writer, unacked):
+        ids = unacked[:]
+        del unacked[:]
+        writer.write(encode({"type": "ack", "ids": ids}))
+        await writer.drain()
+
+    async def serve_kitchen(self, reader, writer):
+        feed = KitchenFeed(self.kitchen_buffer)
+        self.kitchens.add(feed)
+        self.kitchen_joined.set()
+        sender = asyncio.create_task(self.send_orders(feed, writer))
+        reading = asyncio.create_task(reader.read())
+        try:
+            # Kitchens only listen; EOF means they went away, and a failed write ends the sender
+            await asyncio.wait([reading, sender], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            reading.cancel()
+            self.kitchens.discard(feed)
+            if not self.kitchens:
+                self.kitchen_joined.clear()
+            sender.cancel()
+            for order in feed.leave():
+                self.release(order)
+
+    async def send_orders(self, feed, writer):
+        try:
+            while True:
+                batch = await feed.next_batch(self.ack_batch)
+                writer.write(encode({"type": "orders", "orders": batch}))
+                await writer.drain()  # Slow kitchens fill their backlog and stall dispatch
+                feed.sending = []
+                for order in batch:
+                    self.undelivered.pop(order["order_id"], None)  # Reached a kitchen
+                self.delivered += len(batch)
+        except ConnectionError:
+            pass
+
+    def release(self, order):
+        """Drop one hold on an undelivered order; the last one sends it round again"""
+        holds = self.undelivered.get(order["order_id"])
+        if holds is None:
+            return  # Another kitchen already received it
+        if holds > 1:
+            self.undelivered[order["order_id"]] = holds - 1
+            return
+        del self.undelivered[order["order_id"]]
+        asyncio.create_task(self.orders.put(order))
+
+    async def dispatch(self):
+        while True:
+            order = await self.orders.get()
+            while not self.kitchens:
+                await self.kitchen_joined.wait()
+            # The dispatcher's own hold stops a kitchen leaving mid-loop from requeueing the order
+            self.undelivered[order["order_id"]] = 1
+            for feed in list(self.kitchens):
+                if await feed.offer(order) and order["order_id"] in self.undelivered:
+                    self.undelivered[order["order_id"]] += 1
+            self.release(order)
+
+
+class OrderClient:
+    """Terminal-side connection that submits orders and resolves them on batched acks"""
+
+    def __init__(self, address, name="terminal", max_in_flight=500):
+        self.address = address
+        self.name = name
+        self.in_flight = asyncio.Semaphore(max_in_flight)
+        self.waiting = {}  # order_id -> future
+        self.reader = None
+        self.writer = None
+        self.ack_reader = None
+
+    async def connect(self):
+        self.reader, self.writer = await open_connection(self.address)
+        self.writer.write(encode({"type": "hello", "role": "terminal", "name": self.name}))
+        self.ack_reader = asyncio.create_task(self.read_acks())
+
+    async def submit(self, order):
+        """Send one order; returns a future that completes when the server acknowledges it"""
+        await self.in_flight.acquire()
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[order["order_id"]] = future
+        try:
+            self.writer.write(encode({"type": "order", "order": order}))
+            await self.writer.drain()
+        except OSError as e:
+            self.resolve(order["order_id"], e)
+        return future
+
+    def resolve(self, order_id, error=None):
+        future = self.waiting.pop(order_id, None)
+        if future is None:
+            return
+        self.in_flight.release()
+        if not future.done():
+            if error is None:
+                future.set_result(order_id)
+            else:
+                future.set_exception(error)
+
+    async def read_acks(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if message.get("type") == "error":
+                    self.resolve(message.get("order_id"), ValueError(message.get("error", "Rejected by the order server")))
+                    continue
+                for order_id in message.get("ids", ()):
+                    self.resolve(order_id)
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            # Connection lost: fail everything still waiting, giving back each one's permit
+            error = ConnectionError("Order server closed the connection")
+            for order_id in list(self.waiting):
+                self.resolve(order_id, error)
+
+    async def close(self):
+        self.writer.close()
+        await self.ack_reader
+
+
+class OrderLink:
+    """Thread-safe, fire-and-forget order submission for the Tk app.
+
+    Each order is retried, reconnecting as needed, until the server acks it;
+    the server ignores a resent order id it has already queued.
+    """
+
+    def __init__(self, address, name, retry_delays=RETRY_DELAYS):
+        self.address = address
+        self.name = name
+        self.retry_delays = retry_delays
+        self.loop = asyncio.new_event_loop()
+        self.client = None
+        self.connecting = None
+        self.thread = threading.Thread(target=self.loop.run_forever, name="order-link", daemon=True)
+        self.thread.start()
+
+    def submit(self, order):
+        """Queue an order for the server without waiting for it"""
+        asyncio.run_coroutine_threadsafe(self.send(order), self.loop)
+
+    async def connected_client(self):
+        if self.connecting is None:
+            self.connecting = asyncio.Lock()
+        async with self.connecting:  # Orders sent while reconnecting share one new connection
+            if self.client is None or self.client.writer.is_closing():
+                client = OrderClient(self.address, self.name)
+                await client.connect()
+                self.client = client
+            return self.client
+
+    async def send(self, order):
+        for attempt, delay in enumerate(self.retry_delays + (None,), 1):
+            client = None
+            try:
+                client = await self.connected_client()
+                await (await client.submit(order))  # Done once the server has acked it
+                return
+            except ValueError as e:
+                print(f"Order {order['order_id']} rejected by {self.address}: {e}")
+                return
+            except OSError as e:  # ConnectionError included
+                if client is not None and self.client is client:
+                    self.client = None
+                if delay is None:
+                    print(f"Giving up on order {order['order_id']} after {attempt} attempts: {e}")
+                    return
+                print(f"Error sending order {order['order_id']} to {self.address}: {e}; retrying in {delay}s")
+                await asyncio.sleep(delay)
+
+    def close(self):
+        if self.client:
+            asyncio.run_coroutine_threadsafe(self.client.close(), self.loop)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+async def kitchen_display(address, name="kitchen", on_orders=None):
+    """Subscribe to the server and pass each batch of orders to on_orders"""
+    reader, writer = await open_connection(address)
+    writer.write(encode({"type": "hello", "role": "kitchen", "name": name}))
+    await writer.drain()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            orders = json.loads(line).get("orders", [])
+            if on_orders:
+                on_orders(orders)
+            else:
+                for order in orders:
+                    items = ", ".join(f"{item} x{quantity}" for item, quantity, _ in order["items"])
+                    print(f"[{order.get('terminal', '?')}] {order['order_id'][:8]}: {items}")
+    finally:
+        writer.close()
+
+
+async def simulate(terminals, orders_per_terminal, rate, kitchens):
+    """Run a server, kitchens and terminals on localhost and report throughput and ack latency"""
+    server = OrderServer()
+    await server.start("127.0.0.1:0")
+    address = server.address
+
+    received = [0] * kitchens
+
+    def counter(index):
+        def on_orders(batch):
+            received[index] += len(batch)
+        return on_orders
+
+    kitchen_tasks = [asyncio.create_task(kitchen_display(address, f"kitchen-{i}", counter(i)))
+                     for i in range(kitchens)]
+    while len(server.kitchens) < kitchens:
+        await asyncio.sleep(0.01)
+
+    latencies = []
+    menu = ["Pizza", "Pasta", "Burger", "Salad", "Coffee"]
+
+    async def terminal(index):
+        client = OrderClient(address, f"terminal-{index}")
+        await client.connect()
+        interval = 60.0 / rate if rate else 0
+        pending = []
+        for _ in range(orders_per_terminal):
+            order = {
+                "order_id": uuid.uuid4().hex,
+                "terminal": client.name,
+                "ts": time.time(),
+                "items": [[item, random.randint(1, 3), 5000] for item in random.sample(menu, random.randint(1, 3))]
+            }
+            sent = time.perf_counter()
+            future = await client.submit(order)
+            future.add_done_callback(lambda f, sent=sent: latencies.append(time.perf_counter() - sent))
+            pending.append(future)
+            if interval:
+                await asyncio.sleep(interval)
+        await asyncio.gather(*pending)
+        await client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(terminal(i) for i in range(terminals)))
+    total = terminals * orders_per_terminal
+    while min(received) < total:
+        await asyncio.sleep(0.01)
+    elapsed = time.perf_counter() - started
+
+    for task in kitchen_tasks:
+        task.cancel()
+    await asyncio.gather(*kitchen_tasks, return_exceptions=True)
+    while server.kitchens:
+        await asyncio.sleep(0.01)
+    await server.close()
+
+    latencies.sort()
+    print(f"{terminals} terminals sent {total} orders to {kitchens} kitchen(s) in {elapsed:.2f}s "
+          f"({total / elapsed * 60:.0f} orders/min)")
+    print(f"Ack latency: median {latencies[len(latencies) // 2] * 1000:.1f} ms, "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms")
+    return received
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cafe order server for multiple counter terminals")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve = sub.add_parser("serve", help="run the order server")
+    serve.add_argument("--address", default=DEFAULT_ADDRESS, help="host:port or unix:/path")
+
+    kitchen = sub.add_parser("kitchen", help="print orders as a kitchen display")
+    kitchen.add_argument("--address", default=DEFAULT_ADDRESS)
+
+    sim = sub.add_parser("simulate", help="run simulated terminals against a local server")
+    sim.add_argument("--terminals", type=int, default=8)
+    sim.add_argument("--orders", type=int, default=1000, help="orders per terminal")
+    sim.add_argument("--rate", type=float, default=0, help="orders per minute per terminal (0 = as fast as possible)")
+    sim.add_argument("--kitchens", type=int, default=1)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        async def run_server():
+            server = OrderServer()
+            await server.start(args.address)
+            print(f"Order server listening on {server.address}")
+            await server.server.serve_forever()
+        asyncio.run(run_server())
+    elif args.command == "kitchen":
+        asyncio.run(kitchen_display(args.address))
+    else:
+        asyncio.run(simulate(args.terminals, args.orders, args.rate, args.kitchens))
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
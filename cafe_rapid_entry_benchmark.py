@@ -0,0 +1,124 @@
+import argparse
+import time
+import tkinter as tk
+
+from cafe_management_system import CafeManagementSystem
+
+
+class EntryStandIn:
+    """Stand-in for the SKU Entry without a display: just enough of get(), insert() and delete()"""
+
+    def __init__(self):
+        self.text = ""
+
+    def get(self):
+        return self.text
+
+    def insert(self, index, text):
+        self.text += text  # Typing always appends
+
+    def delete(self, first, last=None):
+        self.text = ""  # Only ever cleared as a whole
+
+
+class ListboxStandIn:
+    def __init__(self):
+        self.rows = []
+
+    def insert(self, index, text):
+        self.rows.insert(len(self.rows) if index == tk.END else index, text)
+
+    def delete(self, first, last=None):
+        if last is None:
+            del self.rows[first]
+        else:
+            self.rows.clear()
+
+
+class WidgetStandIn:
+    """Labels, buttons and the toast: configuring them is all rapid entry does"""
+
+    def config(self, **options):
+        self.options = options
+
+    def show(self, message):
+        self.message = message
+
+
+def headless_app():
+    """The app's own order state, set up as __init__ does, with stand-ins for the widgets rapid entry touches"""
+    app = CafeManagementSystem.__new__(CafeManagementSystem)
+    app.setup_order_state()
+    app.sku_entry = EntryStandIn()
+    app.order_listbox = ListboxStandIn()
+    app.total_label = app.checkout_btn = app.toast = WidgetStandIn()
+    return app
+
+
+def report(app, item_count, keystrokes, elapsed):
+    entered = app.order.unit_count
+    print(f"Entered {entered} of {item_count} items ({keystrokes} keystrokes) in {elapsed:.2f}s")
+    print(f"{entered / elapsed:.0f} items/s, {keystrokes / elapsed:.0f} keystrokes/s")
+    print(f"Order: {len(app.order)} lines")
+
+
+def run_headless(item_count):
+    """Call the Enter handler directly with each code already in the field: no key events, no drawing"""
+    app = headless_app()
+    codes = list(app.sku_codes)
+    started = time.perf_counter()
+    for i in range(item_count):
+        app.sku_entry.insert(tk.END, codes[i % len(codes)])
+        app.on_sku_entered()
+    elapsed = time.perf_counter() - started
+
+    entered = app.order.unit_count
+    print(f"Handler-only timing (no Tk events or drawing): {entered} of {item_count} items in {elapsed:.2f}s")
+    print(f"{entered / elapsed:.0f} items/s through on_sku_entered")
+    print(f"Order: {len(app.order)} lines")
+
+
+def run(item_count, update_every):
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No Tk display ({e}); timing the entry handlers with stand-in widgets")
+        run_headless(item_count)
+        return
+
+    app = CafeManagementSystem(root)
+    root.update()
+
+    app.toggle_rapid_entry(True)
+    app.sku_entry.focus_force()
+    root.update()
+
+    codes = list(app.sku_codes)
+    keystrokes = 0
+    started = time.perf_counter()
+    for i in range(item_count):
+        # Type the code digit by digit, then Enter, exactly as a cashier would
+        for ch in codes[i % len(codes)]:
+            app.sku_entry.event_generate("<KeyPress>", keysym=ch, when="tail")
+            keystrokes += 1
+        app.sku_entry.event_generate("<KeyPress>", keysym="Return", when="tail")
+        keystrokes += 1
+
+        if (i + 1) % update_every == 0:
+            root.update()
+    root.update()
+    report(app, item_count, keystrokes, time.perf_counter() - started)
+
+    app.on_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure rapid-entry throughput with synthetic key events")
+    parser.add_argument("--items", type=int, default=2000, help="number of items to enter")
+    parser.add_argument("--update-every", type=int, default=25, help="run the event loop after this many items")
+    args = parser.parse_args()
+    run(args.items, args.update_every)
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,166 @@
+import argparse
+import os
+import random
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageDraw, ImageFont
+
+from cafe_order_book import format_paise
+from cafe_order_journal import read_orders
+
+RECEIPT_WIDTH = 384  # Dots across a 58 mm thermal printer
+MARGIN = 16
+LINE_HEIGHT = 22
+LOGO_SIZE = (96, 96)
+LOGO_FILE = "coffee.png"
+FONT_CANDIDATES = ["DejaVuSans.ttf", "arial.ttf", "Arial.ttf"]
+
+# Loaded once per process: by init_worker in pool workers, lazily otherwise
+_resources = None
+
+
+def load_font(size, bold=False):
+    names = FONT_CANDIDATES
+    if bold:
+        names = ["DejaVuSans-Bold.ttf", "arialbd.ttf", "Arial Bold.ttf"] + names
+    for name in names:
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+
+def init_worker(logo_path=LOGO_FILE):
+    """Load fonts and the logo bitmap once for every receipt this process renders"""
+    global _resources
+    logo = None
+    if os.path.exists(logo_path):
+        logo = Image.open(logo_path).convert("RGBA")
+        logo.thumbnail(LOGO_SIZE, Image.LANCZOS)
+    _resources = {
+        "logo": logo,
+        "title": load_font(20, bold=True),
+        "body": load_font(14),
+        "total": load_font(16, bold=True)
+    }
+
+
+def get_resources():
+    if _resources is None:
+        init_worker()
+    return _resources
+
+
+def render_receipt(record, path):
+    """Render one order record (as built by checkout) to a PNG or PDF chosen by path's extension"""
+    res = get_resources()
+    body = res["body"]
+    logo = res["logo"]
+
+    header_height = (logo.height + 10 if logo else 0) + 30 + 3 * LINE_HEIGHT
+    height = MARGIN * 2 + header_height + (len(record["items"]) + 3) * LINE_HEIGHT
+    img = Image.new("RGB", (RECEIPT_WIDTH, height), "white")
+    draw = ImageDraw.Draw(img)
+
+    y = MARGIN
+    if logo:
+        img.paste(logo, ((RECEIPT_WIDTH - logo.width) // 2, y), logo)
+        y += logo.height + 10
+
+    draw.text((RECEIPT_WIDTH // 2, y), "Delicious Cafe", font=res["title"], fill="black", anchor="mt")
+    y += 30
+
+    when = time.strftime("%d %b %Y %H:%M", time.localtime(record["ts"]))
+    draw.text((MARGIN, y), f"Order {record['order_id'][:8].upper()}", font=body, fill="black")
+    y += LINE_HEIGHT
+    draw.text((MARGIN, y), when, font=body, fill="black")
+    y += LINE_HEIGHT
+    if record.get("terminal"):
+        draw.text((MARGIN, y), f"Counter: {record['terminal']}", font=body, fill="black")
+    y += LINE_HEIGHT
+
+    draw.line((MARGIN, y + 4, RECEIPT_WIDTH - MARGIN, y + 4), fill="black")
+    y += LINE_HEIGHT // 2
+
+    for item, quantity, unit_price in record["items"]:
+        draw.text((MARGIN, y), f"{item} x{quantity}", font=body, fill="black")
+        draw.text((RECEIPT_WIDTH - MARGIN, y), format_paise(unit_price * quantity), font=body, fill="black", anchor="ra")
+        y += LINE_HEIGHT
+
+    draw.line((MARGIN, y + 4, RECEIPT_WIDTH - MARGIN, y + 4), fill="black")
+    y += LINE_HEIGHT // 2
+    draw.text((MARGIN, y), "Total", font=res["total"], fill="black")
+    draw.text((RECEIPT_WIDTH - MARGIN, y), format_paise(record["total"]), font=res["total"], fill="black", anchor="ra")
+    y += LINE_HEIGHT + 4
+    draw.text((RECEIPT_WIDTH // 2, y), "Thank you for your order!", font=body, fill="black", anchor="mt")
+
+    if path.lower().endswith(".pdf"):
+        img.save(path, "PDF", resolution=203)  # Thermal printer DPI
+    else:
+        img.save(path, "PNG", compress_level=1)  # Fast; receipts are mostly white
+    return path
+
+
+def receipt_path(out_dir, record, fmt):
+    return os.path.join(out_dir, f"receipt-{record['order_id']}.{fmt}")
+
+
+def _render_job(job):
+    record, path = job
+    return render_receipt(record, path)
+
+
+def batch_render(records, out_dir="receipts", fmt="png", workers=None, logo_path=LOGO_FILE):
+    """Render many receipts across a process pool; returns the number rendered"""
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = [(record, receipt_path(out_dir, record, fmt)) for record in records]
+    if not jobs:
+        return 0
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(logo_path,)) as pool:
+        return sum(1 for _ in pool.map(_render_job, jobs, chunksize=chunksize))
+
+
+def synthetic_orders(count):
+    menu = [("Pizza", 9000), ("Pasta", 6000), ("Burger", 5000), ("Salad", 7000), ("Coffee", 8000)]
+    orders = []
+    for _ in range(count):
+        items = [[item, random.randint(1, 3), price] for item, price in random.sample(menu, random.randint(1, 5))]
+        orders.append({
+            "order_id": uuid.uuid4().hex,
+            "ts": time.time(),
+            "items": items,
+            "total": sum(quantity * price for _, quantity, price in items)
+        })
+    return orders
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render cafe receipts, e.g. a day's orders for accounting")
+    parser.add_argument("--day", default=time.strftime("%Y-%m-%d"), help="day to re-render (YYYY-MM-DD)")
+    parser.add_argument("--journal", default="order_journal", help="order journal directory")
+    parser.add_argument("--out", default="receipts", help="output directory")
+    parser.add_argument("--format", choices=["png", "pdf"], default="png")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="render N random orders instead of the journal")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        records = synthetic_orders(args.synthetic)
+    else:
+        records = list(read_orders(args.journal, args.day, args.day))
+
+    started = time.perf_counter()
+    count = batch_render(records, args.out, args.format, args.workers)
+    elapsed = time.perf_counter() - started
+    rate = count / elapsed if elapsed else 0
+    print(f"Rendered {count} receipts to {args.out} in {elapsed:.2f}s ({rate:.0f}/s)")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
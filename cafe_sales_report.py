@@ -0,0 +1,205 @@
+import argparse
+import time
+
+import numpy as np
+
+from cafe_catalog import load_menu
+from cafe_order_book import format_paise, to_paise
+from cafe_order_journal import read_orders
+
+
+class SalesHistory:
+    """Columnar order history: one array entry per order line, plus per-order columns.
+
+    Lines are stored grouped by order, so line_order is non-decreasing.
+    """
+
+    def __init__(self, item_names, line_order, line_item, line_qty, line_price, order_ts):
+        self.item_names = item_names
+        self.line_order = line_order
+        self.line_item = line_item
+        self.line_qty = line_qty
+        self.line_price = line_price
+        self.order_ts = order_ts
+
+    @property
+    def order_count(self):
+        return len(self.order_ts)
+
+    @property
+    def line_count(self):
+        return len(self.line_order)
+
+
+def load_history(menu, journal_dir="order_journal", start_day=None, end_day=None):
+    """Read the order journal into a SalesHistory keyed on the menu's item names"""
+    item_names = list(menu)
+    codes = {name: code for code, name in enumerate(item_names)}
+
+    line_order, line_item, line_qty, line_price, order_ts = [], [], [], [], []
+    for order_idx, record in enumerate(read_orders(journal_dir, start_day, end_day)):
+        order_ts.append(record["ts"])
+        for item, quantity, unit_price in record["items"]:
+            code = codes.get(item)
+            if code is None:
+                # Item no longer on the menu, keep it under its own code
+                code = codes[item] = len(item_names)
+                item_names.append(item)
+            line_order.append(order_idx)
+            line_item.append(code)
+            line_qty.append(quantity)
+            line_price.append(unit_price)
+
+    return SalesHistory(
+        item_names,
+        np.array(line_order, dtype=np.int64),
+        np.array(line_item, dtype=np.int32),
+        np.array(line_qty, dtype=np.int32),
+        np.array(line_price, dtype=np.int64),
+        np.array(order_ts, dtype=np.float64)
+    )
+
+
+def synthetic_history(menu, order_count, days=30, seed=0):
+    """Random history built directly as arrays, for timing reports at scale"""
+    rng = np.random.default_rng(seed)
+    item_names = list(menu)
+    prices = np.array([to_paise(menu[name]["price"]) for name in item_names], dtype=np.int64)
+
+    # 1-6 distinct items per order
+    sizes = rng.integers(1, 7, size=order_count)
+    sizes = np.minimum(sizes, len(item_names))
+    line_order = np.repeat(np.arange(order_count, dtype=np.int64), sizes)
+
+    # Draw items per line and drop repeats within an order
+    line_item = rng.integers(0, len(item_names), size=len(line_order)).astype(np.int32)
+    keys = line_order * len(item_names) + line_item
+    keys = np.unique(keys)
+    line_order = keys // len(item_names)
+    line_item = (keys % len(item_names)).astype(np.int32)
+
+    line_qty = rng.integers(1, 4, size=len(line_order)).astype(np.int32)
+    start = time.time() - days * 86400
+    order_ts = np.sort(start + rng.random(order_count) * days * 86400)
+    return SalesHistory(item_names, line_order, line_item, line_qty, prices[line_item], order_ts)
+
+
+def revenue_per_item(history):
+    """Return (units, revenue in paise) arrays indexed by item code"""
+    n = len(history.item_names)
+    units = np.bincount(history.line_item, weights=history.line_qty, minlength=n).astype(np.int64)
+    revenue = np.bincount(history.line_item, weights=history.line_qty * history.line_price,
+                          minlength=n).astype(np.int64)
+    return units, revenue
+
+
+OFFSET_STEP = 900  # Present-day zones only change their UTC offset on a quarter-hour boundary
+
+
+def local_hours(ts):
+    """Local hour of day for each timestamp, looking up the UTC offset once per quarter hour.
+
+    Per quarter hour rather than per day, so hours either side of a DST change land in the right bucket.
+    """
+    steps = np.floor(ts / OFFSET_STEP).astype(np.int64)
+    unique_steps, inverse = np.unique(steps, return_inverse=True)
+    offsets = np.array([time.localtime(step * OFFSET_STEP).tm_gmtoff for step in unique_steps.tolist()],
+                       dtype=np.float64)
+    return ((ts + offsets[inverse]) // 3600 % 24).astype(np.int64)
+
+
+def hourly_throughput(history):
+    """Return (orders, units) arrays of length 24 indexed by local hour"""
+    hours = local_hours(history.order_ts)
+    orders = np.bincount(hours, minlength=24)
+    units = np.bincount(hours[history.line_order], weights=history.line_qty, minlength=24).astype(np.int64)
+    return orders, units
+
+
+def basket_sizes(history):
+    """Return counts where counts[k] is the number of orders with k units"""
+    units_per_order = np.bincount(history.line_order, weights=history.line_qty,
+                                  minlength=history.order_count).astype(np.int64)
+    return np.bincount(units_per_order)
+
+
+def top_pairs(history, top=10):
+    """Most frequent item pairs bought together, as [(item_a, item_b, orders)]"""
+    n = len(history.item_names)
+    if history.line_count == 0:
+        return []
+
+    # Lines per order and where each order's lines start
+    counts = np.bincount(history.line_order, minlength=history.order_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    line_start = np.repeat(starts, counts)
+    line_end = line_start + np.repeat(counts, counts)
+
+    # Pair each line with every later line of the same order
+    positions = np.arange(history.line_count)
+    partners = line_end - positions - 1
+    left = np.repeat(positions, partners)
+    if len(left) == 0:
+        return []
+    group_start = np.repeat(np.cumsum(partners) - partners, partners)
+    right = left + 1 + (np.arange(len(left)) - group_start)
+
+    a = history.line_item[left].astype(np.int64)
+    b = history.line_item[right].astype(np.int64)
+    pair_codes = np.minimum(a, b) * n + np.maximum(a, b)
+    codes, pair_counts = np.unique(pair_codes, return_counts=True)
+
+    best = np.argsort(pair_counts, kind="stable")[::-1][:top]
+    return [(history.item_names[codes[i] // n], history.item_names[codes[i] % n], int(pair_counts[i]))
+            for i in best]
+
+
+def print_report(history, top=10):
+    print(f"Orders: {history.order_count}   Lines: {history.line_count}")
+
+    print("\nRevenue per item")
+    units, revenue = revenue_per_item(history)
+    for code in np.argsort(revenue)[::-1]:
+        if units[code]:
+            print(f"  {history.item_names[code]:<30} {units[code]:>8} units  {format_paise(int(revenue[code])):>14}")
+    print(f"  {'Total':<30} {units.sum():>8} units  {format_paise(int(revenue.sum())):>14}")
+
+    print("\nHourly throughput")
+    orders, hour_units = hourly_throughput(history)
+    for hour in range(24):
+        if orders[hour]:
+            print(f"  {hour:02d}:00  {orders[hour]:>8} orders  {hour_units[hour]:>8} units")
+
+    print("\nBasket size distribution (units per order)")
+    for size, count in enumerate(basket_sizes(history)):
+        if count:
+            print(f"  {size:>3}  {count:>8} orders")
+
+    print(f"\nTop {top} item pairs")
+    for item_a, item_b, count in top_pairs(history, top):
+        print(f"  {item_a} + {item_b}: {count} orders")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-of-day sales report from the order journal")
+    parser.add_argument("--journal", default="order_journal", help="order journal directory")
+    parser.add_argument("--start", help="first day to include (YYYY-MM-DD)")
+    parser.add_argument("--end", help="last day to include (YYYY-MM-DD)")
+    parser.add_argument("--top", type=int, default=10, help="number of item pairs to show")
+    parser.add_argument("--synthetic", type=int, metavar="ORDERS", help="report on random orders instead of the journal")
+    args = parser.parse_args()
+
+    menu = load_menu()
+    started = time.perf_counter()
+    if args.synthetic:
+        history = synthetic_history(menu, args.synthetic)
+    else:
+        history = load_history(menu, args.journal, args.start, args.end)
+    loaded = time.perf_counter()
+
+    print_report(history, args.top)
+    print(f"\nLoaded in {loaded - started:.2f}s, reported in {time.perf_counter() - loaded:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+import hashlib
+import os
+import threading
+from PIL import Image
+
+TRIM_TO = 0.9  # Eviction frees down to this share of max_bytes, so a full cache isn't listed on every store
+
+
+class ThumbnailCache:
+    """Persistent on-disk cache of resized menu images.
+
+    A running total of the cache's size is kept, so the directory is only
+    listed once up front and again when the total goes over max_bytes.
+    """
+
+    def __init__(self, cache_dir=".thumbnail_cache", max_bytes=50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.total_bytes = None  # Bytes of .png entries; None until the first store lists the directory
+        self.lock = threading.Lock()  # Loader threads store concurrently
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def cache_path(self, src_path, size):
+        """Return the cache file for a source image, or None if the source is missing"""
+        try:
+            st = os.stat(src_path)
+        except OSError:
+            return None
+
+        # Key on everything that changes the resulting thumbnail
+        key = f"{os.path.abspath(src_path)}|{st.st_mtime_ns}|{st.st_size}|{size[0]}x{size[1]}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.png")
+
+    def lookup(self, src_path, size):
+        """Return the path of a cached thumbnail, or None on a miss"""
+        path = self.cache_path(src_path, size)
+        if path is None or not os.path.exists(path):
+            return None
+
+        # Touch the entry so eviction treats it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def load(self, src_path, size):
+        """Return a resized PIL image, decoding the source only on a cache miss"""
+        cached = self.lookup(src_path, size)
+        if cached is not None:
+            try:
+                img = Image.open(cached)
+                img.load()
+                return img
+            except Exception:
+                pass  # Corrupt entry, rebuild it below
+
+        img = Image.open(src_path)
+        img = img.resize(size, Image.LANCZOS)
+        self.store(src_path, size, img)
+        return img
+
+    def store(self, src_path, size, img):
+        """Write a thumbnail into the cache and trim the cache if needed"""
+        path = self.cache_path(src_path, size)
+        if path is None:
+            return
+
+        # Write to a temp name first so a crash never leaves a half-written entry
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            img.save(tmp_path, "PNG")
+            added = os.path.getsize(tmp_path)
+            try:
+                added -= os.path.getsize(path)  # Replacing a corrupt entry
+            except OSError:
+                pass
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error caching thumbnail for {src_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        with self.lock:
+            if self.total_bytes is not None:
+                self.total_bytes += added
+            over = self.total_bytes is None or self.total_bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self):
+        """List the cache and, if it is over max_bytes, remove least recently used entries"""
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".png"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue  # Removed by another loader thread
+                entries.append((st.st_mtime, st.st_size, entry.path))
+                total += st.st_size
+
+        if total > self.max_bytes:
+            entries.sort()  # Oldest first
+            for _, entry_size, path in entries:
+                try:
+                    os.remove(path)
+                    total -= entry_size
+                except OSError:
+                    pass
+                if total <= self.max_bytes * TRIM_TO:
+                    break
+        with self.lock:
+            self.total_bytes = total
\ No newline at end of file
@@ -1,6 +1,363 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+import threading
+import queue
+import time
+from collections import deque
+from itertools import islice
 from tkinter.font import Font
+from contact_dedupe import find_duplicates, merge_contacts
+from contact_import_export import export_contacts, import_contacts
+from contact_lookup import ReverseLookup
+from contact_records import ContactTable
+from contact_search_index import SearchIndex
+from contact_store import ContactStore
+from contact_sync import apply_changes, export_changes, known_peers, list_conflicts, peer_state, resolve_conflict
+
+
+class VirtualContactList:
+    """Treeview that holds only the rows in view.
+
+    Rows come from a source with count() and page(offset, limit), such as
+    ContactStore. Scrolling slides a window over the source instead of over
+    Treeview items, so a redraw costs the same for ten contacts or a million.
+    A source that also has page_after(name, limit) and page_before(name,
+    limit), as the store does, is read by key from the row next to the ones
+    in view, since an OFFSET has to step over every row it skips.
+    """
+
+    def __init__(self, tree, scrollbar, source):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.source = source
+        self.first_number = 1
+        self.total = 0
+        self.offset = 0  # Source index of the top row
+        self.rows = []  # Rows in the Treeview, top to bottom
+        self.rows_offset = 0  # Source index of rows[0]
+        self.visible = 10  # Rows that fit, updated when the Treeview is resized
+        self.selected_name = None
+        self.render_job = None
+
+        rowheight = ttk.Style().lookup('Treeview', 'rowheight')
+        self.row_height = int(rowheight) if rowheight else 20
+
+        self.scrollbar.config(command=self.on_scroll)
+        self.tree.bind('<Configure>', self.on_resize)
+        self.tree.bind('<<TreeviewSelect>>', self.on_select)
+        self.tree.bind('<MouseWheel>', lambda e: self.scroll_by(-3 if e.delta > 0 else 3))
+        self.tree.bind('<Button-4>', lambda e: self.scroll_by(-3))
+        self.tree.bind('<Button-5>', lambda e: self.scroll_by(3))
+        self.tree.bind('<Up>', lambda e: self.move_selection(-1))
+        self.tree.bind('<Down>', lambda e: self.move_selection(1))
+        self.tree.bind('<Prior>', lambda e: self.move_selection(-self.visible))
+        self.tree.bind('<Next>', lambda e: self.move_selection(self.visible))
+
+    def set_source(self, source, first_number=1, keep_offset=False):
+        """Show another source from the top, or re-read the current one in place"""
+        if source is not self.source and not keep_offset:
+            self.offset = 0
+            self.selected_name = None
+        self.source = source
+        self.rows = []
+        self.first_number = first_number
+        self.refresh()
+
+    def refresh(self):
+        self.total = self.source.count()
+        self.render()
+
+    def grow(self):
+        """The source gained rows at the end; redraw only if the window isn't full yet"""
+        self.total = self.source.count()
+        if len(self.tree.get_children()) < self.visible:
+            self.render()
+        else:
+            self.update_scrollbar()
+
+    def render(self):
+        """Fill the Treeview with the rows at the current offset, reusing its items"""
+        self.render_job = None
+        self.offset = max(0, min(self.offset, self.total - self.visible))
+        rows = self.read_window() if self.total else []
+        self.rows = rows
+        self.rows_offset = self.offset
+
+        items = self.tree.get_children()
+        for i, row in enumerate(rows):
+            text = str(self.first_number + self.offset + i)
+            if i < len(items):
+                self.tree.item(items[i], text=text, values=row)
+            else:
+                self.tree.insert('', 'end', text=text, values=row)
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows):])
+
+        # Selection follows the contact, not the screen position
+        selected = [item for item, row in zip(self.tree.get_children(), rows) if row[0] == self.selected_name]
+        self.tree.selection_set(selected)
+
+        self.update_scrollbar()
+
+    def keyed(self):
+        return bool(self.rows) and hasattr(self.source, 'page_after')
+
+    def read_window(self):
+        """The rows at self.offset, by key from the rows in view when the window moved by up to a page"""
+        if self.keyed():
+            start = self.rows_offset
+            if start < self.offset <= start + len(self.rows):
+                return self.source.page_after(self.rows[self.offset - start - 1][0], self.visible)
+            if start - self.visible <= self.offset <= start:
+                # Walk back to the row above the new window, then read forward from it
+                above = self.source.page_before(self.rows[0][0], start - self.offset + 1)
+                anchor = above[0][0] if len(above) > start - self.offset else None
+                return self.source.page_after(anchor, self.visible)
+        if hasattr(self.source, 'page_before') and self.offset >= self.total - self.visible:
+            return self.source.page_before(None, self.total - self.offset)
+        return self.source.page(self.offset, self.visible)  # A jump with the scrollbar
+
+    def update_scrollbar(self):
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, (self.offset + len(self.tree.get_children())) / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def renumber(self):
+        """Row numbers are positions, so they are worked out again for the rows in view"""
+        for i, item in enumerate(self.tree.get_children()):
+            self.tree.item(item, text=str(self.first_number + self.offset + i))
+        self.update_scrollbar()
+
+    # Single-row changes. The source has already changed; position is where the
+    # row is (or was) in it. Each touches at most one Treeview row plus the
+    # row numbers in view, whatever the size of the book.
+
+    def insert_row(self, position, row):
+        self.total += 1
+        index = position - self.rows_offset
+        if index < 0:
+            self.offset += 1  # Keep the same contacts in view
+            self.rows_offset += 1
+        elif index < self.visible:
+            self.tree.insert('', index, values=row)
+            self.rows.insert(index, row)
+            items = self.tree.get_children()
+            if len(items) > self.visible:
+                self.tree.delete(items[-1])
+                del self.rows[self.visible:]
+        self.renumber()
+
+    def update_row(self, position, row):
+        items = self.tree.get_children()
+        index = position - self.rows_offset
+        if 0 <= index < len(items):
+            self.tree.item(items[index], values=row)
+            self.rows[index] = row
+
+    def delete_row(self, position):
+        self.total -= 1
+        items = self.tree.get_children()
+        index = position - self.rows_offset
+        if index < 0:
+            self.offset -= 1
+            self.rows_offset -= 1
+        elif index < len(items):
+            self.tree.delete(items[index])
+            del self.rows[index]
+            # Pull in one row to keep the window full: from below, or from above at the end of the book
+            end = self.rows_offset + len(self.rows)
+            if end < self.total:
+                below = self.source.page_after(self.rows[-1][0], 1) if self.keyed() else self.source.page(end, 1)
+                for row in below:
+                    self.tree.insert('', 'end', text='', values=row)
+                    self.rows.append(row)
+            elif self.rows_offset > 0:
+                self.offset -= 1
+                self.rows_offset -= 1
+                above = self.source.page_before(self.rows[0][0], 1) if self.keyed() else self.source.page(self.rows_offset, 1)
+                for row in above:
+                    self.tree.insert('', 0, text='', values=row)
+                    self.rows.insert(0, row)
+        self.renumber()
+
+    def schedule_render(self):
+        """Coalesce a burst of scroll events into one redraw"""
+        if self.render_job is None:
+            self.render_job = self.tree.after_idle(self.render)
+
+    def scroll_by(self, rows):
+        self.offset += rows
+        self.schedule_render()
+        return "break"
+
+    def on_scroll(self, *args):
+        """Scrollbar command: map the thumb position to a row offset"""
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * self.total)
+        elif args[2] == 'pages':
+            self.offset += int(args[1]) * max(1, self.visible - 1)
+        else:
+            self.offset += int(args[1])
+        self.schedule_render()
+
+    def on_resize(self, event):
+        # Leave room for the heading row
+        visible = max(1, (event.height - self.row_height - 4) // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self.schedule_render()
+
+    def on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            self.selected_name = self.tree.item(selection[0], 'values')[0]
+
+    def move_selection(self, step):
+        """Keyboard navigation that scrolls the window when it reaches an edge"""
+        if not self.total:
+            return "break"
+        items = self.tree.get_children()
+        selection = self.tree.selection()
+        if selection and selection[0] in items:
+            target = self.offset + items.index(selection[0]) + step
+        else:
+            target = self.offset
+        target = max(0, min(self.total - 1, target))
+
+        if target < self.offset:
+            self.offset = target
+        elif target >= self.offset + self.visible:
+            self.offset = target - self.visible + 1
+        self.render()
+
+        items = self.tree.get_children()
+        if target - self.offset < len(items):
+            item = items[target - self.offset]
+            self.tree.selection_set(item)
+            self.tree.focus(item)
+        return "break"
+
+
+class NameListSource:
+    """Virtual list source over a list of names in display order, reading details from the store.
+
+    Used for pages of search results; the whole book is paged from a ContactTable.
+    """
+
+    def __init__(self, names, store):
+        self.names = names
+        self.store = store
+
+    def count(self):
+        return len(self.names)
+
+    def page(self, offset, limit):
+        names = self.names[offset:offset + limit]
+        details = self.store.get_many(names)
+        return [(name,) + details[name] for name in names if name in details]
+
+
+class DuplicatesDialog:
+    """Window listing merge suggestions; merging one applies it through the app"""
+
+    def __init__(self, app, suggestions):
+        self.app = app
+        self.suggestions = {}
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Possible Duplicates")
+        self.window.geometry("760x400")
+        self.window.configure(bg=app.primary_bg)
+
+        tk.Label(self.window,text=f"{len(suggestions)} possible duplicates",bg=app.primary_bg,fg=app.text_color,font=app.label_font).pack(pady=(10, 5))
+
+        frame = tk.Frame(self.window, bg=app.primary_bg)
+        frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(frame,columns=('Keep', 'Merge', 'Score', 'Why'),show='headings',selectmode='extended',yscrollcommand=scrollbar.set)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.tree.yview)
+        for column, width in (('Keep', 180), ('Merge', 180), ('Score', 60), ('Why', 300)):
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=width)
+
+        # Suggestions come out of the pairwise-free pass, so this is a short list
+        for suggestion in suggestions:
+            item = self.tree.insert('', 'end', values=(suggestion.keep[0], suggestion.drop[0], f"{suggestion.score:.2f}", ", ".join(suggestion.reasons)))
+            self.suggestions[item] = suggestion
+
+        btn_frame = tk.Frame(self.window, bg=app.primary_bg)
+        btn_frame.pack(pady=10)
+        tk.Button(btn_frame,text="Merge Selected",command=self.merge_selected,bg=app.success_color,fg="white",font=app.button_font,padx=10,pady=5,bd=0).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame,text="Not Duplicates",command=self.dismiss_selected,bg="#6c757d",fg="white",font=app.button_font,padx=10,pady=5,bd=0).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame,text="Close",command=self.window.destroy,bg=app.danger_color,fg="white",font=app.button_font,padx=10,pady=5,bd=0).pack(side=tk.LEFT, padx=5)
+
+    def merge_selected(self):
+        merged = 0
+        for item in self.tree.selection():
+            suggestion = self.suggestions.pop(item)
+            self.tree.delete(item)
+            # A contact merged away by an earlier suggestion can't be merged again
+            if self.app.merge_duplicate(suggestion):
+                merged += 1
+        self.app.status_var.set(f"Merged {merged} duplicate contacts")
+
+    def dismiss_selected(self):
+        for item in self.tree.selection():
+            self.suggestions.pop(item)
+            self.tree.delete(item)
+
+
+class ConflictsDialog:
+    """Window listing contacts changed differently here and on another machine"""
+
+    def __init__(self, app):
+        self.app = app
+        self.conflicts = {}
+        self.window = tk.Toplevel(app.root)
+        self.window.title("Sync Conflicts")
+        self.window.geometry("760x360")
+        self.window.configure(bg=app.primary_bg)
+
+        tk.Label(self.window,text="These contacts were changed on both machines",bg=app.primary_bg,fg=app.text_color,font=app.label_font).pack(pady=(10, 5))
+
+        frame = tk.Frame(self.window, bg=app.primary_bg)
+        frame.pack(fill=tk.BOTH, expand=True, padx=10)
+        scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(frame,columns=('Name', 'Here', 'Other Machine'),show='headings',selectmode='extended',yscrollcommand=scrollbar.set)
+        self.tree.pack(fill=tk.BOTH, expand=True)
+        scrollbar.config(command=self.tree.yview)
+        for column, width in (('Name', 160), ('Here', 280), ('Other Machine', 280)):
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=width)
+
+        for peer, name, local, remote in list_conflicts(app.store):
+            item = self.tree.insert('', 'end', values=(name, self.describe(local), self.describe(remote)))
+            self.conflicts[item] = (peer, name)
+
+        btn_frame = tk.Frame(self.window, bg=app.primary_bg)
+        btn_frame.pack(pady=10)
+        tk.Button(btn_frame,text="Keep Mine",command=lambda: self.resolve(False),bg=app.accent_color,fg="white",font=app.button_font,padx=10,pady=5,bd=0).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame,text="Take Theirs",command=lambda: self.resolve(True),bg=app.success_color,fg="white",font=app.button_font,padx=10,pady=5,bd=0).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame,text="Close",command=self.window.destroy,bg=app.danger_color,fg="white",font=app.button_font,padx=10,pady=5,bd=0).pack(side=tk.LEFT, padx=5)
+
+    @staticmethod
+    def describe(row):
+        if row is None:
+            return "(deleted)"
+        return f"age {row[1]}, {row[2] or 'no email'}, {row[3] or 'no mobile'}"
+
+    def resolve(self, take_remote):
+        for item in self.tree.selection():
+            peer, name = self.conflicts.pop(item)
+            self.tree.delete(item)
+            old, new = resolve_conflict(self.app.store, peer, name, take_remote)
+            if take_remote and old != new:
+                op = 'add' if old is None else 'remove' if new is None else 'update'
+                self.app.apply_change(op, name, new, old)
+        self.app.status_var.set("Sync conflicts resolved" if not self.conflicts else f"{len(self.conflicts)} sync conflicts left")
 
 
 class ContactBookApp:
@@ -8,7 +365,39 @@ class ContactBookApp:
         self.root = root
         self.root.title("Contact Book Pro")
         self.root.geometry("800x600")
-        self.contacts = {}
+
+        # Contacts live in SQLite; only the rows being shown are read into Python
+        self.store = ContactStore()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Name search index and mobile/email lookup, built off the Tk thread; edits made meanwhile are replayed onto them
+        self.search_index = None
+        self.lookup = None
+        self.pending_index_ops = []
+        self.book_source = None  # Whole book in display order, as a ContactTable kept beside the index
+        self.index_generation = 0  # Bumped by every rebuild so a superseded build is ignored
+
+        # Live search: keystrokes are debounced, then the newest query goes to a worker
+        # thread. Bumping search_generation cancels whatever query is in flight, and
+        # index_lock keeps the worker from reading the index while it is being edited.
+        self.search_debounce_ms = 30
+        self.search_generation = 0
+        self.search_job = None
+        self.search_poll_job = None
+        self.search_pending = False
+        self.live_query = ""
+        self.live_results = []
+        self.live_results_generation = None
+        self.last_keystroke = 0.0
+        self.search_started = 0.0
+        self.search_latencies = deque(maxlen=200)  # Keystroke to first results, ms
+        self.index_lock = threading.Lock()
+        self.search_requests = queue.Queue()
+        self.search_results = queue.Queue()
+        threading.Thread(target=self.search_worker, daemon=True).start()
+
+        # Cancel event of the running import or export
+        self.transfer = None
 
         # Modern color palette
         self.primary_bg = "#f0f2f5"  # Light background
@@ -48,6 +437,8 @@ class ContactBookApp:
         self.create_contact_tab()
         self.view_contacts_tab()
 
+        self.start_index_build()
+
     def create_contact_tab(self):
         """Tab for creating/updating contacts"""
         tab = tk.Frame(self.notebook, bg=self.primary_bg)
@@ -93,6 +484,9 @@ class ContactBookApp:
         # Search button
         tk.Button(btn_frame,text="Search Contact",command=self.search_contact,bg="#6c757d",fg="white",font=self.button_font,padx=10,pady=5,bd=0).pack(side=tk.LEFT, padx=5)
 
+        # Reverse lookup button
+        tk.Button(btn_frame,text="Who Is This?",command=self.lookup_contact,bg="#6c757d",fg="white",font=self.button_font,padx=10,pady=5,bd=0).pack(side=tk.LEFT, padx=5)
+
         # Configure column weights
         form_frame.columnconfigure(1, weight=1)
 
@@ -101,10 +495,24 @@ class ContactBookApp:
         tab = tk.Frame(self.notebook, bg=self.primary_bg)
         self.notebook.add(tab, text="View Contacts")
 
+        # Live search box
+        search_frame = tk.Frame(tab, bg=self.primary_bg)
+        search_frame.pack(fill=tk.X, padx=10, pady=(10, 0))
+        tk.Label(search_frame,text="🔎 Search:",bg=self.primary_bg,fg=self.text_color,font=self.label_font).pack(side=tk.LEFT)
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add('write', self.on_search_typed)
+        self.search_entry = tk.Entry(search_frame, textvariable=self.search_var, font=self.label_font)
+        self.search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.search_entry.bind("<Escape>", lambda e: self.search_var.set(""))
+
         # Treeview frame
         tree_frame = tk.Frame(tab, bg=self.primary_bg)
         tree_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
+        # Scrollbar, driven by the virtual list rather than the Treeview
+        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
         # Treeview widget
         self.tree = ttk.Treeview(tree_frame,columns=('Name', 'Age', 'Email', 'Mobile'),selectmode='browse')
         self.tree.pack(fill=tk.BOTH, expand=True)
@@ -122,10 +530,8 @@ class ContactBookApp:
         self.tree.column('Email', width=200)
         self.tree.column('Mobile', width=100)
 
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Only the rows in view exist in the Treeview
+        self.contact_list = VirtualContactList(self.tree, scrollbar, self.store)
 
         # Count label
         self.count_label = tk.Label(tab,text="Total Contacts: 0",  bg=self.primary_bg,fg=self.text_color,font=self.label_font)
@@ -135,6 +541,26 @@ class ContactBookApp:
         self.refresh_btn = tk.Button(tab,text="🔄 Refresh List",command=self.refresh_contacts,bg=self.accent_color,fg="white",font=self.button_font,padx=10,pady=5,bd=0,activebackground="#3a56b0",activeforeground="white")
         self.refresh_btn.pack(pady=10)
 
+        # Import / export
+        transfer_frame = tk.Frame(tab, bg=self.primary_bg)
+        transfer_frame.pack(pady=(0, 10))
+        self.import_btn = tk.Button(transfer_frame,text="📥 Import...",command=self.import_file,bg="#6c757d",fg="white",font=self.button_font,padx=10,pady=3,bd=0)
+        self.import_btn.pack(side=tk.LEFT, padx=5)
+        self.export_btn = tk.Button(transfer_frame,text="📤 Export...",command=self.export_file,bg="#6c757d",fg="white",font=self.button_font,padx=10,pady=3,bd=0)
+        self.export_btn.pack(side=tk.LEFT, padx=5)
+        self.dedupe_btn = tk.Button(transfer_frame,text="👥 Find Duplicates",command=self.show_duplicates,bg="#6c757d",fg="white",font=self.button_font,padx=10,pady=3,bd=0)
+        self.dedupe_btn.pack(side=tk.LEFT, padx=5)
+        self.sync_btn = tk.Button(transfer_frame,text="🔁 Sync...",command=self.sync_contacts,bg="#6c757d",fg="white",font=self.button_font,padx=10,pady=3,bd=0)
+        self.sync_btn.pack(side=tk.LEFT, padx=5)
+
+        # Progress of a running import or export, only shown while one runs
+        self.progress_frame = tk.Frame(tab, bg=self.primary_bg)
+        self.progress_bar = ttk.Progressbar(self.progress_frame, length=300, mode='determinate', maximum=100)
+        self.progress_bar.pack(side=tk.LEFT, padx=5)
+        self.progress_label = tk.Label(self.progress_frame,text="",bg=self.primary_bg,fg=self.text_color)
+        self.progress_label.pack(side=tk.LEFT, padx=5)
+        tk.Button(self.progress_frame,text="Cancel",command=self.cancel_transfer,bg=self.danger_color,fg="white",font=self.button_font,padx=8,pady=2,bd=0).pack(side=tk.LEFT, padx=5)
+
         # Bind double-click event to treeview
         self.tree.bind("<Double-1>", self.on_tree_double_click)
 
@@ -164,7 +590,7 @@ class ContactBookApp:
             messagebox.showwarning("Input Error", "Please enter a name", parent=self.root)
             return
 
-        if name in self.contacts:
+        if self.store.exists(name):
             messagebox.showwarning("Error", f"Contact '{name}' already exists", parent=self.root)
             return
 
@@ -172,16 +598,22 @@ class ContactBookApp:
             messagebox.showwarning("Input Error", "Age must be a number", parent=self.root)
             return
 
-        self.contacts[name] = {
-            'age': int(age),
-            'email': email,
-            'mobile': mobile
-        }
+        # Surface contacts that already have this number or email
+        same_mobile, same_email = self.find_by_details(email, mobile)
+        warnings = []
+        if same_mobile:
+            warnings.append(f"Mobile {mobile} is already saved for: {', '.join(same_mobile[:5])}")
+        if same_email:
+            warnings.append(f"Email {email} is already saved for: {', '.join(same_email[:5])}")
+        if warnings and not messagebox.askyesno("Possible Duplicate", "\n".join(warnings) + f"\n\nCreate '{name}' anyway?", parent=self.root):
+            return
+
+        self.store.create(name, int(age), email, mobile)
+        self.apply_change('add', name, (name, int(age), email, mobile))
 
         messagebox.showinfo("Success", f"Contact '{name}' created successfully", parent=self.root)
         self.status_var.set(f"Contact '{name}' created successfully")
         self.clear_form()
-        self.refresh_contacts()
 
     def update_contact(self):
         """Update an existing contact"""
@@ -194,7 +626,7 @@ class ContactBookApp:
             messagebox.showwarning("Input Error", "Please enter a name", parent=self.root)
             return
 
-        if name not in self.contacts:
+        if not self.store.exists(name):
             messagebox.showwarning("Error", f"Contact '{name}' not found", parent=self.root)
             return
 
@@ -202,15 +634,12 @@ class ContactBookApp:
             messagebox.showwarning("Input Error", "Age must be a number", parent=self.root)
             return
 
-        self.contacts[name] = {
-            'age': int(age),
-            'email': email,
-            'mobile': mobile
-        }
+        old = self.store.get(name).as_row()
+        self.store.update(name, int(age), email, mobile)
+        self.apply_change('update', name, (name, int(age), email, mobile), old)
 
         messagebox.showinfo("Success", f"Contact '{name}' updated successfully", parent=self.root)
         self.status_var.set(f"Contact '{name}' updated successfully")
-        self.refresh_contacts()
 
     def delete_contact(self):
         """Delete a contact"""
@@ -220,18 +649,19 @@ class ContactBookApp:
             messagebox.showwarning("Input Error", "Please enter a name", parent=self.root)
             return
 
-        if name not in self.contacts:
+        if not self.store.exists(name):
             messagebox.showwarning("Error", f"Contact '{name}' not found", parent=self.root)
             return
 
         if not messagebox.askyesno("Confirm", f"Are you sure you want to delete '{name}'?", parent=self.root):
             return
 
-        del self.contacts[name]
+        old = self.store.get(name).as_row()
+        self.store.delete(name)
+        self.apply_change('remove', name, old=old)
         messagebox.showinfo("Success", f"Contact '{name}' deleted successfully", parent=self.root)
         self.status_var.set(f"Contact '{name}' deleted successfully")
         self.clear_form()
-        self.refresh_contacts()
 
     def search_contact(self):
         """Search for a contact"""
@@ -241,23 +671,510 @@ class ContactBookApp:
             messagebox.showwarning("Input Error", "Please enter a search term", parent=self.root)
             return
 
-        found = False
-        for name, contact in self.contacts.items():
-            if search_term.lower() in name.lower():
-                self.display_contact(name, contact)
-                found = True
+        names, has_more = self.find_contacts(search_term, 0, 2)
 
-        if not found:
+        if not names:
             messagebox.showinfo("Search", "No contacts found with that name", parent=self.root)
             self.status_var.set("No contacts found with that name")
+        elif len(names) == 1:
+            # Single match goes straight into the form
+            self.display_contact(self.store.get(names[0]))
+            self.status_var.set(f"Found contact '{names[0]}'")
+        else:
+            # Several matches: list them all through the live search box
+            self.search_var.set(search_term)
+            self.notebook.select(1)  # Switch to View Contacts tab
+
+    def find_by_details(self, email, mobile):
+        """Return (names with this mobile, names with this email), matching normalized forms once the lookup is built"""
+        if self.lookup is not None:
+            return (self.lookup.find_mobile(mobile) if mobile else [],
+                    self.lookup.find_email(email) if email else [])
+
+        # Lookup still building, fall back to exact matches in SQL
+        return (self.store.names_with(mobile=mobile) if mobile else [],
+                self.store.names_with(email=email) if email else [])
+
+    def lookup_contact(self):
+        """Find whose mobile number (or, if that is empty, email) is in the form"""
+        mobile = self.mobile_entry.get().strip()
+        email = self.email_entry.get().strip()
+        if not mobile and not email:
+            messagebox.showwarning("Input Error", "Please enter a mobile number or email to look up", parent=self.root)
+            return
+
+        same_mobile, same_email = self.find_by_details("" if mobile else email, mobile)
+        names = same_mobile or same_email
+        what = mobile or email
+        if not names:
+            messagebox.showinfo("Lookup", f"No contact has {what}", parent=self.root)
+            self.status_var.set(f"No contact has {what}")
+            return
+
+        self.display_contact(self.store.get(names[0]))
+        if len(names) == 1:
+            self.status_var.set(f"{what} belongs to '{names[0]}'")
+        else:
+            self.status_var.set(f"{what} is shared by {len(names)} contacts")
+            messagebox.showinfo("Lookup", f"{what} is saved for:\n" + "\n".join(names[:20]), parent=self.root)
+
+    def find_contacts(self, term, offset, limit):
+        """Return (names, has_more) for one page of ranked matches"""
+        if self.search_index is not None:
+            return self.search_index.search(term, offset, limit)
+
+        # Index still building, fall back to SQL
+        rows = self.store.search_like(term, offset, limit + 1)
+        return [row[0] for row in rows[:limit]], len(rows) > limit
+
+    def on_search_typed(self, *args):
+        """Restart the debounce timer on every change to the search box"""
+        self.last_keystroke = time.perf_counter()
+        if self.search_job:
+            self.root.after_cancel(self.search_job)
+        self.search_job = self.root.after(self.search_debounce_ms, self.run_live_search)
+
+    def run_live_search(self):
+        """Send the search box's query to the worker, cancelling the one in flight"""
+        self.search_job = None
+        term = self.search_var.get().strip()
+        self.search_generation += 1
+        if not term:
+            if self.live_query:
+                self.refresh_contacts()
+            return
+
+        self.live_query = term
+        self.search_started = self.last_keystroke
+        self.search_pending = True
+        self.search_requests.put((self.search_generation, term))
+        if self.search_poll_job is None:
+            self.search_poll_job = self.root.after(5, self.poll_search)
+
+    def search_worker(self):
+        """Runs on a worker thread: answers the newest query in batches until it is superseded"""
+        store = None  # Own connection for the SQL fallback, opened on first use
+        while True:
+            request = self.search_requests.get()
+            while not self.search_requests.empty():  # Skip queries typed over already
+                request = self.search_requests.get_nowait()
+            if request is None:
+                break
+            generation, term = request
+
+            try:
+                if self.search_index is not None:
+                    self.stream_index_matches(generation, term)
+                else:
+                    if store is None:
+                        store = ContactStore(self.store.path)
+                    self.stream_sql_matches(store, generation, term)
+            except Exception as e:
+                print(f"Error searching for '{term}': {e}")
+                self.search_results.put((generation, [], True))
+
+        if store is not None:
+            store.close()
+
+    def stream_index_matches(self, generation, term):
+        matches = None
+        size = 50  # First batch fills the view; later ones are bigger
+        while True:
+            with self.index_lock:
+                # Edits bump the generation under the lock, so a live generator is still valid here
+                if generation != self.search_generation:
+                    return
+                if matches is None:
+                    matches = self.search_index.iter_matches(term)
+                batch = list(islice(matches, size))
+            done = len(batch) < size
+            self.search_results.put((generation, batch, done))
+            if done:
+                return
+            size = 2000
+
+    def stream_sql_matches(self, store, generation, term):
+        offset = 0
+        size = 50
+        while generation == self.search_generation:
+            batch = [row[0] for row in store.search_like(term, offset, size)]
+            done = len(batch) < size
+            self.search_results.put((generation, batch, done))
+            if done:
+                return
+            offset += size
+            size = 2000
+
+    def poll_search(self):
+        """Move result batches of the current query into the list"""
+        self.search_poll_job = None
+        try:
+            while True:
+                generation, names, done = self.search_results.get_nowait()
+                if generation == self.search_generation:
+                    self.show_live_results(names, done)
+        except queue.Empty:
+            pass
+        if self.search_pending:
+            self.search_poll_job = self.root.after(10, self.poll_search)
+
+    def show_live_results(self, names, done):
+        if self.live_results_generation != self.search_generation:
+            # First batch of a new query replaces the list
+            self.live_results = list(names)
+            self.live_results_generation = self.search_generation
+            self.contact_list.set_source(NameListSource(self.live_results, self.store))
+            self.search_latencies.append((time.perf_counter() - self.search_started) * 1000)
+        else:
+            self.live_results.extend(names)
+            self.contact_list.grow()
+        if done:
+            self.search_pending = False
+
+        count = len(self.live_results)
+        more = "" if done else "+"
+        self.count_label.config(text=f"Search results for '{self.live_query}': {count}{more}")
+        latencies = sorted(self.search_latencies)
+        self.status_var.set(f"{count}{more} matches for '{self.live_query}' · first results in {self.search_latencies[-1]:.0f} ms "
+                            f"(median {latencies[len(latencies) // 2]:.0f} ms, p95 {latencies[int(len(latencies) * 0.95)]:.0f} ms)")
+
+    def start_index_build(self):
+        self.index_generation += 1
+        result = []
+        thread = threading.Thread(target=self.build_indexes, args=(result,), daemon=True)
+        thread.start()
+        self.root.after(100, self.check_index_build, thread, result, self.index_generation)
+
+    def rebuild_indexes(self):
+        """Throw the index away and build it again, e.g. after a bulk import"""
+        self.search_index = None
+        self.lookup = None
+        self.book_source = None
+        self.pending_index_ops = []
+        self.start_index_build()
+
+    def build_indexes(self, result):
+        """Runs on a worker thread with its own database connection"""
+        store = ContactStore(self.store.path)
+        try:
+            # One pass in display order feeds all three, so they share each name string
+            names = []
+            lookup = ReverseLookup()
+
+            def rows():
+                for row in store.iter_rows(ordered=True):
+                    names.append(row[0])
+                    lookup.add(row)
+                    yield row
+
+            table = ContactTable.from_rows(rows())
+            index = SearchIndex()
+            index.build(names)
+            result.append((index, lookup, table))
+        except Exception as e:
+            print(f"Error building search index: {e}")
+        finally:
+            store.close()
 
-    def display_contact(self, name, contact):
-        """Display contact details in the form"""
+    def check_index_build(self, thread, result, generation):
+        if thread.is_alive():
+            self.root.after(100, self.check_index_build, thread, result, generation)
+            return
+        if generation != self.index_generation:
+            return  # Superseded by a later rebuild
+        if not result:
+            return  # Build failed; searches keep using SQL
+
+        # Replay edits made while the index was building
+        index, lookup, table = result[0]
+        for change in self.pending_index_ops:
+            self.update_indexes(index, lookup, table, *change)
+        self.pending_index_ops = []
+        self.search_index = index
+        self.lookup = lookup
+
+        # Page the list from the resident table from now on; mutations then patch it in place
+        self.book_source = table
+        if not self.live_query:
+            self.contact_list.set_source(self.book_source, keep_offset=True)
+
+    def index_contact(self, op, name, row=None, old=None):
+        """Keep the indexes in step with a create ('add'), edit ('update') or delete ('remove').
+
+        row is the contact's new (name, age, email, mobile), old what it was before.
+        """
+        if self.search_index is None:
+            self.pending_index_ops.append((op, name, row, old))
+            return
+        with self.index_lock:
+            self.search_generation += 1  # Invalidates a search iterating the index
+            self.update_indexes(self.search_index, self.lookup, self.book_source, op, name, row, old)
+
+    @staticmethod
+    def update_indexes(index, lookup, table, op, name, row, old):
+        if op == 'add':
+            index.add(name)
+            lookup.add(row)
+            table.add(*row)
+        elif op == 'remove':
+            index.remove(name)
+            lookup.remove(old)
+            table.remove(name)
+        else:
+            lookup.remove(old)
+            lookup.add(row)
+            table.update(*row)
+
+    def apply_change(self, op, name, row=None, old=None):
+        """Apply a create ('add'), edit ('update') or delete ('remove') to the indexes and the list.
+
+        Once the list pages from the index's sorted names, the change touches a
+        single row at the contact's position instead of redrawing the list.
+        """
+        in_place = not self.live_query and self.book_source is not None and self.contact_list.source is self.book_source
+        old_position = self.search_index.position(name) if in_place and op == 'remove' else None
+        self.index_contact(op, name, row, old)
+
+        if self.live_query:
+            # Run the search again so the results reflect the change
+            self.last_keystroke = time.perf_counter()
+            self.run_live_search()
+            return
+        if not in_place:
+            self.refresh_contacts()
+            return
+
+        if op == 'add':
+            self.contact_list.insert_row(self.search_index.position(name), row)
+        elif op == 'update':
+            self.contact_list.update_row(self.search_index.position(name), row)
+        elif old_position is not None:
+            self.contact_list.delete_row(old_position)
+        self.count_label.config(text=f"Total Contacts: {self.contact_list.total}")
+
+    def apply_synced_changes(self, changes):
+        """Patch the indexes and list with the rows a sync changed, instead of rebuilding them"""
+        in_place = not self.live_query and self.book_source is not None and self.contact_list.source is self.book_source
+        if in_place:
+            for change in changes:
+                self.apply_change(*change)
+            return
+        for change in changes:
+            self.index_contact(*change)
+        if not changes:
+            return
+        if self.live_query:
+            self.last_keystroke = time.perf_counter()
+            self.run_live_search()
+        else:
+            self.refresh_contacts()
+
+    def import_file(self):
+        path = filedialog.askopenfilename(parent=self.root,title="Import Contacts",filetypes=[("vCard", "*.vcf *.vcard"), ("CSV", "*.csv"), ("All files", "*.*")])
+        if path:
+            self.start_transfer('import', path)
+
+    def export_file(self):
+        path = filedialog.asksaveasfilename(parent=self.root,title="Export Contacts",defaultextension=".vcf",filetypes=[("vCard", "*.vcf"), ("CSV", "*.csv")])
+        if path:
+            self.start_transfer('export', path)
+
+    def sync_contacts(self):
+        """Merge a changes file from another machine, then write this book's changes for it"""
+        incoming = filedialog.askopenfilename(parent=self.root,title="Changes From Another Machine (Cancel to skip)",filetypes=[("Contact changes", "*.jsonl"), ("All files", "*.*")])
+        outgoing = filedialog.asksaveasfilename(parent=self.root,title="Save Changes For The Other Machine (Cancel to skip)",defaultextension=".jsonl",filetypes=[("Contact changes", "*.jsonl")])
+        peer = None
+        if outgoing and not incoming:
+            # Without an incoming file the receiver is unknown; ask, so only its missing changes are sent
+            peer = self.choose_peer()
+            if peer is False:
+                return
+        if incoming or outgoing:
+            self.start_transfer('sync', (incoming, outgoing, peer))
+
+    def choose_peer(self):
+        """Ask which machine the changes are for: a peer id, None for a new one (every contact), or False if cancelled"""
+        peers = known_peers(self.store)
+        if not peers:
+            return None
+
+        choice = [False]
+        window = tk.Toplevel(self.root)
+        window.title("Send Changes To")
+        window.configure(bg=self.primary_bg)
+        window.transient(self.root)
+        tk.Label(window,text="Which contact book are these changes for?",bg=self.primary_bg,fg=self.text_color,font=self.label_font).pack(padx=10, pady=(10, 5))
+        listbox = tk.Listbox(window, height=min(len(peers) + 1, 10), width=50)
+        listbox.pack(padx=10)
+        for peer in peers:
+            listbox.insert(tk.END, f"Book {peer[:8]} (sent up to change {peer_state(self.store, peer)[0]})")
+        listbox.insert(tk.END, "A new book (send every contact)")
+        listbox.selection_set(0)
+
+        def choose():
+            selection = listbox.curselection()
+            if selection:
+                choice[0] = peers[selection[0]] if selection[0] < len(peers) else None
+            window.destroy()
+
+        btn_frame = tk.Frame(window, bg=self.primary_bg)
+        btn_frame.pack(pady=10)
+        tk.Button(btn_frame,text="Send",command=choose,bg=self.success_color,fg="white",font=self.button_font,padx=10,pady=5,bd=0).pack(side=tk.LEFT, padx=5)
+        tk.Button(btn_frame,text="Cancel",command=window.destroy,bg=self.danger_color,fg="white",font=self.button_font,padx=10,pady=5,bd=0).pack(side=tk.LEFT, padx=5)
+        window.grab_set()
+        self.root.wait_window(window)
+        return choice[0]
+
+    def start_transfer(self, action, path):
+        """Run an import or export on a worker thread, reporting progress through a queue"""
+        if self.transfer is not None:
+            messagebox.showwarning("Busy", "An import or export is already running", parent=self.root)
+            return
+
+        self.transfer = threading.Event()
+        updates = queue.Queue()
+        threading.Thread(target=self.run_transfer, args=(action, path, self.transfer, updates), daemon=True).start()
+
+        self.import_btn.config(state=tk.DISABLED)
+        self.export_btn.config(state=tk.DISABLED)
+        self.sync_btn.config(state=tk.DISABLED)
+        self.progress_bar['value'] = 0
+        self.progress_label.config(text={'import': "Importing...", 'export': "Exporting...", 'sync': "Syncing..."}[action])
+        self.progress_frame.pack(pady=(0, 10))
+        self.root.after(100, self.poll_transfer, action, updates)
+
+    def run_transfer(self, action, path, cancel, updates):
+        """Runs on a worker thread with its own database connection"""
+        store = ContactStore(self.store.path)
+        try:
+            if action == 'import':
+                def progress(done, total, result):
+                    updates.put(('progress', done * 100 / total if total else 100, f"Imported {result.imported}"))
+                result = import_contacts(path, store, progress, cancel)
+                updates.put(('done', result.summary(), result.errors))
+            elif action == 'sync':
+                incoming, outgoing, peer = path
+                lines = []
+                changes = []
+                if incoming:
+                    result = apply_changes(store, incoming, cancel)
+                    peer = result.peer
+                    changes = result.changes
+                    lines.append(result.summary())
+                if outgoing and not cancel.is_set():
+                    # Only what changed since the last file for this peer; everything if the peer is new
+                    lines.append(f"Wrote {export_changes(store, outgoing, peer)} changes to {outgoing}")
+                updates.put(('done', "\n".join(lines) or "Sync cancelled", [], changes))
+            else:
+                def progress(done, total):
+                    updates.put(('progress', done * 100 / total if total else 100, f"Exported {done} of {total}"))
+                count = export_contacts(store, path, progress=progress, cancel=cancel)
+                summary = "Export cancelled" if count is None else f"Exported {count} contacts to {path}"
+                updates.put(('done', summary, []))
+        except Exception as e:
+            updates.put(('error', str(e), []))
+        finally:
+            store.close()
+
+    def poll_transfer(self, action, updates):
+        """Apply the latest progress; on completion restore the buttons and show the outcome"""
+        message = None
+        try:
+            while True:
+                message = updates.get_nowait()
+                if message[0] != 'progress':
+                    break
+        except queue.Empty:
+            pass
+
+        if message is None or message[0] == 'progress':
+            if message:
+                self.progress_bar['value'] = message[1]
+                self.progress_label.config(text=message[2])
+            self.root.after(100, self.poll_transfer, action, updates)
+            return
+
+        kind, summary, errors = message[:3]
+        changes = message[3] if len(message) > 3 else None
+        self.transfer = None
+        self.progress_frame.pack_forget()
+        self.import_btn.config(state=tk.NORMAL)
+        self.export_btn.config(state=tk.NORMAL)
+        self.sync_btn.config(state=tk.NORMAL)
+
+        if action == 'sync' and changes is not None:
+            self.apply_synced_changes(changes)
+        elif action in ('import', 'sync'):
+            # Bulk loads, failed syncs and syncs too big to replay: start the indexes over
+            self.rebuild_indexes()
+            self.refresh_contacts()
+
+        if kind == 'error':
+            self.status_var.set(f"{action.title()} failed: {summary}")
+            messagebox.showerror("Error", f"{action.title()} failed: {summary}", parent=self.root)
+            return
+        self.status_var.set(summary.replace("\n", "; "))
+        details = "\n".join(errors[:10])
+        messagebox.showinfo(action.title(), summary + ("\n\n" + details if details else ""), parent=self.root)
+        if action == 'sync' and list_conflicts(self.store):
+            ConflictsDialog(self)
+
+    def show_duplicates(self):
+        """Look for duplicates on a worker thread; suggestions open in a window when ready"""
+        self.dedupe_btn.config(state=tk.DISABLED)
+        self.status_var.set("Looking for duplicate contacts...")
+        result = []
+        thread = threading.Thread(target=self.run_dedupe, args=(result,), daemon=True)
+        thread.start()
+        self.root.after(100, self.check_dedupe, thread, result)
+
+    def run_dedupe(self, result):
+        """Runs on a worker thread with its own database connection"""
+        store = ContactStore(self.store.path)
+        try:
+            result.append(find_duplicates(store.iter_rows()))
+        except Exception as e:
+            result.append(e)
+        finally:
+            store.close()
+
+    def check_dedupe(self, thread, result):
+        if thread.is_alive():
+            self.root.after(100, self.check_dedupe, thread, result)
+            return
+        self.dedupe_btn.config(state=tk.NORMAL)
+        if not result or isinstance(result[0], Exception):
+            self.status_var.set(f"Duplicate search failed: {result[0] if result else 'no result'}")
+            return
+        suggestions = result[0]
+        self.status_var.set(f"Found {len(suggestions)} possible duplicates")
+        if suggestions:
+            DuplicatesDialog(self, suggestions)
+        else:
+            messagebox.showinfo("Duplicates", "No duplicate contacts found", parent=self.root)
+
+    def merge_duplicate(self, suggestion):
+        """Merge one suggestion; False if either contact no longer exists"""
+        merged = merge_contacts(self.store, suggestion)
+        if merged is None:
+            return False
+        row, keep, drop = merged
+        self.apply_change('remove', drop[0], old=drop)
+        self.apply_change('update', row[0], row, keep)
+        return True
+
+    def cancel_transfer(self):
+        if self.transfer is not None:
+            self.transfer.set()
+            self.progress_label.config(text="Cancelling...")
+
+    def display_contact(self, contact):
+        """Display a ContactRecord in the form"""
         self.clear_form()
-        self.name_entry.insert(0, name)
-        self.age_entry.insert(0, contact['age'])
-        self.email_entry.insert(0, contact['email'])
-        self.mobile_entry.insert(0, contact['mobile'])
+        self.name_entry.insert(0, contact.name)
+        self.age_entry.insert(0, contact.age)
+        self.email_entry.insert(0, contact.email)
+        self.mobile_entry.insert(0, contact.mobile)
 
     def clear_form(self):
         """Clear all form fields"""
@@ -267,44 +1184,39 @@ class ContactBookApp:
         self.mobile_entry.delete(0, tk.END)
 
     def refresh_contacts(self):
-        """Refresh the contacts list with enhanced features"""
+        """Refresh the contacts list; only the rows in view are read back from the store"""
         # Animate the refresh button
         self.refresh_btn.config(text="⏳ Refreshing...")
-        self.root.update()
+
+        # Leave search results
+        if self.live_query:
+            self.live_query = ""
+            self.search_generation += 1
+            self.search_pending = False
+            self.search_var.set("")
 
         try:
-            # Clear current items
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-
-            # Add contacts to treeview with sorting
-            sorted_contacts = sorted(self.contacts.items(), key=lambda x: x[0].lower())
-
-            for i, (name, contact) in enumerate(sorted_contacts, 1):
-                self.tree.insert(
-                    '',
-                    'end',
-                    text=str(i),
-                    values=(
-                        name,
-                        contact['age'],
-                        contact['email'],
-                        contact['mobile']
-                    )
-                )
-
-            # Update count
-            self.count_label.config(text=f"Total Contacts: {len(self.contacts)}")
-            self.status_var.set(f"Displaying {len(self.contacts)} contacts")
+            # Keeps the scroll position when the list already shows the whole book
+            self.contact_list.set_source(self.book_source if self.book_source is not None else self.store)
 
-            # Restore refresh button after completion
-            self.refresh_btn.config(text="🔄 Refresh List")
+            total = self.contact_list.total
+            self.count_label.config(text=f"Total Contacts: {total}")
+            self.status_var.set(f"Displaying {total} contacts")
 
         except Exception as e:
             self.status_var.set(f"Error refreshing contacts: {str(e)}")
             messagebox.showerror("Error", f"Failed to refresh contacts: {str(e)}", parent=self.root)
+
+        finally:
+            # Restore refresh button after completion
             self.refresh_btn.config(text="🔄 Refresh List")
 
+    def on_close(self):
+        self.cancel_transfer()
+        self.search_requests.put(None)
+        self.store.close()
+        self.root.destroy()
+
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,208 @@
+import argparse
+import re
+import time
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+from contact_store import ContactStore
+
+MAX_BLOCK = 200  # Blocks larger than this are compared in a sliding window instead of all pairs
+WINDOW = 20  # Neighbours each contact is compared with inside an oversized block
+DEFAULT_THRESHOLD = 0.8
+
+_NOT_WORD = re.compile(r"[^\w\s]")
+_SOUNDEX_CODES = str.maketrans("bfpvcgjkqsxzdtlmnr", "111122222222334556")
+
+
+# Blocking keys: cheap, exact-match features shared by most true duplicates
+
+def normalize_name(name):
+    return " ".join(_NOT_WORD.sub(" ", name.casefold()).split())
+
+
+def phone_key(mobile):
+    """Last ten digits, so '+91 98765-43210' and '098765 43210' agree"""
+    digits = "".join(ch for ch in mobile if ch.isdigit())
+    return digits[-10:] if len(digits) >= 7 else ""
+
+
+def email_local(email):
+    """Case-folded local part without a +tag: 'J.Smith+crm@x.com' -> 'j.smith'"""
+    local, at, _ = email.strip().casefold().partition("@")
+    return local.partition("+")[0] if at else ""
+
+
+def soundex(word):
+    word = "".join(ch for ch in word.lower() if "a" <= ch <= "z")
+    if not word:
+        return ""
+    # Letters separated by h or w share a code, vowels split runs; neither is kept
+    coded = word.translate(_SOUNDEX_CODES)
+    digits = []
+    previous = coded[0]
+    for ch in coded[1:]:
+        if ch in "hw":
+            continue
+        if ch.isdigit() and ch != previous:
+            digits.append(ch)
+        previous = ch
+    return (word[0].upper() + "".join(digits) + "000")[:4]
+
+
+def phonetic_key(name):
+    """Soundex of the first and last word: 'Jon Smith' and 'John Smyth' both give J500 S530"""
+    words = normalize_name(name).split()
+    if not words:
+        return ""
+    return soundex(words[0]) + " " + soundex(words[-1])
+
+
+def blocking_keys(row):
+    name, age, email, mobile = row
+    keys = [("phone", phone_key(mobile)), ("email", email_local(email)), ("sound", phonetic_key(name))]
+    return [key for key in keys if key[1]]
+
+
+# Scoring: only run on pairs that share a block
+
+def word_similarity(a, b):
+    if len(a) == 1 or len(b) == 1:  # An initial matches any word starting with it
+        return 0.9 if a[0] == b[0] else 0.0
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def name_similarity(a, b):
+    """Similarity of the first and last names taken separately, so a shared
+    surname alone ('Ravi Kumar', 'Priya Kumar') doesn't look like a match"""
+    words_a, words_b = normalize_name(a).split(), normalize_name(b).split()
+    if len(words_a) < 2 or len(words_b) < 2:
+        return SequenceMatcher(None, " ".join(words_a), " ".join(words_b)).ratio()
+    return min(word_similarity(words_a[0], words_b[0]), word_similarity(words_a[-1], words_b[-1]))
+
+
+def score_pair(a, b):
+    """Return (score, reasons) for two rows; score is in [0, 1]"""
+    similarity = name_similarity(a[0], b[0])
+
+    reasons = [f"names {similarity:.0%} alike"]
+    evidence = 0.0
+    if phone_key(a[3]) and phone_key(a[3]) == phone_key(b[3]):
+        evidence = 1.0
+        reasons.append("same mobile")
+    if a[2] and a[2].strip().casefold() == b[2].strip().casefold():
+        evidence = 1.0
+        reasons.append("same email")
+    elif email_local(a[2]) and email_local(a[2]) == email_local(b[2]):
+        evidence = max(evidence, 0.5)
+        reasons.append("same email name")
+
+    score = 0.6 * similarity + 0.4 * evidence
+    if a[1] and b[1] and abs(a[1] - b[1]) > 2:
+        score -= 0.1
+        reasons.append("ages differ")
+    return max(0.0, score), reasons
+
+
+def completeness(row):
+    return (sum(1 for value in row[1:] if value), len(row[0]))
+
+
+class MergeSuggestion:
+    """Two contacts that look like the same person; keep is the more complete one"""
+
+    def __init__(self, keep, drop, score, reasons):
+        self.keep = keep
+        self.drop = drop
+        self.score = score
+        self.reasons = reasons
+
+    def merged_row(self):
+        return fill_blanks(self.keep, self.drop)
+
+
+def fill_blanks(keep, drop):
+    """keep's values, with empty fields filled in from drop"""
+    return (keep[0],) + tuple(k if k else d for k, d in zip(keep[1:], drop[1:]))
+
+
+def candidate_pairs(rows):
+    """Index pairs that share at least one blocking key, without comparing every pair"""
+    blocks = defaultdict(list)
+    for index, row in enumerate(rows):
+        for key in blocking_keys(row):
+            blocks[key].append(index)
+
+    pairs = set()
+    for members in blocks.values():
+        if len(members) < 2:
+            continue
+        if len(members) <= MAX_BLOCK:
+            for i, a in enumerate(members):
+                for b in members[i + 1:]:
+                    pairs.add((a, b) if a < b else (b, a))
+        else:
+            # Common keys (a popular surname's sound, a shared office number): sorted neighbourhood
+            members.sort(key=lambda index: normalize_name(rows[index][0]))
+            for i, a in enumerate(members):
+                for b in members[i + 1:i + 1 + WINDOW]:
+                    pairs.add((a, b) if a < b else (b, a))
+    return pairs
+
+
+def find_duplicates(rows, threshold=DEFAULT_THRESHOLD, cancel=None):
+    """Return MergeSuggestions for rows (name, age, email, mobile), best first"""
+    rows = list(rows)
+    suggestions = []
+    for a, b in candidate_pairs(rows):
+        if cancel is not None and cancel.is_set():
+            break
+        score, reasons = score_pair(rows[a], rows[b])
+        if score >= threshold:
+            keep, drop = (rows[a], rows[b]) if completeness(rows[a]) >= completeness(rows[b]) else (rows[b], rows[a])
+            suggestions.append(MergeSuggestion(keep, drop, score, reasons))
+    suggestions.sort(key=lambda s: -s.score)
+    return suggestions
+
+
+def merge_contacts(store, suggestion):
+    """Apply a suggestion: fill the kept contact's blanks from the duplicate, then delete the duplicate.
+
+    Both contacts are read again first, so edits and earlier merges since the
+    scan are kept, and the update and delete commit together. Returns
+    (merged row, kept row before, dropped row), or None if either contact is gone.
+    """
+    keep = store.get(suggestion.keep[0])
+    drop = store.get(suggestion.drop[0])
+    if keep is None or drop is None:
+        return None
+    keep, drop = keep.as_row(), drop.as_row()
+    row = fill_blanks(keep, drop)
+    with store.conn:
+        store.conn.execute("UPDATE contacts SET age = ?, email = ?, mobile = ? WHERE name = ?", row[1:] + row[:1])
+        store.conn.execute("DELETE FROM contacts WHERE name = ?", (drop[0],))
+    return row, keep, drop
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suggest duplicate contacts to merge")
+    parser.add_argument("--db", default="contacts.db", help="contact database")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="minimum score (0-1)")
+    parser.add_argument("--limit", type=int, default=50, help="suggestions to print")
+    args = parser.parse_args()
+
+    store = ContactStore(args.db)
+    try:
+        started = time.perf_counter()
+        rows = list(store.iter_rows())
+        suggestions = find_duplicates(rows, args.threshold)
+        elapsed = time.perf_counter() - started
+    finally:
+        store.close()
+
+    for s in suggestions[:args.limit]:
+        print(f"{s.score:.2f}  keep '{s.keep[0]}'  merge '{s.drop[0]}'  ({', '.join(s.reasons)})")
+    print(f"{len(suggestions)} suggestions from {len(rows)} contacts in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,344 @@
+import argparse
+import csv
+import datetime
+import os
+import re
+import time
+
+from contact_store import BATCH_SIZE, ContactStore
+
+VCARD_EXTENSIONS = (".vcf", ".vcard")
+CSV_FIELDS = ["name", "age", "email", "mobile"]
+CSV_ALIASES = {"full name": "name", "fn": "name", "phone": "mobile", "mobile phone": "mobile", "tel": "mobile", "e-mail": "email"}
+PROGRESS_EVERY = 1000  # Records between progress callbacks
+MAX_ERRORS = 20  # Error messages kept for the summary
+VCARD_PROPERTIES = {"FN", "N", "EMAIL", "TEL", "BDAY", "X-AGE"}
+
+_UNESCAPE = re.compile(r"\\(.)")
+_ESCAPE = re.compile(r"([\\,;])")
+
+
+def file_format(path):
+    return "vcard" if path.lower().endswith(VCARD_EXTENSIONS) else "csv"
+
+
+# Reading
+
+def iter_lines(raw):
+    """Decode a binary file line by line, so raw.tell() can report progress.
+    utf-8-sig drops the byte order mark Excel puts at the start of a CSV."""
+    for line in raw:
+        yield line.decode("utf-8-sig", errors="replace")
+
+
+def unfold(lines):
+    """Join folded vCard lines; a continuation line starts with a space or tab"""
+    current = None
+    more = None  # Continuations of current, joined once at the end (PHOTO data can run to thousands)
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            if more is None:
+                more = [current]
+            more.append(line[1:])
+            continue
+        if current is not None:
+            yield "".join(more) if more else current
+            more = None
+        current = line
+    if current is not None:
+        yield "".join(more) if more else current
+
+
+def unescape(value):
+    if "\\" not in value:
+        return value
+    return _UNESCAPE.sub(lambda m: "\n" if m.group(1) in "nN" else m.group(1), value)
+
+
+def parse_params(head):
+    """'item1.TEL;TYPE=cell,voice' -> {'type': ['cell', 'voice']}"""
+    params = {}
+    for param in head.split(";")[1:]:
+        key, sep, values = param.partition("=")
+        if not sep:  # vCard 2.1 style bare type, e.g. TEL;CELL
+            key, values = "type", key
+        params.setdefault(key.lower(), []).extend(v.strip('"').lower() for v in values.split(","))
+    return params
+
+
+def age_from_birthday(value, today=None):
+    digits = value.replace("-", "")[:8]
+    if len(digits) < 8 or not digits.isdigit():
+        return ""  # Missing or year-less (--MMDD) birthdays give no age
+    try:
+        born = datetime.date(int(digits[:4]), int(digits[4:6]), int(digits[6:8]))
+    except ValueError:
+        return ""
+    today = today or datetime.date.today()
+    return str(today.year - born.year - ((today.month, today.day) < (born.month, born.day)))
+
+
+def preferred(values, wanted):
+    """Pick the value whose params mention `wanted` or 'pref', else the first"""
+    for params, value in values:
+        if wanted in params.get("type", ()):
+            return value
+    for params, value in values:
+        if "pref" in params.get("type", ()) or "pref" in params:
+            return value
+    return values[0][1] if values else ""
+
+
+def card_to_record(props, where):
+    """Turn the properties of one vCard into a form-style record of strings"""
+    single = {}
+    emails = []
+    phones = []
+    for name, params, value in props:
+        if name == "EMAIL":
+            emails.append((params, unescape(value)))
+        elif name == "TEL":
+            phones.append((params, value[4:] if value.lower().startswith("tel:") else value))
+        else:
+            single.setdefault(name, unescape(value) if name != "N" else value)
+
+    full_name = single.get("FN", "")
+    if not full_name and "N" in single:
+        family, given = (unescape(part) for part in (single["N"].split(";") + ["", ""])[:2])
+        full_name = f"{given} {family}".strip()
+
+    age = single.get("X-AGE", "")
+    if not age and "BDAY" in single:
+        age = age_from_birthday(single["BDAY"])
+
+    return {
+        "name": full_name,
+        "age": age,
+        "email": preferred(emails, "internet"),
+        "mobile": preferred(phones, "cell"),
+        "where": where
+    }
+
+
+def iter_vcards(lines):
+    """Yield one record per BEGIN:VCARD ... END:VCARD block, holding only that card in memory.
+
+    Only the properties the contact book uses are kept; parameters are parsed
+    only for those, so PHOTO, ADR and the like cost little more than reading them.
+    """
+    props = None
+    cards = 0
+    for line in unfold(lines):
+        head, _, value = line.partition(":")
+        name = head.partition(";")[0].rpartition(".")[2].upper()
+        if name == "BEGIN":
+            props = []
+            cards += 1
+        elif name == "END":
+            if props is not None:
+                yield card_to_record(props, f"Card {cards}")
+            props = None
+        elif props is not None and name in VCARD_PROPERTIES:
+            props.append((name, parse_params(head) if ";" in head else {}, value))
+
+
+def iter_csv(lines):
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    columns = [CSV_ALIASES.get(field.strip().lower(), field.strip().lower()) for field in header]
+    for row in reader:
+        record = {field: "" for field in CSV_FIELDS}
+        record.update((column, value) for column, value in zip(columns, row) if column in record)
+        record["where"] = f"Line {reader.line_num}"
+        yield record
+
+
+def validate(record):
+    """Apply the same rules as the Create Contact form; returns (row, error)"""
+    name = record["name"].strip()
+    age = record["age"].strip()
+    if not name:
+        return None, f"{record['where']}: missing name"
+    if not age.isdigit():
+        return None, f"{record['where']}: age of '{name}' must be a number"
+    return (name, int(age), record["email"].strip(), record["mobile"].strip()), None
+
+
+class ImportResult:
+    def __init__(self):
+        self.imported = 0
+        self.existing = 0  # Valid rows skipped because the name is already in the book
+        self.invalid = 0
+        self.errors = []
+        self.cancelled = False
+
+    def summary(self):
+        text = f"Imported {self.imported} contacts"
+        if self.existing:
+            text += f", {self.existing} already in the book"
+        if self.invalid:
+            text += f", {self.invalid} invalid"
+        if self.cancelled:
+            text += " (cancelled)"
+        return text
+
+
+def import_contacts(path, store, progress=None, cancel=None, batch_size=BATCH_SIZE):
+    """Stream a vCard or CSV file into the store in batches.
+
+    Memory use is one batch, whatever the file size. progress(done_bytes,
+    total_bytes, result) is called every few thousand records; setting the
+    cancel event stops after the current record, keeping batches already
+    committed.
+    """
+    result = ImportResult()
+    total_bytes = os.path.getsize(path)
+
+    with open(path, "rb") as raw:
+        lines = iter_lines(raw)
+        records = iter_vcards(lines) if file_format(path) == "vcard" else iter_csv(lines)
+
+        batch = []
+        for count, record in enumerate(records, 1):
+            if cancel is not None and cancel.is_set():
+                result.cancelled = True
+                break
+            row, error = validate(record)
+            if error:
+                result.invalid += 1
+                if len(result.errors) < MAX_ERRORS:
+                    result.errors.append(error)
+            else:
+                batch.append(row)
+            if len(batch) >= batch_size:
+                store_batch(store, batch, result)
+                batch = []
+            if progress and count % PROGRESS_EVERY == 0:
+                progress(raw.tell(), total_bytes, result)
+
+        if batch:
+            store_batch(store, batch, result)
+        if progress:
+            progress(total_bytes if not result.cancelled else raw.tell(), total_bytes, result)
+    return result
+
+
+def store_batch(store, batch, result):
+    inserted = store.create_many(batch, len(batch), ignore_existing=True)
+    result.imported += inserted
+    result.existing += len(batch) - inserted
+
+
+# Writing
+
+def escape(value):
+    return _ESCAPE.sub(r"\\\1", value).replace("\n", "\\n")
+
+
+def fold(line):
+    """Fold a content line at 75 octets as RFC 6350 asks"""
+    data = line.encode("utf-8")
+    if len(data) <= 75:
+        return line + "\r\n"
+    parts = []
+    limit = 75
+    while data:
+        cut = min(limit, len(data))
+        while cut < len(data) and (data[cut] & 0xC0) == 0x80:  # Don't split a UTF-8 sequence
+            cut -= 1
+        parts.append(data[:cut].decode("utf-8"))
+        data = data[cut:]
+        limit = 74  # Continuation lines spend one octet on the leading space
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def format_vcard(row, version="3.0"):
+    name, age, email, mobile = row
+    given, _, family = name.rpartition(" ") if " " in name else ("", "", name)
+    lines = ["BEGIN:VCARD", f"VERSION:{version}", f"FN:{escape(name)}", f"N:{escape(family)};{escape(given)};;;"]
+    if version == "4.0":
+        if email:
+            lines.append(f"EMAIL:{escape(email)}")
+        if mobile:
+            lines.append(f"TEL;VALUE=uri;TYPE=cell:tel:{mobile}")
+    else:
+        if email:
+            lines.append(f"EMAIL;TYPE=INTERNET:{escape(email)}")
+        if mobile:
+            lines.append(f"TEL;TYPE=CELL:{escape(mobile)}")
+    lines.append(f"X-AGE:{age}")
+    lines.append("END:VCARD")
+    return "".join(fold(line) for line in lines)
+
+
+def export_contacts(store, path, version="3.0", progress=None, cancel=None, chunk_size=1000):
+    """Write every contact to a vCard or CSV file, a chunk of records per write.
+
+    The file is written next to its destination and moved into place at the
+    end, so a cancelled or failed export never leaves a half-written file.
+    Returns the number of contacts written, or None if cancelled.
+    """
+    total = store.count()
+    temp_path = path + ".part"
+    written = 0
+    try:
+        with open(temp_path, "w", encoding="utf-8", newline="") as out:
+            rows = store.iter_rows(batch_size=chunk_size)
+            if file_format(path) == "vcard":
+                write_chunk = lambda chunk: out.write("".join(format_vcard(row, version) for row in chunk))
+            else:
+                writer = csv.writer(out)
+                writer.writerow(CSV_FIELDS)
+                write_chunk = writer.writerows
+
+            chunk = []
+            for row in rows:
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    if cancel is not None and cancel.is_set():
+                        return None
+                    write_chunk(chunk)
+                    written += len(chunk)
+                    chunk = []
+                    if progress:
+                        progress(written, total)
+            write_chunk(chunk)
+            written += len(chunk)
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    if progress:
+        progress(written, total)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import or export the contact book as vCard (.vcf) or CSV")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("path", help="file to read or write; .vcf/.vcard for vCard, anything else for CSV")
+    parser.add_argument("--db", default="contacts.db", help="contact database")
+    parser.add_argument("--vcard-version", choices=["3.0", "4.0"], default="3.0")
+    args = parser.parse_args()
+
+    store = ContactStore(args.db)
+    started = time.perf_counter()
+    try:
+        if args.action == "import":
+            result = import_contacts(args.path, store)
+            print(result.summary())
+            for error in result.errors:
+                print(f"  {error}")
+        else:
+            count = export_contacts(store, args.path, args.vcard_version)
+            print(f"Exported {count} contacts to {args.path}")
+    finally:
+        store.close()
+    print(f"Took {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
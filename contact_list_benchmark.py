@@ -0,0 +1,116 @@
+import argparse
+import os
+import random
+import shutil
+import string
+import tempfile
+import time
+import tkinter as tk
+from tkinter import ttk
+
+from contact_book_app import NameListSource, VirtualContactList
+from contact_search_index import SearchIndex
+from contact_store import ContactStore
+
+
+def random_name(rng):
+    first = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 8))).title()
+    last = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 10))).title()
+    return f"{first} {last}"
+
+
+def random_row(rng, name):
+    return (name, rng.randint(18, 90), f"{name.split()[0].lower()}@example.com", f"9{rng.randint(0, 999999999):09d}")
+
+
+def make_book(path, size, rng):
+    store = ContactStore(path)
+    names = set()
+    while len(names) < size:
+        names.add(random_name(rng))
+    store.create_many(random_row(rng, name) for name in names)
+    return store
+
+
+def make_list(size):
+    """A real VirtualContactList in a hidden window, or None without a display"""
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No Tk display ({e}); timing the store and index only")
+        return None, None
+    root.withdraw()
+    tree = ttk.Treeview(root, columns=('Name', 'Age', 'Email', 'Mobile'))
+    scrollbar = ttk.Scrollbar(root, orient=tk.VERTICAL)
+    contact_list = VirtualContactList(tree, scrollbar, None)
+    contact_list.visible = 30
+    return root, contact_list
+
+
+def run(size, edits, seed):
+    """Apply `edits` creates, updates and deletes the way ContactBookApp does; return per-edit seconds"""
+    rng = random.Random(seed)
+    workdir = tempfile.mkdtemp(prefix="contact_bench_")
+    store = make_book(os.path.join(workdir, "contacts.db"), size, rng)
+    index = SearchIndex()
+    index.build(name for (name,) in store.iter_rows("name"))
+
+    root, contact_list = make_list(size)
+    if contact_list:
+        contact_list.set_source(NameListSource(index.names, store))
+        contact_list.offset = size // 2  # Mid-book, so edits land above, inside and below the view
+        contact_list.render()
+
+    added = []
+    times = []
+    for i in range(edits):
+        op = ("add", "update", "remove")[i % 3] if added else "add"
+        started = time.perf_counter()
+        if op == "add":
+            name = random_name(rng)
+            while index.position(name) is not None:
+                name = random_name(rng)
+            row = random_row(rng, name)
+            store.create(*row)
+            index.add(name)
+            if contact_list:
+                contact_list.insert_row(index.position(name), row)
+            added.append(name)
+        elif op == "update":
+            row = random_row(rng, rng.choice(added))
+            store.update(*row)
+            if contact_list:
+                contact_list.update_row(index.position(row[0]), row)
+        else:
+            name = added.pop(rng.randrange(len(added)))
+            position = index.position(name)
+            store.delete(name)
+            index.remove(name)
+            if contact_list:
+                contact_list.delete_row(position)
+        times.append(time.perf_counter() - started)
+
+    if root:
+        root.update()
+        root.destroy()
+    store.close()
+    shutil.rmtree(workdir)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time single contact edits against books of different sizes")
+    parser.add_argument("--sizes", default="10000,100000,500000", help="comma-separated book sizes")
+    parser.add_argument("--edits", type=int, default=10000, help="sequential edits per book")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        times = sorted(run(size, args.edits, args.seed))
+        mean = sum(times) / len(times)
+        print(f"{size:>9} contacts: {len(times)} edits, mean {mean * 1e6:.0f} us, "
+              f"median {times[len(times) // 2] * 1e6:.0f} us, p99 {times[int(len(times) * 0.99)] * 1e6:.0f} us")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,105 @@
+import re
+
+DEFAULT_COUNTRY_CODE = "91"  # Assumed for numbers written without one
+
+_EXTENSION = re.compile(r"(?:x|ext\.?|extension)\s*\d*$", re.IGNORECASE)
+
+
+def normalize_mobile(number, country_code=DEFAULT_COUNTRY_CODE):
+    """E.164-style form of a phone number: '098765 43210', '+91-98765-43210'
+    and '0091 9876543210' all give '+919876543210'. Returns '' for no digits."""
+    number = _EXTENSION.sub("", number.strip())
+    digits = "".join(ch for ch in number if ch.isdigit())
+    if not digits:
+        return ""
+    if number.startswith("+"):
+        return "+" + digits
+    if digits.startswith("00"):  # International dialling prefix
+        return "+" + digits[2:]
+    if digits.startswith("0"):  # National trunk prefix
+        return "+" + country_code + digits[1:]
+    if len(digits) == 10:
+        return "+" + country_code + digits
+    if len(digits) > 10 and digits.startswith(country_code):
+        return "+" + digits
+    return digits  # Short codes and extensions stay as they are
+
+
+def normalize_email(email):
+    return email.strip().casefold()
+
+
+def mobile_key(number):
+    """Dictionary key for a number: E.164 digits as an int, which is smaller than the string"""
+    normalized = normalize_mobile(number)
+    if not normalized:
+        return None
+    return int(normalized[1:]) if normalized.startswith("+") else normalized
+
+
+class ReverseLookup:
+    """Hash indexes from normalized mobile and email to contact names.
+
+    Each key maps to a name, or to a tuple of names when several contacts
+    share it, so the common case costs one dictionary entry.
+    """
+
+    def __init__(self):
+        self.by_mobile = {}
+        self.by_email = {}
+
+    def build(self, rows):
+        for row in rows:
+            self.add(row)
+
+    @staticmethod
+    def _add(table, key, name):
+        existing = table.get(key)
+        if existing is None:
+            table[key] = name
+        elif isinstance(existing, tuple):
+            if name not in existing:
+                table[key] = existing + (name,)
+        elif existing != name:
+            table[key] = (existing, name)
+
+    @staticmethod
+    def _remove(table, key, name):
+        existing = table.get(key)
+        if existing == name:
+            del table[key]
+        elif isinstance(existing, tuple) and name in existing:
+            rest = tuple(n for n in existing if n != name)
+            table[key] = rest[0] if len(rest) == 1 else rest
+
+    @staticmethod
+    def _names(value):
+        if value is None:
+            return []
+        return list(value) if isinstance(value, tuple) else [value]
+
+    def add(self, row):
+        """Index a (name, age, email, mobile) row"""
+        name, _, email, mobile = row
+        key = mobile_key(mobile)
+        if key is not None:
+            self._add(self.by_mobile, key, name)
+        if email.strip():
+            self._add(self.by_email, normalize_email(email), name)
+
+    def remove(self, row):
+        """Forget a row; pass the values it was indexed with"""
+        name, _, email, mobile = row
+        key = mobile_key(mobile)
+        if key is not None:
+            self._remove(self.by_mobile, key, name)
+        if email.strip():
+            self._remove(self.by_email, normalize_email(email), name)
+
+    def find_mobile(self, number):
+        """Names of contacts with this number, however it is written"""
+        key = mobile_key(number)
+        return self._names(self.by_mobile.get(key)) if key is not None else []
+
+    def find_email(self, email):
+        return self._names(self.by_email.get(normalize_email(email))) if email.strip() else []
\ No newline at end of file
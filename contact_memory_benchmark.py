@@ -0,0 +1,73 @@
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from contact_records import ContactRecord, ContactTable
+
+DOMAINS = ["gmail.com", "yahoo.com", "outlook.com", "rediffmail.com", "example.org"]
+
+
+def synthetic_rows(count, seed=1):
+    """Fresh (name, age, email, mobile) tuples in display order, so every layout owns its strings"""
+    rng = random.Random(seed)
+    for i in range(count):
+        first = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 8)))
+        name = f"Contact {i:07d} {first.title()}"
+        yield (name, rng.randint(18, 90), f"{first}{i}@{rng.choice(DOMAINS)}", f"9{rng.randint(0, 999999999):09d}")
+
+
+def build_dicts(rows):
+    """The original layout: {name: {'age', 'email', 'mobile'}}"""
+    return {name: {'age': age, 'email': email, 'mobile': mobile} for name, age, email, mobile in rows}
+
+
+def build_records(rows):
+    return {name: ContactRecord(name, age, email, mobile) for name, age, email, mobile in rows}
+
+
+def build_table(rows):
+    return ContactTable.from_rows(rows)
+
+
+LAYOUTS = [("dict per contact", build_dicts), ("__slots__ record", build_records), ("columnar table", build_table)]
+
+
+def measure(build, count):
+    """Return (bytes retained, build seconds, seconds per 10k random reads)"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    book = build(synthetic_rows(count))
+    built = time.perf_counter() - started
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    rng = random.Random(2)
+    started = time.perf_counter()
+    if isinstance(book, ContactTable):
+        for _ in range(10000):
+            book.row(rng.randrange(count))
+    else:
+        names = list(book)  # Not counted above: only needed to pick random keys
+        for _ in range(10000):
+            book[names[rng.randrange(count)]]
+    reads = time.perf_counter() - started
+    return retained, built, reads
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare resident memory of contact record layouts with tracemalloc")
+    parser.add_argument("--contacts", type=int, default=1000000)
+    args = parser.parse_args()
+
+    print(f"{args.contacts} contacts")
+    for label, build in LAYOUTS:
+        retained, built, reads = measure(build, args.contacts)
+        print(f"{label:>18}: {retained / 1e6:8.1f} MB ({retained / args.contacts:6.1f} B/contact), "
+              f"built in {built:.1f}s, 10k random reads in {reads * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,233 @@
+import sys
+from array import array
+from bisect import bisect_left
+
+from contact_search_index import sort_key
+
+AGE_OVERFLOW = 255  # Age byte meaning the real age is in ContactTable.large_ages
+
+
+class ContactRecord:
+    """One contact. __slots__ drops the per-instance dict, so a record takes
+    less than half the memory of the {'age', 'email', 'mobile'} dict it replaces."""
+
+    __slots__ = ("name", "age", "email", "mobile")
+
+    def __init__(self, name, age, email="", mobile=""):
+        self.name = name
+        self.age = age
+        self.email = email
+        self.mobile = mobile
+
+    def __repr__(self):
+        return f"ContactRecord({self.name!r}, {self.age!r}, {self.email!r}, {self.mobile!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, ContactRecord) and self.as_row() == other.as_row()
+
+    def as_row(self):
+        return (self.name, self.age, self.email, self.mobile)
+
+
+class StringColumn:
+    """Strings packed as UTF-8 into one buffer, addressed by position.
+
+    A value costs its encoded bytes plus six bytes of bookkeeping, instead of
+    a 50-plus byte str object. Removed or replaced values leave garbage in the
+    buffer until it is compacted.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.starts = array("I")
+        self.lengths = array("H")
+        self.garbage = 0
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        start = self.starts[index]
+        return self.data[start:start + self.lengths[index]].decode("utf-8")
+
+    def _encode(self, value):
+        encoded = value.encode("utf-8")
+        if len(encoded) > 0xFFFF:
+            raise ValueError("Value too long for a contact field")
+        return encoded
+
+    def append(self, value):
+        encoded = self._encode(value)
+        self.starts.append(len(self.data))
+        self.lengths.append(len(encoded))
+        self.data += encoded
+
+    def insert(self, index, value):
+        encoded = self._encode(value)
+        self.starts.insert(index, len(self.data))
+        self.lengths.insert(index, len(encoded))
+        self.data += encoded
+
+    def __setitem__(self, index, value):
+        encoded = self._encode(value)
+        self.garbage += self.lengths[index]
+        self.starts[index] = len(self.data)
+        self.lengths[index] = len(encoded)
+        self.data += encoded
+        self._maybe_compact()
+
+    def __delitem__(self, index):
+        self.garbage += self.lengths[index]
+        del self.starts[index]
+        del self.lengths[index]
+        self._maybe_compact()
+
+    def _maybe_compact(self):
+        if self.garbage > 4096 and self.garbage * 2 > len(self.data):
+            self.compact()
+
+    def compact(self):
+        data = bytearray()
+        for index in range(len(self.starts)):
+            start = self.starts[index]
+            self.starts[index] = len(data)
+            data += self.data[start:start + self.lengths[index]]
+        self.data = data
+        self.garbage = 0
+
+
+class ContactTable:
+    """Columnar, resident contact book in display order.
+
+    Names, emails and mobiles are packed StringColumns and ages live in a byte
+    array, so a million contacts fit in tens of megabytes. The rare age that
+    doesn't fit a byte is kept by name in a dict. Email domains are
+    interned once per distinct domain, since books share a handful of them.
+    Works as a VirtualContactList source (count/page) and keeps its order on
+    insert and delete.
+    """
+
+    def __init__(self):
+        self.names = StringColumn()
+        self.ages = array("B")
+        self.large_ages = {}  # name -> age, for ages outside 0-254
+        self.email_users = StringColumn()
+        self.email_domains = array("H")  # Index into domains; 0 means no email
+        self.domains = [""]
+        self.domain_ids = {"": 0}
+        self.mobiles = StringColumn()
+
+    def __len__(self):
+        return len(self.names)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from (name, age, email, mobile) rows already in display order"""
+        table = cls()
+        for name, age, email, mobile in rows:
+            table._insert(len(table), name, age, email, mobile)
+        return table
+
+    @classmethod
+    def from_store(cls, store):
+        return cls.from_rows(store.iter_rows(ordered=True))
+
+    def _domain_id(self, domain):
+        domain_id = self.domain_ids.get(domain)
+        if domain_id is None:
+            if len(self.domains) > 0xFFFF:
+                return None
+            domain_id = len(self.domains)
+            self.domains.append(sys.intern(domain))
+            self.domain_ids[domain] = domain_id
+        return domain_id
+
+    def _split_email(self, email):
+        user, at, domain = email.rpartition("@")
+        domain_id = self._domain_id(domain) if at and domain else None
+        if domain_id is None:  # No usable domain; keep the whole address as the user part
+            return email, 0
+        return user, domain_id
+
+    def _pack_age(self, name, age):
+        if 0 <= age < AGE_OVERFLOW:
+            self.large_ages.pop(name, None)
+            return age
+        self.large_ages[name] = age
+        return AGE_OVERFLOW
+
+    def _insert(self, index, name, age, email, mobile):
+        user, domain_id = self._split_email(email)
+        self.names.insert(index, name)
+        self.ages.insert(index, self._pack_age(name, age))
+        self.email_users.insert(index, user)
+        self.email_domains.insert(index, domain_id)
+        self.mobiles.insert(index, mobile)
+
+    def email(self, index):
+        domain_id = self.email_domains[index]
+        user = self.email_users[index]
+        return f"{user}@{self.domains[domain_id]}" if domain_id else user
+
+    def age(self, index, name):
+        age = self.ages[index]
+        return self.large_ages[name] if age == AGE_OVERFLOW else age
+
+    def row(self, index):
+        name = self.names[index]
+        return (name, self.age(index, name), self.email(index), self.mobiles[index])
+
+    def record(self, index):
+        return ContactRecord(*self.row(index))
+
+    def position(self, name):
+        """Index of name in display order, or None"""
+        index = bisect_left(self.names, sort_key(name), key=sort_key)
+        if index < len(self.names) and self.names[index] == name:
+            return index
+        return None
+
+    def get(self, name):
+        index = self.position(name)
+        return None if index is None else self.record(index)
+
+    # VirtualContactList source
+
+    def count(self):
+        return len(self)
+
+    def page(self, offset, limit):
+        return [self.row(index) for index in range(offset, min(offset + limit, len(self)))]
+
+    # Edits, each keeping display order
+
+    def add(self, name, age, email="", mobile=""):
+        """Insert a contact at its sorted position and return that position"""
+        index = bisect_left(self.names, sort_key(name), key=sort_key)
+        if index < len(self.names) and self.names[index] == name:
+            raise KeyError(f"Contact '{name}' already exists")
+        self._insert(index, name, age, email, mobile)
+        return index
+
+    def update(self, name, age, email="", mobile=""):
+        index = self.position(name)
+        if index is None:
+            raise KeyError(name)
+        user, domain_id = self._split_email(email)
+        self.ages[index] = self._pack_age(name, age)
+        self.email_users[index] = user
+        self.email_domains[index] = domain_id
+        self.mobiles[index] = mobile
+        return index
+
+    def remove(self, name):
+        index = self.position(name)
+        if index is None:
+            raise KeyError(name)
+        del self.names[index]
+        del self.ages[index]
+        self.large_ages.pop(name, None)
+        del self.email_users[index]
+        del self.email_domains[index]
+        del self.mobiles[index]
+        return index
\ No newline at end of file
@@ -0,0 +1,145 @@
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+
+# SQLite's built-in lower() only folds ASCII letters, so the key must do the same
+# for the index and ORDER BY lower(name) to agree on where every name goes
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+def fold(text):
+    return text.translate(_ASCII_LOWER)
+
+
+def sort_key(name):
+    """Display order of contacts, matching ORDER BY lower(name), name in the store"""
+    return (fold(name), name)
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def ngrams(text):
+    """Every distinct substring of one to three characters, the keys a name is posted under"""
+    return {text[i:i + n] for n in (1, 2, 3) for i in range(len(text) - n + 1)}
+
+
+class SearchIndex:
+    """In-memory name index for prefix and substring search.
+
+    Prefix lookups use sorted name lists (a flattened trie: every prefix is a
+    contiguous range found with bisect). Substring lookups walk the shortest
+    trigram posting list of the query and verify each candidate; a one- or
+    two-character query has a posting list of its own. Posting lists
+    are kept in display order, so a page of results can stop early. Names are
+    stored once and shared by every structure.
+    """
+
+    def __init__(self):
+        self.names = []  # All names in sort_key order
+        self.words = []  # (word, name) for the second and later words of each name
+        self.grams = defaultdict(list)  # 1-3 character substring -> names containing it, in sort_key order
+
+    def __len__(self):
+        return len(self.names)
+
+    def build(self, names):
+        """Bulk load, much faster than calling add() for every name"""
+        self.names = sorted(names, key=sort_key)
+        self.words = sorted((word, name) for name in self.names for word in name.lower().split()[1:])
+        self.grams = defaultdict(list)
+        for name in self.names:  # Already sorted, so every posting list is too
+            for gram in ngrams(name.lower()):
+                self.grams[gram].append(name)
+
+    def add(self, name):
+        """Index a name; adding a name that is already indexed does nothing"""
+        index = bisect_left(self.names, sort_key(name), key=sort_key)
+        if index < len(self.names) and self.names[index] == name:
+            return
+        self.names.insert(index, name)
+        lower = name.lower()
+        for word in lower.split()[1:]:
+            insort(self.words, (word, name))
+        for gram in ngrams(lower):
+            insort(self.grams[gram], name, key=sort_key)
+
+    def remove(self, name):
+        self._discard(self.names, name)
+
+        lower = name.lower()
+        for word in lower.split()[1:]:
+            index = bisect_left(self.words, (word, name))
+            if index < len(self.words) and self.words[index] == (word, name):
+                del self.words[index]
+
+        for gram in ngrams(lower):
+            postings = self.grams.get(gram)
+            if postings is not None:
+                self._discard(postings, name)
+                if not postings:
+                    del self.grams[gram]
+
+    @staticmethod
+    def _discard(names, name):
+        index = bisect_left(names, sort_key(name), key=sort_key)
+        if index < len(names) and names[index] == name:
+            del names[index]
+
+    def position(self, name):
+        """Index of name in display order, or None if it is not indexed"""
+        index = bisect_left(self.names, sort_key(name), key=sort_key)
+        if index < len(self.names) and self.names[index] == name:
+            return index
+        return None
+
+    def rename(self, old_name, new_name):
+        self.remove(old_name)
+        self.add(new_name)
+
+    def iter_matches(self, query):
+        """Yield matching names best first: whole-name prefix (exact match first),
+        then word prefix, then substring anywhere in the name"""
+        query = query.strip()
+        if not query:
+            return
+        seen = set()
+
+        # Whole-name prefix; an exact match sorts first within the range
+        prefix = fold(query)
+        query = query.lower()
+        start = bisect_left(self.names, (prefix, ""), key=sort_key)
+        end = bisect_left(self.names, (prefix + "\U0010ffff", ""), key=sort_key)
+        for index in range(start, end):
+            name = self.names[index]
+            seen.add(name)
+            yield name
+
+        # Prefix of a later word, e.g. 'smi' finds 'John Smith'
+        index = bisect_left(self.words, (query, ""))
+        while index < len(self.words) and self.words[index][0].startswith(query):
+            name = self.words[index][1]
+            if name not in seen:
+                seen.add(name)
+                yield name
+            index += 1
+
+        # Substring anywhere; every match is in the posting list of each query trigram,
+        # so walking the shortest one and checking the substring is enough
+        grams = trigrams(query) or {query}  # Shorter queries are posted under themselves
+        postings = min((self.grams.get(gram, ()) for gram in grams), key=len)
+        for name in postings:
+            if name not in seen and query in name.lower():
+                yield name
+
+    def search(self, query, offset=0, limit=50):
+        """Return (names, has_more) for one page of ranked matches"""
+        page = []
+        for position, name in enumerate(self.iter_matches(query)):
+            if position < offset:
+                continue
+            if len(page) == limit:
+                return page, True
+            page.append(name)
+        return page, False
\ No newline at end of file
@@ -0,0 +1,244 @@
+import hashlib
+import sqlite3
+
+from contact_records import ContactRecord
+
+DB_FILE = "contacts.db"
+BATCH_SIZE = 5000
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS contacts (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE,
+        age INTEGER NOT NULL,
+        email TEXT NOT NULL DEFAULT '',
+        mobile TEXT NOT NULL DEFAULT ''
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_contacts_name_lower ON contacts(lower(name), name)",
+    "CREATE INDEX IF NOT EXISTS idx_contacts_email ON contacts(email)",
+    "CREATE INDEX IF NOT EXISTS idx_contacts_mobile ON contacts(mobile)"
+]
+
+# Schema changes after the first release, applied in order and tracked with PRAGMA user_version
+MIGRATIONS = [
+    # 1: change tracking for sync. Every write gets the next change_seq and a
+    # content hash from the triggers below; deletes leave a tombstone.
+    [
+        "ALTER TABLE contacts ADD COLUMN content_hash TEXT NOT NULL DEFAULT ''",
+        "ALTER TABLE contacts ADD COLUMN change_seq INTEGER NOT NULL DEFAULT 0",
+        "UPDATE contacts SET content_hash = contact_hash(name, age, email, mobile)",
+        "CREATE INDEX idx_contacts_change_seq ON contacts(change_seq)",
+        "CREATE TABLE tombstones (name TEXT PRIMARY KEY, change_seq INTEGER NOT NULL) WITHOUT ROWID",
+        "CREATE INDEX idx_tombstones_change_seq ON tombstones(change_seq)",
+        "CREATE TABLE sync_meta (key TEXT PRIMARY KEY, value) WITHOUT ROWID",
+        "INSERT INTO sync_meta VALUES ('change_seq', 0)",
+        """CREATE TABLE sync_peers (
+            peer TEXT PRIMARY KEY,
+            sent_seq INTEGER NOT NULL DEFAULT 0,
+            received_seq INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID""",
+        """CREATE TABLE sync_snapshot (
+            peer TEXT NOT NULL,
+            name TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            PRIMARY KEY (peer, name)
+        ) WITHOUT ROWID""",
+        """CREATE TABLE sync_conflicts (
+            peer TEXT NOT NULL,
+            name TEXT NOT NULL,
+            remote TEXT NOT NULL,
+            PRIMARY KEY (peer, name)
+        ) WITHOUT ROWID""",
+        """CREATE TRIGGER contacts_track_insert AFTER INSERT ON contacts BEGIN
+            UPDATE sync_meta SET value = value + 1 WHERE key = 'change_seq';
+            UPDATE contacts SET content_hash = contact_hash(NEW.name, NEW.age, NEW.email, NEW.mobile),
+                change_seq = (SELECT value FROM sync_meta WHERE key = 'change_seq') WHERE id = NEW.id;
+            DELETE FROM tombstones WHERE name = NEW.name;
+        END""",
+        """CREATE TRIGGER contacts_track_update AFTER UPDATE OF name, age, email, mobile ON contacts
+        WHEN contact_hash(NEW.name, NEW.age, NEW.email, NEW.mobile) != OLD.content_hash BEGIN
+            UPDATE sync_meta SET value = value + 1 WHERE key = 'change_seq';
+            UPDATE contacts SET content_hash = contact_hash(NEW.name, NEW.age, NEW.email, NEW.mobile),
+                change_seq = (SELECT value FROM sync_meta WHERE key = 'change_seq') WHERE id = NEW.id;
+        END""",
+        """CREATE TRIGGER contacts_track_delete AFTER DELETE ON contacts BEGIN
+            UPDATE sync_meta SET value = value + 1 WHERE key = 'change_seq';
+            INSERT OR REPLACE INTO tombstones VALUES (OLD.name, (SELECT value FROM sync_meta WHERE key = 'change_seq'));
+        END"""
+    ],
+    # 2: contacts that predate change tracking were left at change_seq 0, which
+    # no export (since > 0) ever picks up; give them sequence numbers of their own
+    [
+        "UPDATE contacts SET change_seq = (SELECT value FROM sync_meta WHERE key = 'change_seq') + id WHERE change_seq = 0",
+        """UPDATE sync_meta SET value = MAX(value, (SELECT IFNULL(MAX(change_seq), 0) FROM contacts))
+        WHERE key = 'change_seq'"""
+    ]
+]
+
+# Sort order shared by the UI and the store
+ORDER_BY = "ORDER BY lower(name), name"
+
+
+def content_hash(name, age, email, mobile):
+    """Short fingerprint of a contact's values; equal hashes mean equal contacts"""
+    text = "\x1f".join((name, str(age), email, mobile))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class ContactStore:
+    """SQLite-backed contact book.
+
+    Each thread should open its own ContactStore on the same file; WAL mode lets
+    readers run alongside a writer.
+    """
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints, safe against corruption
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        # Used by the change-tracking triggers, so every connection that writes needs it
+        self.conn.create_function("contact_hash", 4, content_hash, deterministic=True)
+        with self.conn:
+            for statement in SCHEMA:
+                self.conn.execute(statement)
+        self.migrate()
+
+    def migrate(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, statements in enumerate(MIGRATIONS[version:], version + 1):
+            with self.conn:
+                for statement in statements:
+                    self.conn.execute(statement)
+                self.conn.execute(f"PRAGMA user_version = {number}")
+
+    def close(self):
+        self.conn.close()
+
+    # Reads
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def exists(self, name):
+        return self.conn.execute("SELECT 1 FROM contacts WHERE name = ?", (name,)).fetchone() is not None
+
+    def get(self, name):
+        """Return the ContactRecord for name, or None"""
+        row = self.conn.execute("SELECT name, age, email, mobile FROM contacts WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        return ContactRecord(*row)
+
+    def get_many(self, names):
+        """Return {name: (age, email, mobile)} for the names that exist"""
+        found = {}
+        names = list(names)
+        for start in range(0, len(names), 500):  # Stay under SQLite's bound-parameter limit
+            chunk = names[start:start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for name, age, email, mobile in self.conn.execute(
+                    f"SELECT name, age, email, mobile FROM contacts WHERE name IN ({placeholders})", chunk):
+                found[name] = (age, email, mobile)
+        return found
+
+    def page(self, offset, limit):
+        """Rows (name, age, email, mobile) in display order"""
+        return self.conn.execute(
+            f"SELECT name, age, email, mobile FROM contacts {ORDER_BY} LIMIT ? OFFSET ?",
+            (limit, offset)
+        ).fetchall()
+
+    def page_after(self, after_name, limit):
+        """Rows following after_name in display order (None for the first page); cheap at any depth"""
+        if after_name is None:
+            return self.page(0, limit)
+        return self.conn.execute(
+            # The first term lets SQLite seek in the lower(name) index instead of scanning it
+            f"SELECT name, age, email, mobile FROM contacts WHERE lower(name) >= lower(?) "
+            f"AND (lower(name), name) > (lower(?), ?) {ORDER_BY} LIMIT ?",
+            (after_name, after_name, after_name, limit)
+        ).fetchall()
+
+    def page_before(self, before_name, limit):
+        """Rows just before before_name in display order (None for the last page); cheap at any depth"""
+        if before_name is None:
+            rows = self.conn.execute(
+                "SELECT name, age, email, mobile FROM contacts ORDER BY lower(name) DESC, name DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        else:
+            rows = self.conn.execute(
+                f"SELECT name, age, email, mobile FROM contacts WHERE lower(name) <= lower(?) "
+                f"AND (lower(name), name) < (lower(?), ?) ORDER BY lower(name) DESC, name DESC LIMIT ?",
+                (before_name, before_name, before_name, limit)
+            ).fetchall()
+        rows.reverse()
+        return rows
+
+    def names_with(self, email="", mobile=""):
+        """Names whose email or mobile is exactly as given; the normalized lookup is in contact_lookup"""
+        return [name for (name,) in self.conn.execute(
+            "SELECT name FROM contacts WHERE (mobile = ? AND mobile != '') OR (email = ? AND email != '')",
+            (mobile, email))]
+
+    def iter_rows(self, columns="name, age, email, mobile", batch_size=BATCH_SIZE, ordered=False):
+        """Stream every row without loading the whole book into memory; ordered gives display order"""
+        cursor = self.conn.execute(f"SELECT {columns} FROM contacts {ORDER_BY if ordered else ''}")
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
+    def search_like(self, term, offset=0, limit=50):
+        """Case-insensitive substring match on name, for use before an in-memory index exists"""
+        pattern = "%" + term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return self.conn.execute(
+            f"SELECT name, age, email, mobile FROM contacts WHERE lower(name) LIKE ? ESCAPE '\\' {ORDER_BY} LIMIT ? OFFSET ?",
+            (pattern, limit, offset)
+        ).fetchall()
+
+    # Writes
+
+    def create(self, name, age, email, mobile):
+        self.create_many([(name, age, email, mobile)])
+
+    def update(self, name, age, email, mobile):
+        self.update_many([(name, age, email, mobile)])
+
+    def delete(self, name):
+        self.delete_many([name])
+
+    def create_many(self, rows, batch_size=BATCH_SIZE, ignore_existing=False):
+        """Insert (name, age, email, mobile) rows, committing every batch_size rows.
+
+        With ignore_existing, rows whose name is already taken are skipped
+        instead of failing the batch. Returns the number of rows inserted.
+        """
+        verb = "INSERT OR IGNORE" if ignore_existing else "INSERT"
+        return self._write_batches(f"{verb} INTO contacts (name, age, email, mobile) VALUES (?, ?, ?, ?)", rows, batch_size)
+
+    def update_many(self, rows, batch_size=BATCH_SIZE):
+        """Update (name, age, email, mobile) rows, committing every batch_size rows"""
+        return self._write_batches("UPDATE contacts SET age = ?, email = ?, mobile = ? WHERE name = ?",
+                            ((age, email, mobile, name) for name, age, email, mobile in rows), batch_size)
+
+    def delete_many(self, names, batch_size=BATCH_SIZE):
+        return self._write_batches("DELETE FROM contacts WHERE name = ?", ((name,) for name in names), batch_size)
+
+    def _write_batches(self, sql, params, batch_size):
+        """Run sql for every parameter row in batch_size transactions; returns the rows changed"""
+        changed = 0
+        batch = []
+        for row in params:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                with self.conn:
+                    changed += self.conn.executemany(sql, batch).rowcount
+                batch = []
+        if batch:
+            with self.conn:
+                changed += self.conn.executemany(sql, batch).rowcount
+        return changed
\ No newline at end of file
@@ -0,0 +1,331 @@
+import argparse
+import json
+import os
+import uuid
+
+from contact_store import ContactStore, content_hash
+
+# A changes file is JSON lines: a header, then one entry per changed contact.
+#   {"type": "header", "peer": <sender id>, "since": <seq>, "seq": <seq>, "format": 1}
+#   {"type": "contact", "name": ..., "age": ..., "email": ..., "mobile": ..., "hash": ...}
+#   {"type": "deleted", "name": ...}
+FORMAT = 1
+BATCH_SIZE = 1000  # Entries applied per transaction
+MAX_TRACKED_CHANGES = 10000  # Beyond this many applied changes, callers reload rather than patch
+
+
+class SyncError(Exception):
+    pass
+
+
+class SyncResult:
+    def __init__(self, peer):
+        self.peer = peer
+        self.applied = 0  # Remote changes taken
+        self.unchanged = 0  # Both sides already agree
+        self.kept_local = 0  # Only this side changed; goes out in the next export
+        self.conflicts = 0  # Both sides changed differently; flagged, not overwritten
+        # (op, name, new row, old row) per applied change, op being 'add', 'update' or 'remove';
+        # None once there are too many to be worth replaying one by one
+        self.changes = []
+
+    def record(self, name, old, new):
+        if self.changes is None:
+            return
+        if len(self.changes) >= MAX_TRACKED_CHANGES:
+            self.changes = None
+            return
+        op = 'add' if old is None else 'remove' if new is None else 'update'
+        self.changes.append((op, name, new, old))
+
+    def summary(self):
+        text = f"Applied {self.applied} changes, {self.unchanged} already in step, {self.kept_local} newer here"
+        if self.conflicts:
+            text += f", {self.conflicts} conflicts to resolve"
+        return text
+
+
+def get_meta(store, key):
+    row = store.conn.execute("SELECT value FROM sync_meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def peer_id(store):
+    """This book's sync identity, created on first use"""
+    peer = get_meta(store, "peer_id")
+    if peer is None:
+        peer = uuid.uuid4().hex
+        with store.conn:
+            store.conn.execute("INSERT INTO sync_meta VALUES ('peer_id', ?)", (peer,))
+    return peer
+
+
+def peer_state(store, peer):
+    """(sent_seq, received_seq) for a peer; zeros for one never synced with"""
+    row = store.conn.execute("SELECT sent_seq, received_seq FROM sync_peers WHERE peer = ?", (peer,)).fetchone()
+    return row or (0, 0)
+
+
+def set_peer_state(store, peer, sent_seq=None, received_seq=None):
+    store.conn.execute("INSERT OR IGNORE INTO sync_peers (peer) VALUES (?)", (peer,))
+    if sent_seq is not None:
+        store.conn.execute("UPDATE sync_peers SET sent_seq = ? WHERE peer = ?", (sent_seq, peer))
+    if received_seq is not None:
+        store.conn.execute("UPDATE sync_peers SET received_seq = ? WHERE peer = ?", (received_seq, peer))
+
+
+def known_peers(store):
+    return [peer for (peer,) in store.conn.execute("SELECT peer FROM sync_peers ORDER BY peer")]
+
+
+# Sending
+
+def export_changes(store, path, peer=None):
+    """Write every change made since the last export to peer (all contacts if peer is None).
+
+    Reads only the changed rows through the change_seq indexes, so the cost
+    follows the number of changes, not the size of the book. What was sent
+    becomes the base for the next merge with peer. Returns the number of
+    entries written.
+    """
+    since = peer_state(store, peer)[0] if peer else 0
+    seq = get_meta(store, "change_seq")
+    temp_path = path + ".part"
+    written = 0
+    try:
+        with open(temp_path, "w", encoding="utf-8") as out:
+            header = {"type": "header", "peer": peer_id(store), "since": since, "seq": seq, "format": FORMAT}
+            out.write(json.dumps(header) + "\n")
+            for name, age, email, mobile, digest in store.conn.execute(
+                    "SELECT name, age, email, mobile, content_hash FROM contacts "
+                    "WHERE change_seq > ? AND change_seq <= ? ORDER BY change_seq", (since, seq)):
+                entry = {"type": "contact", "name": name, "age": age, "email": email, "mobile": mobile, "hash": digest}
+                out.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                written += 1
+            for (name,) in store.conn.execute(
+                    "SELECT name FROM tombstones WHERE change_seq > ? AND change_seq <= ? ORDER BY change_seq", (since, seq)):
+                out.write(json.dumps({"type": "deleted", "name": name}, ensure_ascii=False) + "\n")
+                written += 1
+        os.replace(temp_path, path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    if peer:
+        with store.conn:
+            set_peer_state(store, peer, sent_seq=seq)
+            # The peer takes what we sent unless it changed the contact too, in which case it
+            # flags a conflict against this same version; either way it is now the base
+            store.conn.execute(
+                "INSERT OR REPLACE INTO sync_snapshot SELECT ?, name, content_hash FROM contacts "
+                "WHERE change_seq > ? AND change_seq <= ?", (peer, since, seq))
+            store.conn.execute(
+                "DELETE FROM sync_snapshot WHERE peer = ? AND name IN "
+                "(SELECT name FROM tombstones WHERE change_seq > ? AND change_seq <= ?)", (peer, since, seq))
+    return written
+
+
+# Receiving
+
+def read_changes(path):
+    """Return (header, iterator of entries) for a changes file"""
+    handle = open(path, encoding="utf-8")
+    try:
+        header = json.loads(handle.readline() or "{}")
+    except ValueError:
+        header = {}
+    if header.get("type") != "header" or header.get("format") != FORMAT:
+        handle.close()
+        raise SyncError(f"{path} is not a contact changes file")
+
+    def entries():
+        with handle:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+    return header, entries()
+
+
+def entry_row(entry):
+    """(row, hash) for an entry, or (None, None) for a deletion; checks the sender's hash"""
+    if entry["type"] == "deleted":
+        return None, None
+    row = (entry["name"], int(entry["age"]), entry["email"], entry["mobile"])
+    digest = content_hash(*row)
+    if digest != entry.get("hash"):
+        raise SyncError(f"Contact '{entry['name']}' does not match its hash; the file is damaged")
+    return row, digest
+
+
+def local_hash(store, name):
+    row = store.conn.execute("SELECT content_hash FROM contacts WHERE name = ?", (name,)).fetchone()
+    return row[0] if row else None
+
+
+def base_hash(store, peer, name):
+    row = store.conn.execute("SELECT content_hash FROM sync_snapshot WHERE peer = ? AND name = ?", (peer, name)).fetchone()
+    return row[0] if row else None
+
+
+def set_base(store, peer, name, digest):
+    """Record what this book and peer last agreed on for name (None: both deleted it)"""
+    if digest is None:
+        store.conn.execute("DELETE FROM sync_snapshot WHERE peer = ? AND name = ?", (peer, name))
+    else:
+        store.conn.execute("INSERT OR REPLACE INTO sync_snapshot VALUES (?, ?, ?)", (peer, name, digest))
+    store.conn.execute("DELETE FROM sync_conflicts WHERE peer = ? AND name = ?", (peer, name))
+
+
+def write_row(store, name, row):
+    """Make the local book hold row for name, or not hold name at all if row is None"""
+    if row is None:
+        store.conn.execute("DELETE FROM contacts WHERE name = ?", (name,))
+    else:
+        store.conn.execute(
+            "INSERT INTO contacts (name, age, email, mobile) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET age = excluded.age, email = excluded.email, mobile = excluded.mobile", row)
+
+
+def merge_entry(store, peer, entry, result):
+    """Three-way merge of one remote entry against the local book and the last agreed snapshot"""
+    name = entry["name"]
+    row, remote = entry_row(entry)
+    local = local_hash(store, name)
+    base = base_hash(store, peer, name)
+
+    if remote == local:
+        set_base(store, peer, name, remote)
+        result.unchanged += 1
+    elif local == base:
+        old = store.conn.execute("SELECT name, age, email, mobile FROM contacts WHERE name = ?", (name,)).fetchone()
+        write_row(store, name, row)
+        set_base(store, peer, name, remote)
+        result.applied += 1
+        result.record(name, old, row)
+    elif remote == base:
+        result.kept_local += 1
+    else:
+        store.conn.execute("INSERT OR REPLACE INTO sync_conflicts VALUES (?, ?, ?)", (peer, name, json.dumps(entry)))
+        result.conflicts += 1
+
+
+def apply_changes(store, path, cancel=None):
+    """Merge a peer's changes file into the store and return a SyncResult.
+
+    Each entry is compared with the local contact and with the snapshot of
+    what both sides last agreed on: one-sided changes are taken or kept, and
+    changes made on both sides are recorded as conflicts instead of being
+    overwritten. A cancelled sync keeps the batches already committed; the
+    same file can be applied again.
+    """
+    header, entries = read_changes(path)
+    peer = header["peer"]
+    if peer == peer_id(store):
+        raise SyncError("This changes file was exported from this contact book")
+    received = peer_state(store, peer)[1]
+    if header["since"] > received:
+        raise SyncError(f"Changes {received + 1}-{header['since']} from this peer are missing; "
+                        f"ask for an export of all contacts")
+
+    result = SyncResult(peer)
+    done = True
+    count = 0
+    store.conn.execute("BEGIN")
+    try:
+        for count, entry in enumerate(entries, 1):
+            merge_entry(store, peer, entry, result)
+            if count % BATCH_SIZE == 0:
+                store.conn.commit()
+                if cancel is not None and cancel.is_set():
+                    done = False
+                    break
+                store.conn.execute("BEGIN")
+        if done:
+            set_peer_state(store, peer, received_seq=max(received, header["seq"]))
+            store.conn.commit()
+    except BaseException:
+        store.conn.rollback()
+        raise
+    return result
+
+
+# Conflicts
+
+def list_conflicts(store):
+    """[(peer, name, local row or None, remote row or None)]"""
+    conflicts = []
+    for peer, name, remote in store.conn.execute("SELECT peer, name, remote FROM sync_conflicts ORDER BY name"):
+        local = store.conn.execute("SELECT name, age, email, mobile FROM contacts WHERE name = ?", (name,)).fetchone()
+        conflicts.append((peer, name, local, entry_row(json.loads(remote))[0]))
+    return conflicts
+
+
+def resolve_conflict(store, peer, name, take_remote):
+    """Settle a conflict with the remote version, or keep the local one and send it on the next export.
+
+    Returns (old local row, new local row); either is None for no contact.
+    """
+    row = store.conn.execute("SELECT remote FROM sync_conflicts WHERE peer = ? AND name = ?", (peer, name)).fetchone()
+    if row is None:
+        raise SyncError(f"No conflict for '{name}'")
+    remote_row, remote = entry_row(json.loads(row[0]))
+    old = store.conn.execute("SELECT name, age, email, mobile FROM contacts WHERE name = ?", (name,)).fetchone()
+
+    with store.conn:
+        # Either way, the remote version becomes the base; keeping the local one then reads as a local change
+        set_base(store, peer, name, remote)
+        if take_remote:
+            write_row(store, name, remote_row)
+            return old, remote_row
+
+        # Re-stamp the local version so the next export carries it
+        store.conn.execute("UPDATE sync_meta SET value = value + 1 WHERE key = 'change_seq'")
+        seq = get_meta(store, "change_seq")
+        if old is None:
+            store.conn.execute("UPDATE tombstones SET change_seq = ? WHERE name = ?", (seq, name))
+        else:
+            store.conn.execute("UPDATE contacts SET change_seq = ? WHERE name = ?", (seq, name))
+    return old, old
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync contact books on different machines through changes files")
+    parser.add_argument("--db", default="contacts.db", help="contact database")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("id", help="print this book's peer id")
+    export = sub.add_parser("export", help="write changes for a peer")
+    export.add_argument("path")
+    export.add_argument("--peer", help="peer id to send to; omit to export every contact")
+    apply = sub.add_parser("apply", help="merge a peer's changes file")
+    apply.add_argument("path")
+    sub.add_parser("conflicts", help="list unresolved conflicts")
+    resolve = sub.add_parser("resolve", help="settle a conflict")
+    resolve.add_argument("name")
+    resolve.add_argument("--take", choices=["mine", "theirs"], required=True)
+
+    args = parser.parse_args()
+    store = ContactStore(args.db)
+    try:
+        if args.command == "id":
+            print(peer_id(store))
+        elif args.command == "export":
+            print(f"Wrote {export_changes(store, args.path, args.peer)} changes to {args.path}")
+        elif args.command == "apply":
+            print(apply_changes(store, args.path).summary())
+        elif args.command == "conflicts":
+            for peer, name, local, remote in list_conflicts(store):
+                print(f"{name}: here {local}, peer {peer[:8]} {remote}")
+        else:
+            for peer, name, _, _ in list_conflicts(store):
+                if name == args.name:
+                    resolve_conflict(store, peer, name, args.take == "theirs")
+                    print(f"Resolved '{name}' with {args.take}")
+    except SyncError as e:
+        print(f"Sync failed: {e}")
+    finally:
+        store.close()
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -1,7 +1,148 @@
 import os
+import queue
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog
 from tkinter.font import Font
+from file_manager_save import save_atomic, text_chunks
+from file_manager_scan import format_size, scan_batches
+from file_manager_sizes import FolderSizes
+from file_manager_viewer import LARGE_FILE, PagedFile
+from file_manager_watch import path_row, watch_directory
+
+
+class LargeFileViewer:
+    """Read-only window that pages through a file of any size.
+
+    The file is read a page at a time and only the lines on screen are decoded and put
+    in the Text widget, so opening a multi-gigabyte log is immediate; the line
+    index builds in the background and Go To Line works on what it has reached.
+    """
+
+    def __init__(self, app, path):
+        self.app = app
+        self.paged = PagedFile(path)
+        self.top_line = 0
+        self.total = 0
+        threading.Thread(target=self.paged.watch, daemon=True).start()
+
+        self.window = tk.Toplevel(app.root)
+        self.window.title(f"Content of {path}")
+        self.window.geometry("800x550")
+        self.window.configure(bg=app.primary_bg)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        toolbar = ttk.Frame(self.window, style='TFrame')
+        toolbar.pack(fill=tk.X, padx=5, pady=5)
+        ttk.Label(toolbar, text="Line:").pack(side=tk.LEFT)
+        self.line_entry = ttk.Entry(toolbar, width=12)
+        self.line_entry.pack(side=tk.LEFT, padx=5)
+        self.line_entry.bind('<Return>', self.go_to_line)
+        ttk.Button(toolbar, text="Go", command=self.go_to_line, style='Primary.TButton').pack(side=tk.LEFT)
+        self.follow_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(toolbar, text="Follow end of file", variable=self.follow_var, command=self.on_follow).pack(side=tk.LEFT, padx=15)
+        self.info_var = tk.StringVar()
+        ttk.Label(toolbar, textvariable=self.info_var).pack(side=tk.RIGHT)
+
+        frame = ttk.Frame(self.window, style='TFrame')
+        frame.pack(fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self.on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        xscroll = ttk.Scrollbar(frame, orient=tk.HORIZONTAL)
+        xscroll.pack(side=tk.BOTTOM, fill=tk.X)
+        self.text_font = Font(family='Consolas', size=10)  # Kept referenced, or Tk drops the font
+        self.line_height = self.text_font.metrics('linespace')
+        self.text = tk.Text(frame, wrap=tk.NONE, font=self.text_font, xscrollcommand=xscroll.set)
+        self.text.pack(fill=tk.BOTH, expand=True)
+        xscroll.config(command=self.text.xview)
+
+        # The Text only ever holds one screenful, so scrolling is done here, not by the widget
+        self.text.bind('<MouseWheel>', lambda e: self.scroll_by(-3 if e.delta > 0 else 3))
+        self.text.bind('<Button-4>', lambda e: self.scroll_by(-3))
+        self.text.bind('<Button-5>', lambda e: self.scroll_by(3))
+        self.text.bind('<Up>', lambda e: self.scroll_by(-1))
+        self.text.bind('<Down>', lambda e: self.scroll_by(1))
+        self.text.bind('<Prior>', lambda e: self.scroll_by(-self.page_size()))
+        self.text.bind('<Next>', lambda e: self.scroll_by(self.page_size()))
+        self.text.bind('<Home>', lambda e: self.show(0))
+        self.text.bind('<End>', lambda e: self.show(self.total))
+        self.text.bind('<Configure>', lambda e: self.render())
+
+        self.poll()
+
+    def page_size(self):
+        return max(1, self.text.winfo_height() // self.line_height)
+
+    def show(self, line):
+        self.top_line = max(0, min(line, self.total - self.page_size()))
+        self.render()
+        return 'break'
+
+    def scroll_by(self, lines):
+        if lines < 0:
+            self.follow_var.set(False)
+        return self.show(self.top_line + lines)
+
+    def on_scroll(self, *args):
+        if args[0] == 'moveto':
+            self.follow_var.set(False)
+            self.show(int(float(args[1]) * self.scroll_total()))
+        elif args[0] == 'scroll':
+            step = self.page_size() if args[2] == 'pages' else 1
+            self.scroll_by(int(args[1]) * step)
+
+    def scroll_total(self):
+        return max(self.total, self.paged.estimated_lines() or 0, 1)
+
+    def render(self):
+        lines = self.paged.read_lines(self.top_line, self.page_size())
+        width = len(str(self.top_line + len(lines)))
+        self.text.config(state=tk.NORMAL)
+        self.text.delete(1.0, tk.END)
+        self.text.insert(tk.END, "\n".join(f"{self.top_line + i + 1:>{width}}  {line}" for i, line in enumerate(lines)))
+        self.text.config(state=tk.DISABLED)
+        total = self.scroll_total()
+        self.scrollbar.set(self.top_line / total, min(1.0, (self.top_line + len(lines)) / total))
+
+    def go_to_line(self, event=None):
+        try:
+            line = int(self.line_entry.get()) - 1
+        except ValueError:
+            messagebox.showwarning("Input Error", "Please enter a line number", parent=self.window)
+            return
+        self.follow_var.set(False)
+        if line >= self.total and self.paged.indexing:
+            self.info_var.set(f"Only {self.total:,} lines indexed so far")
+        self.show(line)
+
+    def on_follow(self):
+        if self.follow_var.get():
+            self.show(self.total)
+
+    def poll(self):
+        """Pick up index progress and file growth"""
+        if self.paged.closed.is_set():
+            return
+        total = self.paged.line_count()
+        if total != self.total:
+            self.total = total
+            if self.follow_var.get():
+                self.show(total)
+            elif self.top_line + self.page_size() > total or self.text.compare('end-1c', '==', '1.0'):
+                self.show(self.top_line)  # Truncated, or lines reached the part on screen
+            else:
+                self.render()
+        size_mb = self.paged.size / 1024 / 1024
+        if self.paged.indexing:
+            self.info_var.set(f"{size_mb:,.1f} MB, indexing... {self.total:,} lines")
+        else:
+            self.info_var.set(f"{size_mb:,.1f} MB, {self.total:,} lines")
+        self.window.after(250, self.poll)
+
+    def close(self):
+        self.paged.close()
+        self.window.destroy()
 
 
 class FileManagerApp:
@@ -22,6 +163,21 @@ class FileManagerApp:
         # Configure root window background
         self.root.configure(bg=self.primary_bg)
 
+        # Folder shown in the View Files tab, and the cancel token of the scan filling it
+        self.current_dir = os.getcwd()
+        self.scan = None
+
+        # Recursive folder sizes; the sizer keeps its cache across refreshes
+        self.folder_sizes = FolderSizes()
+        self.sizing = None
+        self.sizing_backlog = []  # New folders seen while a size walk was running
+
+        # Live updates of the listed folder, and what the list holds
+        self.watcher = None
+        self.listed = 0
+        self.next_number = 1
+        self.empty_item = None
+
         # Custom font setup
         self.title_font = Font(family="Segoe UI", size=18, weight="bold")
         self.label_font = Font(family="Segoe UI", size=12)
@@ -110,6 +266,14 @@ class FileManagerApp:
         tab = ttk.Frame(self.notebook, style='TFrame')
         self.notebook.add(tab, text="View Files")
 
+        # Location bar
+        path_frame = ttk.Frame(tab, style='TFrame')
+        path_frame.pack(padx=10, pady=(10, 0), fill=tk.X)
+        ttk.Button(path_frame, text="⬆ Up", command=self.go_up, style='Primary.TButton').pack(side=tk.LEFT)
+        ttk.Button(path_frame, text="Open Folder...", command=self.browse_folder, style='Primary.TButton').pack(side=tk.RIGHT)
+        self.path_var = tk.StringVar(value=self.current_dir)
+        ttk.Label(path_frame, textvariable=self.path_var, anchor=tk.W).pack(side=tk.LEFT, padx=10, fill=tk.X, expand=True)
+
         # Treeview frame
         tree_frame = ttk.Frame(tab, style='TFrame')
         tree_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
@@ -133,6 +297,7 @@ class FileManagerApp:
         scrollbar = ttk.Scrollbar(tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.tree.configure(yscrollcommand=scrollbar.set)
+        self.tree.bind('<Double-1>', self.open_selected)
 
         # Refresh button
         refresh_btn = ttk.Button(tab, text="Refresh List", command=self.view_all_files, style='Primary.TButton')
@@ -176,9 +341,13 @@ class FileManagerApp:
         form_frame.columnconfigure(1, weight=1)
         form_frame.rowconfigure(1, weight=1)
 
+    def resolve_path(self, filename):
+        """A typed name is relative to the folder shown in View Files, not to where the app was started"""
+        return os.path.join(self.current_dir, os.path.expanduser(filename))
+
     def browse_file(self, entry_widget=None):
         """Open file dialog to select a file"""
-        filename = filedialog.askopenfilename()
+        filename = filedialog.askopenfilename(initialdir=self.current_dir)
         if filename:
             if entry_widget:
                 entry_widget.delete(0, tk.END)
@@ -194,36 +363,239 @@ class FileManagerApp:
             messagebox.showwarning("Input Error", "Please enter a file name", parent=self.root)
             return
 
+        path = self.resolve_path(filename)
         try:
-            with open(filename, 'x') as f:
+            with open(path, 'x') as f:
                 self.status_var.set(f"File '{filename}' created successfully")
-                messagebox.showinfo("Success", f"File '{filename}' created successfully", parent=self.root)
-                self.view_all_files()
+            self.show_file_change(path)
+            messagebox.showinfo("Success", f"File '{filename}' created successfully", parent=self.root)
         except FileExistsError:
             messagebox.showwarning("Error", f"File '{filename}' already exists", parent=self.root)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to create file: {str(e)}", parent=self.root)
 
+    def navigate(self, path):
+        """Show another folder, abandoning any scan still filling the list"""
+        self.current_dir = os.path.abspath(path)
+        self.path_var.set(self.current_dir)
+        self.view_all_files()
+
+    def go_up(self):
+        self.navigate(os.path.dirname(self.current_dir))
+
+    def browse_folder(self):
+        path = filedialog.askdirectory(parent=self.root, initialdir=self.current_dir)
+        if path:
+            self.navigate(path)
+
+    def open_selected(self, event=None):
+        """Double-click: enter a folder, or pick a file for the File Operations and Edit File tabs"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        name = self.tree.set(selection[0], 'Name')
+        if self.tree.set(selection[0], 'Type') == "Folder":
+            self.navigate(os.path.join(self.current_dir, name))
+        elif self.tree.set(selection[0], 'Type') == "File":
+            for entry in (self.filename_entry, self.edit_filename_entry):
+                entry.delete(0, tk.END)
+                entry.insert(0, name)
+            self.status_var.set(f"Selected '{name}'")
+
     def view_all_files(self):
-        """Display all files in the directory"""
-        # Clear current items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        files = os.listdir()
-        if not files:
-            self.tree.insert('', 'end', text="1", values=("No files found", "", ""))
+        """Display all files in the current folder.
+
+        The folder is listed with os.scandir on a worker thread and the rows
+        arrive in batches, so huge or slow (network) folders start showing at
+        once and never block the window. Starting another listing cancels this one.
+        """
+        for token in (self.scan, self.sizing):
+            if token is not None:
+                token.set()
+        self.sizing = None
+        self.sizing_backlog = []
+        self.scan = threading.Event()
+        batches = queue.Queue()
+        threading.Thread(target=self.scan_folder, args=(self.current_dir, self.scan, batches), daemon=True).start()
+        self.start_watching()
+
+        self.tree.delete(*self.tree.get_children())
+        self.empty_item = None
+        self.status_var.set(f"Listing {self.current_dir}...")
+        self.root.after(50, self.poll_scan, self.scan, batches, 0, [])
+
+    @staticmethod
+    def scan_folder(path, cancel, batches):
+        """Runs on a worker thread; posts ('rows', rows), then ('done', None) or ('error', message)"""
+        try:
+            for rows in scan_batches(path, cancel):
+                batches.put(('rows', rows))
+            batches.put(('done', None))
+        except OSError as e:
+            batches.put(('error', str(e)))
+
+    def poll_scan(self, cancel, batches, shown, folders):
+        """Insert the rows that have arrived, a slice of time per tick so the window stays responsive"""
+        if cancel is not self.scan:
+            return  # Superseded by a newer listing
+
+        deadline = time.perf_counter() + 0.03
+        message = None
+        while time.perf_counter() < deadline:
+            try:
+                kind, payload = batches.get_nowait()
+            except queue.Empty:
+                break
+            if kind != 'rows':
+                message = (kind, payload)
+                break
+            for name, size, file_type in payload:
+                shown += 1
+                if file_type == "Folder":
+                    folders.append(name)
+                    size_text = "…"  # Filled in by the size walk
+                else:
+                    size_text = format_size(size)
+                self.tree.insert('', 'end', iid=name, text=str(shown), values=(name, size_text, file_type))
+
+        if message is None:
+            self.status_var.set(f"Listing {self.current_dir}... {shown} so far")
+            self.root.after(50, self.poll_scan, cancel, batches, shown, folders)
             return
 
-        for i, file in enumerate(files, 1):
+        self.scan = None
+        self.listed = shown
+        self.next_number = shown + 1
+        if message[0] == 'error':
+            self.status_var.set(f"Cannot list {self.current_dir}: {message[1]}")
+            messagebox.showerror("Error", f"Failed to list folder: {message[1]}", parent=self.root)
+        elif shown == 0:
+            self.empty_item = self.tree.insert('', 'end', text="1", values=("No files found", "", ""))
+            self.status_var.set("Displaying 0 files")
+        else:
+            self.status_var.set(f"Displaying {shown} files")
+        if folders and message[0] == 'done':
+            self.start_folder_sizes(folders)
+
+    def start_folder_sizes(self, folders):
+        """Work out the listed folders' recursive sizes in the background, filling in each as it finishes"""
+        self.sizing = threading.Event()
+        sizes = queue.Queue()
+        roots = [os.path.join(self.current_dir, name) for name in folders]
+        threading.Thread(target=self.size_folders, args=(roots, self.sizing, sizes), daemon=True).start()
+        self.root.after(100, self.poll_sizes, self.sizing, sizes, len(roots), 0)
+
+    def size_folders(self, roots, cancel, sizes):
+        """Runs on a worker thread, which drives the sizer's thread pool"""
+        self.folder_sizes.sizes(roots, lambda root, total: sizes.put((os.path.basename(root), total)), cancel)
+        sizes.put(None)
+
+    def poll_sizes(self, cancel, sizes, total, done):
+        if cancel is not self.sizing:
+            return  # The list was refreshed or left
+        finished = False
+        try:
+            while True:
+                result = sizes.get_nowait()
+                if result is None:
+                    finished = True
+                    break
+                name, size = result
+                done += 1
+                if self.tree.exists(name):
+                    self.tree.set(name, 'Size', format_size(size))
+        except queue.Empty:
+            pass
+
+        if finished:
+            self.sizing = None
+            self.status_var.set(f"Displaying {self.listed} files; folder sizes complete")
+            if self.sizing_backlog:
+                backlog, self.sizing_backlog = self.sizing_backlog, []
+                self.start_folder_sizes(backlog)
+        else:
+            self.status_var.set(f"Working out folder sizes... {done} of {total}")
+            self.root.after(100, self.poll_sizes, cancel, sizes, total, done)
+
+    def start_watching(self):
+        """Follow the listed folder's changes instead of rescanning it"""
+        if self.watcher is not None:
+            self.watcher.stop()
+        changes = queue.Queue()
+        try:
+            self.watcher = watch_directory(self.current_dir, changes)
+        except OSError:
+            self.watcher = None  # The listing reports why the folder can't be read
+            return
+        self.root.after(250, self.poll_watch, self.watcher, changes)
+
+    def poll_watch(self, watcher, changes):
+        """Apply the watcher's coalesced changes to the rows, once the listing they update is complete"""
+        if watcher is not self.watcher:
+            return  # Another folder is shown now
+        if self.scan is None:
+            rescan = False
             try:
-                size = os.path.getsize(file) / 1024  # Size in KB
-                file_type = "Folder" if os.path.isdir(file) else "File"
-                self.tree.insert('', 'end', text=str(i), values=(file, f"{size:.2f}", file_type))
-            except:
-                self.tree.insert('', 'end', text=str(i), values=(file, "N/A", "Unknown"))
+                while True:
+                    kind, rows, removed = changes.get_nowait()
+                    if kind == 'rescan':
+                        rescan = True
+                        break
+                    self.apply_folder_changes(rows, removed)
+            except queue.Empty:
+                pass
+            if rescan:
+                self.view_all_files()
+                return
+        self.root.after(250, self.poll_watch, watcher, changes)
 
-        self.status_var.set(f"Displaying {len(files)} files")
+    def show_file_change(self, path):
+        """Without a watcher to report it, show a file this app just created or deleted"""
+        if self.watcher is not None:
+            return
+        if self.scan is not None:
+            self.view_all_files()  # The listing in progress may or may not include it
+            return
+        directory, name = os.path.split(os.path.normpath(path))
+        if os.path.normcase(directory) == os.path.normcase(self.current_dir):
+            row = path_row(directory, name)
+            self.apply_folder_changes([row] if row else [], [] if row else [name])
+
+    def apply_folder_changes(self, rows, removed):
+        """Update, add and remove single rows for the entries that changed"""
+        for name in removed:
+            if self.tree.exists(name):
+                self.tree.delete(name)
+                self.listed -= 1
+
+        new_folders = []
+        for name, size, file_type in rows:
+            if self.tree.exists(name):
+                if file_type != "Folder":
+                    self.tree.item(name, values=(name, format_size(size), file_type))
+                elif self.tree.set(name, 'Type') != "Folder":
+                    self.tree.item(name, values=(name, "…", file_type))
+                    new_folders.append(name)
+                continue
+            if self.empty_item is not None:
+                self.tree.delete(self.empty_item)
+                self.empty_item = None
+            size_text = "…" if file_type == "Folder" else format_size(size)
+            self.tree.insert('', 'end', iid=name, text=str(self.next_number), values=(name, size_text, file_type))
+            self.next_number += 1
+            self.listed += 1
+            if file_type == "Folder":
+                new_folders.append(name)
+
+        if self.listed == 0 and self.empty_item is None:
+            self.empty_item = self.tree.insert('', 'end', text="1", values=("No files found", "", ""))
+        if new_folders:
+            if self.sizing is None:
+                self.start_folder_sizes(new_folders)
+            else:
+                self.sizing_backlog.extend(new_folders)
+        if self.sizing is None:
+            self.status_var.set(f"Displaying {self.listed} files")
 
     def delete_file(self):
         """Delete a file"""
@@ -232,7 +604,8 @@ class FileManagerApp:
             messagebox.showwarning("Input Error", "Please enter a file name", parent=self.root)
             return
 
-        if not os.path.exists(filename):
+        path = self.resolve_path(filename)
+        if not os.path.exists(path):
             messagebox.showwarning("Error", f"File '{filename}' not found", parent=self.root)
             return
 
@@ -240,10 +613,10 @@ class FileManagerApp:
             return
 
         try:
-            os.remove(filename)
+            os.remove(path)
             self.status_var.set(f"File '{filename}' deleted successfully")
+            self.show_file_change(path)
             messagebox.showinfo("Success", f"File '{filename}' deleted successfully", parent=self.root)
-            self.view_all_files()
         except Exception as e:
             messagebox.showerror("Error", f"Failed to delete file: {str(e)}", parent=self.root)
 
@@ -254,12 +627,18 @@ class FileManagerApp:
             messagebox.showwarning("Input Error", "Please enter a file name", parent=self.root)
             return
 
-        if not os.path.exists(filename):
+        path = self.resolve_path(filename)
+        if not os.path.exists(path):
             messagebox.showwarning("Error", f"File '{filename}' not found", parent=self.root)
             return
 
         try:
-            with open(filename, 'r') as f:
+            if os.path.getsize(path) > LARGE_FILE:
+                LargeFileViewer(self, path)
+                self.status_var.set(f"Displaying content of '{filename}'")
+                return
+
+            with open(path, 'r') as f:
                 content = f.read()
                 # Create a new window to display content
                 content_window = tk.Toplevel(self.root)
@@ -282,12 +661,18 @@ class FileManagerApp:
             messagebox.showwarning("Input Error", "Please enter a file name", parent=self.root)
             return
 
-        if not os.path.exists(filename):
+        path = self.resolve_path(filename)
+        if not os.path.exists(path):
             messagebox.showwarning("Error", f"File '{filename}' not found", parent=self.root)
             return
 
         try:
-            with open(filename, 'r') as f:
+            if os.path.getsize(path) > LARGE_FILE:
+                if messagebox.askyesno("Large File", f"'{filename}' is too large to edit here. Open it read-only instead?", parent=self.root):
+                    LargeFileViewer(self, path)
+                return
+
+            with open(path, 'r') as f:
                 content = f.read()
                 self.content_editor.delete(1.0, tk.END)
                 self.content_editor.insert(tk.END, content)
@@ -302,13 +687,11 @@ class FileManagerApp:
             messagebox.showwarning("Input Error", "Please enter a file name", parent=self.root)
             return
 
-        content = self.content_editor.get(1.0, tk.END)
-
         try:
-            with open(filename, 'w') as f:
-                f.write(content)
-                self.status_var.set(f"Changes to '{filename}' saved successfully")
-                messagebox.showinfo("Success", f"Changes to '{filename}' saved successfully", parent=self.root)
+            # Written beside the original and swapped in, so a failed save leaves the old file intact
+            save_atomic(self.resolve_path(filename), text_chunks(self.content_editor))
+            self.status_var.set(f"Changes to '{filename}' saved successfully")
+            messagebox.showinfo("Success", f"Changes to '{filename}' saved successfully", parent=self.root)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to save file: {str(e)}", parent=self.root)
 
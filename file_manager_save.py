@@ -0,0 +1,99 @@
+import os
+import stat
+import tempfile
+import threading
+
+CHUNK_LINES = 10000  # Editor lines fetched and written at a time
+
+_umask = None
+_umask_lock = threading.Lock()
+
+
+def current_umask():
+    """The process umask, which new files get their permissions from.
+
+    Linux reports it in /proc/self/status. Elsewhere the only way is to set
+    it and put it back, which briefly exposes other threads to a umask of 0,
+    so that is done once, on first use rather than at import, and cached.
+    """
+    global _umask
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except OSError:
+        pass
+    with _umask_lock:
+        if _umask is None:
+            _umask = os.umask(0o077)  # Restrictive while swapped, so a racing thread errs towards private files
+            os.umask(_umask)
+        return _umask
+
+
+def text_chunks(text, lines_per_chunk=CHUNK_LINES):
+    """Yield a Tk Text widget's content a block of lines at a time, without
+    the trailing newline Tk always adds, so the whole document is never copied at once"""
+    last = int(text.index('end-1c').split('.')[0])
+    for first in range(1, last + 1, lines_per_chunk):
+        stop = first + lines_per_chunk
+        yield text.get(f"{first}.0", f"{stop}.0" if stop <= last else 'end-1c')
+
+
+def _fsync_directory(directory):
+    """Make the rename itself durable; not possible (or needed) on Windows"""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def save_atomic(path, chunks, encoding=None):
+    """Write the text chunks to path so that it holds either the old or the new content, never a mix.
+
+    The chunks go to a temporary file in the same directory, which is synced
+    to disk and then renamed over path, taking the original's permissions
+    (and owner, where allowed). A symlink is followed, so the link survives.
+    Returns the number of characters written.
+    """
+    path = os.path.realpath(path)
+    directory = os.path.dirname(path)
+    try:
+        original = os.stat(path)
+    except FileNotFoundError:
+        original = None
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    written = 0
+    try:
+        with open(fd, 'w', encoding=encoding) as f:
+            for chunk in chunks:
+                written += f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+
+        if original is not None:
+            os.chmod(temp_path, stat.S_IMODE(original.st_mode))
+            if hasattr(os, 'chown'):
+                try:
+                    os.chown(temp_path, original.st_uid, original.st_gid)
+                except PermissionError:
+                    pass  # Only root may give a file away; it keeps our ownership
+        else:
+            # New files get the usual permissions; mkstemp alone would make them owner-only
+            os.chmod(temp_path, 0o666 & ~current_umask())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+    return written
\ No newline at end of file
@@ -0,0 +1,95 @@
+import argparse
+import os
+import shutil
+import tempfile
+import time
+import tkinter as tk
+import tracemalloc
+
+from file_manager_save import save_atomic, text_chunks
+
+LINE = "2026-10-18 12:00:00 INFO worker processed request id={} status=ok\n"
+
+
+class LinesDocument:
+    """Stand-in for a Tk Text widget without a display: just enough of index() and get()"""
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def _position(self, index):
+        if index in ('end', 'end-1c'):
+            return len(self.lines), 0
+        line, column = index.split('.')
+        return int(line) - 1, int(column)
+
+    def index(self, index):
+        return f"{len(self.lines) + 1}.0"  # Only ever asked for 'end-1c'; the document ends with a newline
+
+    def get(self, start, end):
+        first = self._position(start)[0]
+        last = self._position(end)[0]
+        text = "".join(self.lines[first:last])
+        return text if end != 'end' else text + "\n"
+
+
+def make_document(megabytes):
+    """A real Text widget in a hidden window, or a LinesDocument without a display"""
+    count = megabytes * 1024 * 1024 // len(LINE.format(0))
+    lines = [LINE.format(i) for i in range(count)]
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No Tk display ({e}); using an in-memory stand-in for the editor")
+        return None, LinesDocument(lines)
+    root.withdraw()
+    text = tk.Text(root)
+    text.insert('end', "".join(lines))
+    return root, text
+
+
+def save_whole(path, text):
+    """The old save_file: copy the whole editor into one string and write it over the target"""
+    content = text.get('1.0', 'end')
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def save_chunked(path, text):
+    save_atomic(path, text_chunks(text))
+
+
+def measure(save, path, text):
+    """(peak bytes allocated while saving, seconds)"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    save(path, text)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare peak memory of saving a large document whole and in chunks")
+    parser.add_argument("--size", type=int, default=100, help="document size in MB")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    root, text = make_document(args.size)
+    workdir = tempfile.mkdtemp(prefix="file_manager_save_")
+    path = os.path.join(workdir, "document.txt")
+    try:
+        for label, save in (("whole-buffer write", save_whole), ("atomic chunked save", save_chunked)):
+            results = [measure(save, path, text) for _ in range(args.repeat)]
+            peak = max(peak for peak, _ in results)
+            best = min(elapsed for _, elapsed in results)
+            print(f"{label:>20}: peak {peak / 1e6:7.1f} MB, {best:.2f}s for {os.path.getsize(path) / 1e6:.0f} MB")
+    finally:
+        shutil.rmtree(workdir)
+        if root:
+            root.destroy()
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
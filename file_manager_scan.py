@@ -0,0 +1,42 @@
+import os
+
+BATCH_SIZE = 500  # Entries handed to the Tk thread at a time
+
+
+def entry_row(entry):
+    """(name, size in bytes or None, type) for a DirEntry.
+
+    is_dir() comes from the directory listing itself on most filesystems, so
+    folders cost no stat call at all and files cost one (none on Windows,
+    where the listing carries the size too).
+    """
+    try:
+        if entry.is_dir():
+            return (entry.name, None, "Folder")
+        return (entry.name, entry.stat().st_size, "File")
+    except OSError:  # Vanished or unreadable since it was listed
+        return (entry.name, None, "Unknown")
+
+
+def scan_batches(path, cancel=None, batch_size=BATCH_SIZE):
+    """Yield lists of entry_row tuples for path, batch_size at a time.
+
+    The first batch is ready after batch_size entries rather than after the
+    whole directory, and setting cancel stops the listing between entries.
+    """
+    batch = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if cancel is not None and cancel.is_set():
+                return
+            batch.append(entry_row(entry))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def format_size(size):
+    """Size column text: kilobytes, or N/A when unknown"""
+    return "N/A" if size is None else f"{size / 1024:.2f}"
\ No newline at end of file
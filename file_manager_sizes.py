@@ -0,0 +1,118 @@
+import argparse
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+WORKERS = 8  # Directory listings in flight; stat and scandir release the GIL
+
+
+class FolderSizes:
+    """Recursive folder sizes from a parallel tree walk, with a per-directory cache.
+
+    Each directory's listing is cached as (bytes of its files, its subfolders)
+    under its (inode, mtime). Adding, removing or renaming an entry changes a
+    directory's mtime, so a re-scan stats every directory but only lists the
+    ones that changed. Files rewritten in place don't touch their folder's
+    mtime; refresh() forgets the cache when exact sizes matter.
+    """
+
+    def __init__(self, workers=WORKERS):
+        self.workers = workers
+        self.cache = {}  # path -> ((inode, mtime), file bytes, subfolder paths)
+        self.errors = 0
+
+    def refresh(self):
+        self.cache.clear()
+
+    def scan_dir(self, path):
+        """(bytes of the files directly in path, paths of its subfolders)"""
+        try:
+            st = os.stat(path, follow_symlinks=False)
+            key = (st.st_ino, st.st_mtime_ns)
+            cached = self.cache.get(path)
+            if cached is not None and cached[0] == key:
+                return cached[1], cached[2]
+
+            total = 0
+            subdirs = []
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        # Symlinked folders are not followed, so loops and double counting can't happen
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        else:
+                            total += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        self.errors += 1
+        except OSError:  # Unreadable folder: counts as empty, and is retried next time
+            self.errors += 1
+            return 0, ()
+        subdirs = tuple(subdirs)
+        self.cache[path] = (key, total, subdirs)
+        return total, subdirs
+
+    def sizes(self, roots, on_size=None, cancel=None):
+        """Return {root: total bytes} for folders roots, walking all of them at once.
+
+        on_size(root, total) is called from this thread as soon as each root's
+        whole subtree is counted, so small folders report before big ones
+        finish. If cancel is set, the walk stops and unfinished roots are left out.
+        """
+        totals = {}
+        pending = {}  # root -> directories of its subtree still being listed
+        results = {}
+        running = {}  # future -> root it counts towards
+
+        with ThreadPoolExecutor(self.workers) as pool:
+            def submit(path, root):
+                pending[root] += 1
+                running[pool.submit(self.scan_dir, path)] = root
+
+            for root in roots:
+                totals[root] = 0
+                pending[root] = 0
+                submit(root, root)
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                if cancel is not None and cancel.is_set():
+                    for future in running:
+                        future.cancel()
+                    break
+                for future in done:
+                    root = running.pop(future)
+                    size, subdirs = future.result()
+                    totals[root] += size
+                    for subdir in subdirs:
+                        submit(subdir, root)
+                    pending[root] -= 1
+                    if pending[root] == 0:
+                        results[root] = totals[root]
+                        if on_size is not None:
+                            on_size(root, totals[root])
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recursive sizes of the folders in a folder, then a cached re-scan")
+    parser.add_argument("path", nargs="?", default=".")
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    args = parser.parse_args()
+
+    with os.scandir(args.path) as entries:
+        roots = sorted(entry.path for entry in entries if entry.is_dir(follow_symlinks=False))
+    sizer = FolderSizes(args.workers)
+    for label in ("first scan", "re-scan"):
+        started = time.perf_counter()
+        results = sizer.sizes(roots)
+        elapsed = time.perf_counter() - started
+        print(f"{label}: {len(sizer.cache)} folders in {elapsed:.2f}s")
+    for root in sorted(results, key=results.get, reverse=True):
+        print(f"{results[root] / 1024 / 1024:12.1f} MB  {os.path.basename(root)}")
+    if sizer.errors:
+        print(f"{sizer.errors} entries could not be read")
+
+
+if __name__ == '__main__':
+    main()
\ No newline at end of file
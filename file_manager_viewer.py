@@ -0,0 +1,162 @@
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+BLOCK = 1 << 16  # Bytes per index entry
+INDEX_STEP = 1 << 24  # Bytes counted per lock hold, so rendering never waits long
+READ_CHUNK = 8192  # Bytes read at a time while looking for the end of a line
+MAX_LINE = 4096  # Characters of a line shown; Tk slows to a crawl on very long lines
+LARGE_FILE = 4 * 1024 * 1024  # Files bigger than this open in the paged viewer
+
+
+class LineIndex:
+    """Sparse line index: the number of newlines before each 64 KB block.
+
+    Built with bytes.count, so it runs at memory speed and takes 8 bytes per
+    block (about 650 KB for a 5 GB file). A line's offset is found by
+    bisecting to its block and reading that one block.
+    """
+
+    def __init__(self):
+        self.block_lines = array("Q", [0])
+        self.indexed = 0  # Bytes counted so far
+        self.lines = 0  # Newlines in the counted bytes
+
+    def extend(self, read, end):
+        """Count up to end, reading with read(pos, length); stops early if the file got shorter"""
+        pos = self.indexed
+        while pos < end:
+            data = read(pos, min((pos // BLOCK + 1) * BLOCK, end) - pos)
+            if not data:
+                break
+            self.lines += data.count(b"\n")
+            pos += len(data)
+            if pos % BLOCK == 0:
+                self.block_lines.append(self.lines)
+        self.indexed = pos
+
+    def offset(self, read, line):
+        """Byte offset where 0-based line starts; line must not exceed self.lines"""
+        if line <= 0:
+            return 0
+        block = bisect_left(self.block_lines, line) - 1
+        data = read(block * BLOCK, BLOCK)
+        pos = 0
+        for _ in range(line - self.block_lines[block]):
+            pos = data.find(b"\n", pos) + 1
+        return block * BLOCK + pos
+
+
+class PagedFile:
+    """A file read a page at a time, with a line index built on a background thread.
+
+    Only the pages that are displayed or indexed are read in, so the file can
+    be far larger than RAM. Reads go through the file descriptor rather than
+    a memory map: touching a mapped page after another process truncates the
+    file (log rotation with copytruncate) kills the process with SIGBUS,
+    while a read just comes back short. Every access first checks the size,
+    and the watcher thread keeps the index in step as the file grows or is
+    truncated, which is what tail-follow relies on.
+    """
+
+    def __init__(self, path, encoding="utf-8"):
+        self.path = path
+        self.encoding = encoding
+        self.file = open(path, "rb")
+        self.size = 0
+        self.index = LineIndex()
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+        self.check_size()
+
+    def _read(self, pos, length):
+        self.file.seek(pos)
+        return self.file.read(length)
+
+    def check_size(self):
+        """Pick up a size change; a file that got shorter is indexed again from the start.
+        Call with the lock held (or before the watcher starts). Returns True if the size changed."""
+        size = os.fstat(self.file.fileno()).st_size
+        if size == self.size:
+            return False
+        if size < self.size or size < self.index.indexed:  # Truncated or rotated: start again
+            self.index = LineIndex()
+        self.size = size
+        return True
+
+    def catch_up(self, max_bytes=INDEX_STEP):
+        """Index up to max_bytes more; returns True once the index covers the whole file"""
+        with self.lock:
+            if self.closed.is_set():
+                return True
+            self.check_size()
+            if self.index.indexed < self.size:
+                self.index.extend(self._read, min(self.index.indexed + max_bytes, self.size))
+            return self.index.indexed >= self.size
+
+    def watch(self, interval=0.5):
+        """Index the file, then keep checking it for growth until close(). Run on a thread."""
+        while not self.closed.is_set():
+            if self.catch_up():
+                time.sleep(interval)
+
+    def close(self):
+        self.closed.set()
+        with self.lock:
+            self.file.close()
+
+    @property
+    def indexing(self):
+        return self.index.indexed < self.size
+
+    def line_count(self):
+        """Lines indexed so far, counting a last line with no newline once indexing is done"""
+        with self.lock:
+            if self.closed.is_set():
+                return 0
+            self.check_size()
+            count = self.index.lines
+            if self.size and not self.indexing and self._read(self.size - 1, 1) not in (b"\n", b""):
+                count += 1
+            return count
+
+    def estimated_lines(self):
+        """Total lines, extrapolated from the part indexed so far while the index is still building"""
+        with self.lock:
+            if not self.indexing or not self.index.indexed:
+                return None
+            return int(self.index.lines * self.size / self.index.indexed)
+
+    def _read_line(self, pos):
+        """(line starting at pos, decoded and cut to MAX_LINE characters; offset of the next line)"""
+        head = b""
+        scan = pos
+        while True:
+            chunk = self._read(scan, READ_CHUNK)
+            if not chunk:  # End of file, or it was truncated under us
+                return self._decode(head), max(scan, self.size)
+            end = chunk.find(b"\n")
+            if len(head) < MAX_LINE * 4:
+                head += chunk[:end if end != -1 else len(chunk)][:MAX_LINE * 4 - len(head)]
+            if end != -1:
+                return self._decode(head), scan + end + 1
+            scan += len(chunk)
+
+    def _decode(self, raw):
+        return raw.decode(self.encoding, errors="replace")[:MAX_LINE].rstrip("\r")
+
+    def read_lines(self, start, count):
+        """Up to count lines from 0-based line start"""
+        with self.lock:
+            if self.closed.is_set():
+                return []
+            self.check_size()
+            start = min(start, self.index.lines)
+            pos = self.index.offset(self._read, start)
+            lines = []
+            while len(lines) < count and pos < self.size:
+                line, pos = self._read_line(pos)
+                lines.append(line)
+            return lines
\ No newline at end of file
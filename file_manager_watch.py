@@ -0,0 +1,228 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import stat
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+
+COALESCE = 0.25  # Seconds of events gathered into one update of the list
+POLL_INTERVAL = 2.0  # Shortest gap between polling scans
+POLL_BUDGET = 0.05  # Polling scans may use at most this share of a CPU
+
+# inotify(7) constants
+IN_MODIFY = 0x2
+IN_ATTRIB = 0x4
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_FROM = 0x40
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_Q_OVERFLOW = 0x4000
+IN_ONLYDIR = 0x1000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then len bytes of NUL-padded name
+
+
+def path_row(directory, name):
+    """(name, size, type) as file_manager_scan lists it, or None if name is gone"""
+    try:
+        st = os.stat(os.path.join(directory, name))
+    except FileNotFoundError:
+        return None
+    except OSError:
+        return (name, None, "Unknown")
+    if stat.S_ISDIR(st.st_mode):
+        return (name, None, "Folder")
+    return (name, st.st_size, "File")
+
+
+class DirectoryWatcher(ABC):
+    """Reports changes to one folder's entries on a queue, coalesced.
+
+    Subclasses only say which names changed. Names are collected for
+    COALESCE seconds, then each is looked up once, so a burst of creates,
+    writes and renames becomes a single ('changes', rows, removed) message:
+    rows are (name, size, type) to add or update, removed are names to drop.
+    ('rescan', None, None) means the folder must be listed again.
+    """
+
+    def __init__(self, path, changes):
+        self.path = path
+        self.changes = changes
+        self.stopped = threading.Event()
+        self.dirty = set()
+        self.first_dirty = None
+
+    def start(self):
+        threading.Thread(target=self.run, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+
+    def mark(self, name):
+        if not self.dirty:
+            self.first_dirty = time.monotonic()
+        self.dirty.add(name)
+
+    def flush(self):
+        rows = []
+        removed = []
+        for name in self.dirty:
+            row = path_row(self.path, name)
+            if row is None:
+                removed.append(name)
+            else:
+                rows.append(row)
+        self.dirty.clear()
+        if not self.stopped.is_set():
+            self.changes.put(('changes', rows, removed))
+
+    def rescan(self):
+        self.dirty.clear()
+        if not self.stopped.is_set():
+            self.changes.put(('rescan', None, None))
+
+    def prepare(self):
+        """Set up on the watcher's own thread, so slow work never runs on the caller's; False gives up"""
+        return True
+
+    def run(self):
+        try:
+            if not self.prepare():
+                return
+            while not self.stopped.is_set():
+                timeout = COALESCE if not self.dirty else max(0.0, self.first_dirty + COALESCE - time.monotonic())
+                if self.wait(timeout) is False:
+                    self.rescan()
+                    break
+                if self.dirty and time.monotonic() - self.first_dirty >= COALESCE:
+                    self.flush()
+        finally:
+            self.close()
+
+    @abstractmethod
+    def wait(self, timeout):
+        """Mark the names changed within about timeout seconds; return False if the folder itself went away"""
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher(DirectoryWatcher):
+    """Linux inotify through ctypes: the kernel pushes events, so an idle folder costs nothing"""
+
+    _libc = None
+
+    def __init__(self, path, changes):
+        super().__init__(path, changes)
+        if InotifyWatcher._libc is None:
+            InotifyWatcher._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc = InotifyWatcher._libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"Cannot watch {path}")
+
+    def wait(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return True
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return True
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # The kernel dropped events; only a fresh listing is reliable now
+                self.rescan()
+            elif mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                return False
+            elif name:
+                # A rename arrives as MOVED_FROM old + MOVED_TO new: drop one row, add the other
+                self.mark(name)
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher(DirectoryWatcher):
+    """Fallback for systems without inotify: compares scandir snapshots.
+
+    The folder is rescanned no more often than POLL_INTERVAL, and slow scans
+    of huge folders stretch the interval so polling stays within POLL_BUDGET
+    of a CPU. The first snapshot is taken on the watcher thread, since it
+    stats every entry and a big network folder can take seconds.
+    """
+
+    def __init__(self, path, changes):
+        super().__init__(path, changes)
+        self.snapshot = {}
+        self.interval = POLL_INTERVAL
+        self.next_scan = None
+
+    def prepare(self):
+        try:
+            self.snapshot = self.scan()
+        except OSError:
+            return False  # The listing reports why the folder can't be read
+        self.next_scan = time.monotonic() + self.interval
+        return True
+
+    def scan(self):
+        started = time.monotonic()
+        snapshot = {}
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                try:
+                    st = entry.stat()
+                    snapshot[entry.name] = (st.st_ino, st.st_size, st.st_mtime_ns, stat.S_ISDIR(st.st_mode))
+                except OSError:
+                    snapshot[entry.name] = None
+        self.interval = max(POLL_INTERVAL, (time.monotonic() - started) / POLL_BUDGET)
+        return snapshot
+
+    def wait(self, timeout):
+        delay = self.next_scan - time.monotonic()
+        if delay > timeout:
+            time.sleep(timeout)
+            return True
+        time.sleep(max(0.0, delay))
+        try:
+            snapshot = self.scan()
+        except FileNotFoundError:
+            return False
+        except OSError:
+            return True
+        self.next_scan = time.monotonic() + self.interval
+        for name in snapshot.keys() | self.snapshot.keys():
+            if snapshot.get(name, False) != self.snapshot.get(name, False):
+                self.mark(name)
+        self.snapshot = snapshot
+        return True
+
+
+def watch_directory(path, changes):
+    """Start the best watcher available for path and return it"""
+    try:
+        return InotifyWatcher(path, changes).start()
+    except (OSError, AttributeError):  # Not Linux, no libc symbol, or out of inotify watches
+        return PollingWatcher(path, changes).start()
\ No newline at end of file
@@ -0,0 +1,44 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from contact_dedupe import MergeSuggestion, merge_contacts
+from contact_store import ContactStore
+
+
+class MergeTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="contact_dedupe_test_")
+        self.store = ContactStore(os.path.join(self.workdir, "contacts.db"))
+        self.rows = {"Asha Rao": ("Asha Rao", 30, "", ""),
+                     "Asha R": ("Asha R", 0, "asha@example.com", ""),
+                     "A Rao": ("A Rao", 0, "", "9876543210")}
+        self.store.create_many(self.rows.values())
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.workdir)
+
+    def suggest(self, keep, drop):
+        return MergeSuggestion(self.rows[keep], self.rows[drop], 0.9, [])
+
+    def test_merges_apply_to_current_rows(self):
+        first, second = self.suggest("Asha Rao", "Asha R"), self.suggest("Asha Rao", "A Rao")
+        self.store.update("Asha Rao", 31, "", "")  # Edited after the scan
+
+        row, keep, drop = merge_contacts(self.store, first)
+        self.assertEqual((row, keep, drop), (("Asha Rao", 31, "asha@example.com", ""), ("Asha Rao", 31, "", ""), self.rows["Asha R"]))
+        row, keep, _ = merge_contacts(self.store, second)
+        self.assertEqual(keep, ("Asha Rao", 31, "asha@example.com", ""))
+        self.assertEqual(self.store.get("Asha Rao").as_row(), ("Asha Rao", 31, "asha@example.com", "9876543210"))
+        self.assertEqual(self.store.count(), 1)
+
+    def test_contact_already_merged_away(self):
+        merge_contacts(self.store, self.suggest("Asha Rao", "Asha R"))
+        self.assertIsNone(merge_contacts(self.store, self.suggest("Asha R", "A Rao")))
+        self.assertEqual(self.store.count(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
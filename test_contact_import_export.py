@@ -0,0 +1,31 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from contact_import_export import import_contacts
+from contact_store import ContactStore
+
+
+class ImportTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="contact_import_test_")
+        self.store = ContactStore(os.path.join(self.workdir, "contacts.db"))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.workdir)
+
+    def test_excel_csv_with_byte_order_mark(self):
+        path = os.path.join(self.workdir, "excel.csv")
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            f.write("Name,Age,E-mail,Phone\r\nAsha,30,asha@example.com,9876543210\r\nRené,41,,\r\n")
+
+        result = import_contacts(path, self.store)
+        self.assertEqual((result.imported, result.invalid), (2, 0), result.errors)
+        self.assertEqual(sorted(self.store.iter_rows()), [("Asha", 30, "asha@example.com", "9876543210"),
+                                                          ("René", 41, "", "")])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,29 @@
+import unittest
+
+from contact_records import ContactTable
+
+
+class ContactTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = ContactTable.from_rows([("Asha", 30, "asha@example.com", "9876543210"), ("Ravi", 41, "", "")])
+
+    def test_edits_keep_display_order(self):
+        self.assertEqual(self.table.add("bela", 25, "bela@example.com"), 1)
+        self.assertEqual(self.table.update("Ravi", 42, "ravi@example.com", "9000000000"), 2)
+        self.assertEqual(self.table.remove("Asha"), 0)
+        self.assertEqual(self.table.page(0, 10), [("bela", 25, "bela@example.com", ""),
+                                                  ("Ravi", 42, "ravi@example.com", "9000000000")])
+
+    def test_ages_beyond_a_byte_are_kept(self):
+        table = ContactTable.from_rows([("Old", 300, "", ""), ("Zed", 254, "", "")])
+        self.table.add("Meera", 255)
+        self.table.update("Ravi", -1)
+        self.assertEqual(table.page(0, 10), [("Old", 300, "", ""), ("Zed", 254, "", "")])
+        self.assertEqual([row[1] for row in self.table.page(0, 10)], [30, 255, -1])
+        self.table.update("Ravi", 41)
+        self.table.remove("Meera")
+        self.assertEqual(self.table.large_ages, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
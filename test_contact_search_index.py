@@ -0,0 +1,33 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from contact_search_index import SearchIndex
+from contact_store import ContactStore
+
+NAMES = ["Jamie Lee", "Mira Shah", "Émile Zola", "emma Stone", "Ömer Kaya", "Zara Ali", "amit Roy", "Ébène Noir", "éric Blanc"]
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.build(NAMES)
+
+    def test_short_query_matches_inside_words(self):
+        self.assertEqual(list(self.index.iter_matches("mi")), ["Mira Shah", "amit Roy", "Jamie Lee", "Émile Zola"])
+        self.assertEqual(list(self.index.iter_matches("z")), ["Zara Ali", "Émile Zola"])
+
+    def test_order_matches_the_store(self):
+        workdir = tempfile.mkdtemp(prefix="contact_search_test_")
+        store = ContactStore(os.path.join(workdir, "contacts.db"))
+        try:
+            store.create_many([(name, 30, "", "") for name in NAMES])
+            self.assertEqual(self.index.names, [row[0] for row in store.iter_rows("name", ordered=True)])
+        finally:
+            store.close()
+            shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,29 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from contact_store import ContactStore
+
+
+class KeysetPagingTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="contact_store_test_")
+        self.store = ContactStore(os.path.join(self.workdir, "contacts.db"))
+        self.store.create_many([(name, 30, "", "") for name in ["bo", "Al", "al", "Émile", "Zed", "éric", "Cy", "amy"]])
+        self.rows = self.store.page(0, 100)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.workdir)
+
+    def test_pages_by_key_match_pages_by_offset(self):
+        for i, (name, *_) in enumerate(self.rows):
+            self.assertEqual(self.store.page_after(name, 3), self.rows[i + 1:i + 4])
+            self.assertEqual(self.store.page_before(name, 3), self.rows[max(0, i - 3):i])
+        self.assertEqual(self.store.page_after(None, 3), self.rows[:3])
+        self.assertEqual(self.store.page_before(None, 3), self.rows[-3:])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
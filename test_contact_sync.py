@@ -0,0 +1,101 @@
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from contact_store import ContactStore
+from contact_sync import apply_changes, export_changes, list_conflicts, peer_id, resolve_conflict
+
+
+class SyncTestCase(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.mkdtemp(prefix="contact_sync_test_")
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        shutil.rmtree(self.workdir)
+
+    def open_store(self, name):
+        store = ContactStore(os.path.join(self.workdir, name))
+        self.stores.append(store)
+        return store
+
+    def read_entries(self, path):
+        with open(path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f][1:]
+
+
+class MigrationTest(SyncTestCase):
+    def test_contacts_from_before_change_tracking_are_exported(self):
+        path = os.path.join(self.workdir, "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute("""CREATE TABLE contacts (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            age INTEGER NOT NULL,
+            email TEXT NOT NULL DEFAULT '',
+            mobile TEXT NOT NULL DEFAULT ''
+        )""")
+        conn.executemany("INSERT INTO contacts (name, age) VALUES (?, ?)", [("Asha", 30), ("Ravi", 41)])
+        conn.commit()
+        conn.close()
+
+        store = self.open_store("old.db")
+        store.create("Meera", 25, "", "")
+        out = os.path.join(self.workdir, "full.jsonl")
+        self.assertEqual(export_changes(store, out), 3)
+        self.assertEqual(sorted(entry["name"] for entry in self.read_entries(out)), ["Asha", "Meera", "Ravi"])
+
+
+
+class RoundTripTest(SyncTestCase):
+    def setUp(self):
+        super().setUp()
+        self.here = self.open_store("here.db")
+        self.there = self.open_store("there.db")
+        self.here.create("Asha", 30, "asha@example.com", "9876543210")
+        self.here.create("Ravi", 41, "", "")
+        self.exchange(self.here, self.there)
+        self.exchange(self.there, self.here)
+
+    def exchange(self, sender, receiver):
+        """Send sender's changes to receiver, as the Sync button does, and return the SyncResult"""
+        path = os.path.join(self.workdir, "changes.jsonl")
+        export_changes(sender, path, peer_id(receiver))
+        return apply_changes(receiver, path)
+
+    def assertConverged(self):
+        rows = lambda store: sorted(store.iter_rows())
+        self.assertEqual(rows(self.here), rows(self.there))
+
+    def test_one_sided_edits_converge(self):
+        self.here.update("Asha", 31, "asha@example.com", "9876543210")
+        self.there.delete("Ravi")
+        result = self.exchange(self.here, self.there)
+        self.assertEqual(result.changes, [('update', "Asha", ("Asha", 31, "asha@example.com", "9876543210"),
+                                           ("Asha", 30, "asha@example.com", "9876543210"))])
+        result = self.exchange(self.there, self.here)
+        self.assertEqual(result.changes, [('remove', "Ravi", None, ("Ravi", 41, "", ""))])
+        self.assertConverged()
+
+    def test_keep_mine_converges(self):
+        self.here.update("Asha", 31, "asha@example.com", "9876543210")
+        self.there.update("Asha", 30, "asha@work.example", "9876543210")
+        self.assertEqual(self.exchange(self.there, self.here).conflicts, 1)
+        (peer, name, _, _), = list_conflicts(self.here)
+        resolve_conflict(self.here, peer, name, take_remote=False)
+
+        result = self.exchange(self.here, self.there)
+        self.assertEqual((result.applied, result.conflicts), (1, 0))
+        self.assertEqual(self.exchange(self.there, self.here).conflicts, 0)
+        self.assertEqual(list_conflicts(self.here) + list_conflicts(self.there), [])
+        self.assertConverged()
+        self.assertEqual(self.there.get("Asha").age, 31)
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
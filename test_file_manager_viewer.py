@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+from file_manager_viewer import BLOCK, PagedFile
+
+
+class PagedFileTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(handle, "wb") as f:
+            for i in range(50000):
+                f.write(b"line %d\n" % i)
+        self.paged = PagedFile(self.path)
+        while not self.paged.catch_up():
+            pass
+
+    def tearDown(self):
+        self.paged.close()
+        os.remove(self.path)
+
+    def test_reads_lines_across_blocks(self):
+        self.assertEqual(self.paged.line_count(), 50000)
+        self.assertGreater(os.path.getsize(self.path), 4 * BLOCK)
+        self.assertEqual(self.paged.read_lines(0, 2), ["line 0", "line 1"])
+        self.assertEqual(self.paged.read_lines(43210, 3), ["line 43210", "line 43211", "line 43212"])
+        self.assertEqual(self.paged.read_lines(49999, 5), ["line 49999"])
+
+    def test_truncated_file_is_read_safely(self):
+        # Log rotation with copytruncate shrinks the file while it is open
+        os.truncate(self.path, 100)
+        self.assertEqual(self.paged.read_lines(39000, 5), self.paged.read_lines(0, 5))
+        while not self.paged.catch_up():
+            pass
+        self.assertEqual(self.paged.line_count(), 14)  # 13 whole lines, then the start of 'line 13'
+        self.assertEqual(self.paged.read_lines(12, 5), ["line 12", "line 1"])
+
+    def test_follows_growth(self):
+        with open(self.path, "ab") as f:
+            f.write(b"appended\npartial")
+        while not self.paged.catch_up():
+            pass
+        self.assertEqual(self.paged.line_count(), 50002)
+        self.assertEqual(self.paged.read_lines(50000, 5), ["appended", "partial"])
+
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file